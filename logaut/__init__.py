@@ -24,4 +24,25 @@
 
 __version__ = "0.2.0"
 
-from .core import fol2dfa, ldl2dfa, ltl2dfa, mso2dfa, pldl2dfa, pltl2dfa
+from .core import (
+    Template,
+    afol2dfa,
+    aldl2dfa,
+    altl2dfa,
+    amso2dfa,
+    apldl2dfa,
+    apltl2dfa,
+    fol2dfa,
+    fol2dfa_batch,
+    ldl2dfa,
+    ldl2dfa_batch,
+    ltl2dfa,
+    ltl2dfa_batch,
+    mso2dfa,
+    mso2dfa_batch,
+    pldl2dfa,
+    pldl2dfa_batch,
+    pltl2dfa,
+    pltl2dfa_batch,
+    set_async_concurrency,
+)
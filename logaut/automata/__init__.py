@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Automata representations.
+
+This subpackage contains alternative representations of the DFAs
+computed by the backends, and a registry to select them by name.
+"""
+from functools import singledispatch
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pythomata.core import DFA
+from pythomata.impl.symbolic import SymbolicDFA
+from sympy import And, Not, Or, Symbol, to_dnf
+from sympy.logic.boolalg import BooleanFalse, BooleanFunction, BooleanTrue
+
+from logaut._registry import Registry
+from logaut.backends.common.cubes import minimize_mona_output
+from logaut.backends.common.process_mona_output import MONAOutput, _LazyGuards
+from logaut.cache import copy_automaton
+
+"""A cube, as a mapping from the variables that occur in it to their value."""
+Cube = Dict[str, bool]
+
+_representation_registry = Registry[DFA]()
+
+
+def register(*args, **kwargs) -> None:
+    """
+    Register a representation.
+
+    The entry point must be a callable that takes the keyword argument 'output',
+    a MONAOutput instance, and returns the DFA.
+    """
+    _representation_registry.register(*args, **kwargs)
+
+
+def check_representation(representation: str) -> None:
+    """
+    Check that a representation is registered.
+
+    :param representation: the representation id.
+    """
+    # raise the same error as 'make' does.
+    _representation_registry.make_cls(representation)
+
+
+def from_mona_output(
+    output: MONAOutput,
+    representation: str = "symbolic",
+    minimize_guards: bool = False,
+) -> DFA:
+    """
+    Build a DFA from the MONA output.
+
+    :param output: a MONAOutput instance.
+    :param representation: the id of the representation of the DFA.
+    :param minimize_guards: whether to minimize the guards of the transitions
+      before building the DFA.
+    :return: the DFA.
+    """
+    if minimize_guards:
+        output = minimize_mona_output(output)
+    return _representation_registry.make(representation, output=output)
+
+
+@singledispatch
+def to_mona_output(automaton: DFA) -> MONAOutput:
+    """
+    Convert a DFA into a MONAOutput, e.g. to change its representation.
+
+    The states are renumbered so that the initial state is 0.
+
+    :param automaton: the DFA.
+    :return: the MONAOutput instance.
+    """
+    raise TypeError(f"cannot convert automata of type {type(automaton)}")
+
+
+def cubes_to_mona_output(
+    states: AbstractSet[int],
+    initial_state: int,
+    accepting_states: AbstractSet[int],
+    transitions: Dict[int, Dict[int, Iterable[Cube]]],
+    variable_names: Optional[Sequence[str]] = None,
+) -> MONAOutput:
+    """
+    Build a MONAOutput from the cubes of the guards of a DFA.
+
+    :param states: the states.
+    :param initial_state: the initial state.
+    :param accepting_states: the accepting states.
+    :param transitions: mapping: start state -> end state -> cubes, in disjunction.
+    :param variable_names: the variable names; by default, the sorted names
+      of the variables that occur in the cubes.
+    :return: the MONAOutput instance.
+    """
+    order = [initial_state, *sorted(set(states) - {initial_state})]
+    index = {state: i for i, state in enumerate(order)}
+    cubes_by_edge = {
+        (index[start], index[end]): list(cubes)
+        for start, outgoing in transitions.items()
+        for end, cubes in outgoing.items()
+    }
+    if variable_names is None:
+        variable_names = sorted(
+            {name for cubes in cubes_by_edge.values() for c in cubes for name in c}
+        )
+    position = {name: i for i, name in enumerate(variable_names)}
+    mona_transitions: Dict[int, Dict[int, set]] = {}
+    for (start, end), cubes in cubes_by_edge.items():
+        guards = set()
+        for cube in cubes:
+            characters = ["X"] * len(variable_names)
+            for name, value in cube.items():
+                characters[position[name]] = "1" if value else "0"
+            guards.add("".join(characters))
+        if guards:
+            mona_transitions.setdefault(start, {})[end] = guards
+    accepting = {index[state] for state in accepting_states}
+    return MONAOutput(
+        len(order),
+        tuple(variable_names),
+        0,
+        accepting,
+        set(range(len(order))) - accepting,
+        mona_transitions,
+    )
+
+
+def _sympy_to_cubes(guard: BooleanFunction) -> List[Cube]:
+    """Get the cubes of a SymPy formula, via its DNF."""
+    dnf = to_dnf(guard)
+    if isinstance(dnf, BooleanFalse):
+        return []
+    if isinstance(dnf, BooleanTrue):
+        return [{}]
+    cubes = []
+    for clause in dnf.args if isinstance(dnf, Or) else (dnf,):
+        cube: Cube = {}
+        for literal in clause.args if isinstance(clause, And) else (clause,):
+            positive = not isinstance(literal, Not)
+            name = str(literal if positive else literal.args[0])
+            if cube.setdefault(name, positive) != positive:
+                break
+        else:
+            cubes.append(cube)
+    return cubes
+
+
+@to_mona_output.register
+def _(automaton: SymbolicDFA) -> MONAOutput:
+    """Convert a SymbolicDFA, reusing the MONA guards not yet computed."""
+    transitions: Dict[int, Dict[int, Iterable[Cube]]] = {}
+    for start, outgoing in automaton._transition_function.items():
+        for end in outgoing:
+            raw_guards = (
+                outgoing.get_raw_guards(end)
+                if isinstance(outgoing, _LazyGuards)
+                else None
+            )
+            if raw_guards is not None:
+                names = outgoing._variable_names
+                cubes = [
+                    {names[i]: c == "1" for i, c in enumerate(g) if c != "X"}
+                    for g in raw_guards
+                ]
+            else:
+                cubes = _sympy_to_cubes(outgoing[end])
+            transitions.setdefault(start, {})[end] = cubes
+    return cubes_to_mona_output(
+        automaton.states,
+        automaton.initial_state,
+        automaton.accepting_states,
+        transitions,
+    )
+
+
+@singledispatch
+def minimize(automaton: DFA) -> DFA:
+    """
+    Minimize a DFA, keeping its representation.
+
+    The alphabet is split into the minterms of the guards, and the states
+    are minimized by Hopcroft's algorithm; see logaut.automata.hopcroft.
+    The states that cannot reach an accepting state are removed,
+    so the result has no rejecting sink.
+
+    :param automaton: the DFA.
+    :return: the minimal DFA.
+    """
+    raise TypeError(f"cannot minimize automata of type {type(automaton)}")
+
+
+def minimize_states(output: MONAOutput) -> MONAOutput:
+    """
+    Minimize the DFA of a MONAOutput.
+
+    :param output: the MONAOutput instance.
+    :return: the MONAOutput of the minimal DFA.
+    """
+    from logaut.automata import bdd  # pylint: disable=import-outside-toplevel
+
+    # a dedicated manager, so that the nodes are freed afterwards.
+    manager = bdd.BDDManager()
+    manager.declare(*output.variable_names)
+    return to_mona_output(bdd.minimize(bdd.from_mona_output(output, manager)))
+
+
+@minimize.register
+def _(automaton: SymbolicDFA) -> DFA:
+    """Minimize a SymbolicDFA."""
+    return from_mona_output(minimize_states(to_mona_output(automaton)))
+
+
+@singledispatch
+def relabel(automaton: DFA, mapping: Mapping[str, str]) -> DFA:
+    """
+    Rename the variables of the guards of a DFA, keeping its representation.
+
+    The variables are renamed simultaneously, so e.g. two variables can be
+    swapped. The variables not in the mapping keep their name.
+    Two variables of the DFA must not get the same name.
+
+    :param automaton: the DFA.
+    :param mapping: the new name of each variable to rename.
+    :return: the relabeled DFA.
+    """
+    raise TypeError(f"cannot relabel automata of type {type(automaton)}")
+
+
+def relabel_variables(
+    variable_names: Sequence[str], mapping: Mapping[str, str]
+) -> Tuple[str, ...]:
+    """
+    Rename a sequence of variables.
+
+    :param variable_names: the variable names.
+    :param mapping: the new name of each variable to rename.
+    :return: the new variable names.
+    """
+    result = tuple(mapping.get(name, name) for name in variable_names)
+    if len(set(result)) != len(result):
+        raise ValueError(f"the renaming {dict(mapping)} is not injective")
+    return result
+
+
+@relabel.register
+def _(automaton: SymbolicDFA, mapping: Mapping[str, str]) -> SymbolicDFA:
+    """Relabel a SymbolicDFA, keeping the guards not yet computed lazy."""
+    symbols = {Symbol(old): Symbol(new) for old, new in mapping.items()}
+    # the same guards occur in many transitions: relabel them once.
+    memo: Dict[BooleanFunction, BooleanFunction] = {}
+    result = copy_automaton(automaton)
+    for start, outgoing in result._transition_function.items():
+        if isinstance(outgoing, _LazyGuards):
+            names = relabel_variables(outgoing._variable_names, mapping)
+            result._transition_function[start] = outgoing.relabel(names, symbols)
+            continue
+        for end, guard in outgoing.items():
+            new_guard = memo.get(guard)
+            if new_guard is None:
+                new_guard = memo[guard] = guard.xreplace(symbols)
+            outgoing[end] = new_guard
+    return result
+
+
+register(
+    id_="symbolic",
+    entry_point="logaut.backends.common.process_mona_output:parse_automaton",
+)
+register(
+    id_="lazy",
+    entry_point="logaut.backends.common.process_mona_output:parse_automaton",
+    lazy=True,
+)
+register(id_="cube", entry_point="logaut.automata.cube:from_mona_output")
+register(id_="bdd", entry_point="logaut.automata.bdd:from_mona_output")
+register(id_="compact", entry_point="logaut.automata.compact:from_mona_output")
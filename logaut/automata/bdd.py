@@ -0,0 +1,859 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+DFAs whose guards are binary decision diagrams.
+
+Guards are reduced ordered BDDs, built by a pure-Python BDD manager.
+Nodes are hash-consed, so equivalent guards are the same node:
+equality and satisfiability checks take constant time, and conjunction
+and negation are polynomial in the size of the operands.
+By default, all the automata share the same manager, and hence
+the nodes of their guards.
+
+Nodes are never freed: use a dedicated manager for short-lived automata.
+"""
+import functools
+import sys
+import threading
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pythomata.core import DFA, Rendering
+from pythomata.impl.symbolic import PropositionalInterpretation, SymbolicDFA
+from sympy import And, Not, Or, Symbol, false, true
+from sympy.logic.boolalg import BooleanFunction
+
+from logaut.automata import cubes_to_mona_output
+from logaut.automata import minimize as minimize_automaton
+from logaut.automata import relabel, to_mona_output
+from logaut.automata.hopcroft import minimize_table
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.cache import copy_automaton
+
+_FALSE = 0
+_TRUE = 1
+_TERMINAL_LEVEL = sys.maxsize
+_NO_SUCCESSOR = -1
+
+
+class BDDManager:
+    """
+    A manager of reduced ordered BDDs.
+
+    Variables are ordered by declaration. Each node is identified by an integer:
+    0 and 1 are the terminal nodes, the others are triples (level, low, high).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the manager."""
+        self._variables: List[str] = []
+        self._level_by_variable: Dict[str, int] = {}
+        self._level: List[int] = [_TERMINAL_LEVEL, _TERMINAL_LEVEL]
+        self._low: List[int] = [_FALSE, _TRUE]
+        self._high: List[int] = [_FALSE, _TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._ite_cache: Dict[Tuple[int, int, int], int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Get the number of nodes, including the terminal ones."""
+        return len(self._level)
+
+    def __getstate__(self):
+        """Get the state to pickle, without the lock and the operation cache."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_ite_cache"] = {}
+        return state
+
+    def __setstate__(self, state) -> None:
+        """Restore the pickled state."""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Get the declared variables, in order."""
+        return tuple(self._variables)
+
+    @property
+    def true(self) -> "BDD":
+        """Get the BDD of the constant true."""
+        return BDD(self, _TRUE)
+
+    @property
+    def false(self) -> "BDD":
+        """Get the BDD of the constant false."""
+        return BDD(self, _FALSE)
+
+    def declare(self, *names: str) -> None:
+        """
+        Declare variables, after the ones already declared.
+
+        Variables already declared are ignored.
+
+        :param names: the names of the variables.
+        """
+        with self._lock:
+            for name in names:
+                self._level_of(name)
+
+    def var(self, name: str) -> "BDD":
+        """
+        Get the BDD of a variable, declaring it if needed.
+
+        :param name: the name of the variable.
+        :return: the BDD.
+        """
+        with self._lock:
+            return BDD(self, self._mk(self._level_of(name), _FALSE, _TRUE))
+
+    def clear_cache(self) -> None:
+        """Clear the cache of the operations (but not the nodes)."""
+        with self._lock:
+            self._ite_cache.clear()
+
+    def from_mona_guards(
+        self, guards: Iterable[str], variable_names: Tuple[str, ...]
+    ) -> "BDD":
+        """
+        Build the BDD of a set of MONA guards, in disjunction.
+
+        :param guards: the MONA guards, e.g. {'1X0', '01X'}.
+        :param variable_names: the variable names, in order of character.
+        :return: the BDD.
+        """
+        with self._lock:
+            levels = [self._level_of(name) for name in variable_names]
+            node = _FALSE
+            for guard in guards:
+                literals = sorted(
+                    ((levels[i], c == "1") for i, c in enumerate(guard) if c != "X"),
+                    reverse=True,
+                )
+                cube = _TRUE
+                for level, positive in literals:
+                    cube = (
+                        self._mk(level, _FALSE, cube)
+                        if positive
+                        else self._mk(level, cube, _FALSE)
+                    )
+                node = self._ite(node, _TRUE, cube)
+            return BDD(self, node)
+
+    def _level_of(self, name: str) -> int:
+        """Get the level of a variable, declaring it if needed."""
+        level = self._level_by_variable.get(name)
+        if level is None:
+            level = len(self._variables)
+            self._variables.append(name)
+            self._level_by_variable[name] = level
+        return level
+
+    def _mk(self, level: int, low: int, high: int) -> int:
+        """Get the node (level, low, high), reduced and hash-consed."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._level)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def _cofactors(self, node: int, level: int) -> Tuple[int, int]:
+        """Get the cofactors of a node with respect to the variable at a level."""
+        if self._level[node] != level:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def _ite(self, f: int, g: int, h: int) -> int:
+        """Compute 'if f then g else h'."""
+        if f == _TRUE or g == h:
+            return g
+        if f == _FALSE:
+            return h
+        if g == _TRUE and h == _FALSE:
+            return f
+        key = (f, g, h)
+        result = self._ite_cache.get(key)
+        if result is None:
+            level = min(self._level[f], self._level[g], self._level[h])
+            f0, f1 = self._cofactors(f, level)
+            g0, g1 = self._cofactors(g, level)
+            h0, h1 = self._cofactors(h, level)
+            result = self._mk(level, self._ite(f0, g0, h0), self._ite(f1, g1, h1))
+            self._ite_cache[key] = result
+        return result
+
+    def _apply_ite(self, f: int, g: int, h: int) -> int:
+        """Compute 'if f then g else h', holding the lock."""
+        with self._lock:
+            return self._ite(f, g, h)
+
+    def _evaluate(self, node: int, true_variables: AbstractSet[str]) -> bool:
+        """Evaluate a node, given the set of true variables."""
+        while node > _TRUE:
+            if self._variables[self._level[node]] in true_variables:
+                node = self._high[node]
+            else:
+                node = self._low[node]
+        return node == _TRUE
+
+    def _pick(self, node: int) -> Optional[Dict[str, bool]]:
+        """Get a (partial) assignment that satisfies a node, if any."""
+        if node == _FALSE:
+            return None
+        assignment: Dict[str, bool] = {}
+        while node > _TRUE:
+            name = self._variables[self._level[node]]
+            # in a reduced BDD, every non-terminal node is satisfiable.
+            if self._high[node] != _FALSE:
+                assignment[name] = True
+                node = self._high[node]
+            else:
+                assignment[name] = False
+                node = self._low[node]
+        return assignment
+
+    def _cubes(self, node: int) -> Iterator[Dict[str, bool]]:
+        """Enumerate the paths from a node to the true terminal."""
+        stack: List[Tuple[int, Dict[str, bool]]] = [(node, {})]
+        while stack:
+            node, assignment = stack.pop()
+            if node == _TRUE:
+                yield assignment
+            elif node != _FALSE:
+                name = self._variables[self._level[node]]
+                stack.append((self._low[node], {**assignment, name: False}))
+                stack.append((self._high[node], {**assignment, name: True}))
+
+    def _rename(self, node: int, levels: Dict[int, int], memo: Dict[int, int]) -> int:
+        """Rename the variables of a node, given the new level of each level."""
+        if node <= _TRUE:
+            return node
+        result = memo.get(node)
+        if result is None:
+            level = self._level[node]
+            variable = self._mk(levels.get(level, level), _FALSE, _TRUE)
+            low = self._rename(self._low[node], levels, memo)
+            high = self._rename(self._high[node], levels, memo)
+            result = self._ite(variable, high, low)
+            memo[node] = result
+        return result
+
+    def _to_sympy(self, node: int, memo: Dict[int, BooleanFunction]):
+        """Convert a node into a SymPy formula."""
+        if node == _TRUE:
+            return true
+        if node == _FALSE:
+            return false
+        result = memo.get(node)
+        if result is None:
+            symbol = Symbol(self._variables[self._level[node]])
+            low = self._to_sympy(self._low[node], memo)
+            high = self._to_sympy(self._high[node], memo)
+            result = Or(And(symbol, high), And(Not(symbol), low))
+            memo[node] = result
+        return result
+
+
+class BDD:
+    """A BDD, i.e. a node of a BDD manager."""
+
+    __slots__ = ("manager", "node")
+
+    def __init__(self, manager: BDDManager, node: int) -> None:
+        """
+        Initialize the BDD.
+
+        :param manager: the BDD manager.
+        :param node: the node.
+        """
+        self.manager = manager
+        self.node = node
+
+    def _check_manager(self, other: "BDD") -> None:
+        """Check that another BDD belongs to the same manager."""
+        if other.manager is not self.manager:
+            raise ValueError("BDDs belong to different managers.")
+
+    def __and__(self, other: "BDD") -> "BDD":
+        """Compute the conjunction."""
+        self._check_manager(other)
+        return BDD(self.manager, self.manager._apply_ite(self.node, other.node, _FALSE))
+
+    def __or__(self, other: "BDD") -> "BDD":
+        """Compute the disjunction."""
+        self._check_manager(other)
+        return BDD(self.manager, self.manager._apply_ite(self.node, _TRUE, other.node))
+
+    def __invert__(self) -> "BDD":
+        """Compute the negation."""
+        return BDD(self.manager, self.manager._apply_ite(self.node, _FALSE, _TRUE))
+
+    def __eq__(self, other) -> bool:
+        """Check equivalence with another BDD of the same manager."""
+        if not isinstance(other, BDD):
+            return NotImplemented
+        return self.manager is other.manager and self.node == other.node
+
+    def __hash__(self) -> int:
+        """Compute the hash."""
+        return hash((id(self.manager), self.node))
+
+    def is_satisfiable(self) -> bool:
+        """Check whether the BDD is satisfiable."""
+        return self.node != _FALSE
+
+    def is_valid(self) -> bool:
+        """Check whether the BDD is valid."""
+        return self.node == _TRUE
+
+    def evaluate(self, true_variables: AbstractSet[str]) -> bool:
+        """
+        Evaluate the BDD.
+
+        :param true_variables: the names of the true variables.
+        :return: the truth value.
+        """
+        return self.manager._evaluate(self.node, true_variables)
+
+    def pick(self) -> Optional[Dict[str, bool]]:
+        """
+        Get a satisfying assignment.
+
+        :return: a mapping from the variables that need to be assigned
+          to their truth value, or None if the BDD is not satisfiable.
+        """
+        return self.manager._pick(self.node)
+
+    def cubes(self) -> Iterator[Dict[str, bool]]:
+        """
+        Enumerate disjoint cubes whose disjunction is equivalent to the BDD.
+
+        :return: the cubes, as mappings from variables to truth values.
+        """
+        return self.manager._cubes(self.node)
+
+    def rename(
+        self, mapping: Mapping[str, str], memo: Optional[Dict[int, int]] = None
+    ) -> "BDD":
+        """
+        Rename the variables of the BDD, simultaneously.
+
+        :param mapping: the new name of each variable to rename.
+        :param memo: the nodes already renamed with the same mapping, if any;
+          pass the same dictionary to rename many BDDs that share nodes.
+        :return: the renamed BDD, from the same manager.
+        """
+        manager = self.manager
+        with manager._lock:
+            levels = {
+                manager._level_by_variable[old]: manager._level_of(new)
+                for old, new in mapping.items()
+                if old in manager._level_by_variable
+            }
+            memo = memo if memo is not None else {}
+            return BDD(manager, manager._rename(self.node, levels, memo))
+
+    def to_sympy(self) -> BooleanFunction:
+        """Get the equivalent SymPy formula."""
+        return self.manager._to_sympy(self.node, {})
+
+    def __str__(self) -> str:
+        """Get the string representation, as a SymPy formula."""
+        return str(self.to_sympy())
+
+    def __repr__(self) -> str:
+        """Get the representation."""
+        return f"BDD({self})"
+
+
+_default_manager = BDDManager()
+
+
+def get_default_manager() -> BDDManager:
+    """Get the BDD manager shared by default among the automata."""
+    return _default_manager
+
+
+class BDDDFA(
+    Rendering[int, PropositionalInterpretation, BDD],
+    DFA[int, PropositionalInterpretation, BDD],
+):
+    """
+    An immutable DFA whose guards are BDDs.
+
+    Like pythomata.SymbolicDFA, it reads propositional interpretations, e.g.
+    {"a": True, "b": False}; missing propositions are assumed to be false.
+    """
+
+    def __init__(
+        self,
+        nb_states: int,
+        initial_state: int,
+        accepting_states: AbstractSet[int],
+        transitions: Dict[int, Dict[int, BDD]],
+        manager: BDDManager,
+    ) -> None:
+        """
+        Initialize the DFA.
+
+        :param nb_states: the number of states, numbered from 0.
+        :param initial_state: the initial state.
+        :param accepting_states: the accepting states.
+        :param transitions: mapping: start state -> end state -> guard.
+        :param manager: the BDD manager of the guards.
+        """
+        super().__init__()
+        self._states = frozenset(range(nb_states))
+        self._initial_state = initial_state
+        self._accepting_states = frozenset(accepting_states)
+        self._transitions = transitions
+        self._manager = manager
+
+    @property
+    def states(self) -> AbstractSet[int]:
+        """Get the states."""
+        return self._states
+
+    @property
+    def initial_state(self) -> int:
+        """Get the initial state."""
+        return self._initial_state
+
+    @property
+    def accepting_states(self) -> AbstractSet[int]:
+        """Get the accepting states."""
+        return self._accepting_states
+
+    @property
+    def manager(self) -> BDDManager:
+        """Get the BDD manager of the guards."""
+        return self._manager
+
+    def get_successor(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> Optional[int]:
+        """Get the (unique) successor, or None if not defined."""
+        if state not in self._states:
+            raise ValueError(f"State {state} not found.")
+        true_variables: Set[str] = {
+            str(name) for name, truth in symbol.items() if truth
+        }
+        for end_state, guard in self._transitions.get(state, {}).items():
+            if guard.evaluate(true_variables):
+                return end_state
+        return None
+
+    def get_successors(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> AbstractSet[int]:
+        """Get the successors."""
+        successor = self.get_successor(state, symbol)
+        return {successor} if successor is not None else set()
+
+    def get_guard(self, start_state: int, end_state: int) -> Optional[BDD]:
+        """Get the guard of a transition, or None if there is no such transition."""
+        return self._transitions.get(start_state, {}).get(end_state)
+
+    def get_transitions_from(self, state: int) -> AbstractSet[Tuple[int, BDD, int]]:
+        """Get the outgoing transitions of a state."""
+        if state not in self._states:
+            raise ValueError(f"State {state} not found.")
+        return {
+            (state, guard, end_state)
+            for end_state, guard in self._transitions.get(state, {}).items()
+        }
+
+    def to_symbolic(self) -> SymbolicDFA:
+        """Convert to a pythomata.SymbolicDFA, computing the SymPy guards."""
+        automaton = SymbolicDFA()
+        for _ in range(1, len(self._states)):
+            automaton.create_state()
+        automaton.set_initial_state(self._initial_state)
+        for state in self._accepting_states:
+            automaton.set_accepting_state(state, True)
+        for start_state, outgoing in self._transitions.items():
+            for end_state, guard in outgoing.items():
+                automaton._transition_function.setdefault(start_state, {})[
+                    end_state
+                ] = guard.to_sympy()
+        return automaton
+
+
+def from_mona_output(
+    output: MONAOutput, manager: Optional[BDDManager] = None
+) -> BDDDFA:
+    """
+    Build a BDDDFA, given the MONAOutput object.
+
+    :param output: a MONAOutput instance.
+    :param manager: the BDD manager; by default, the shared one.
+    :return: the DFA.
+    """
+    manager = manager if manager is not None else get_default_manager()
+    guard_by_cubes: Dict[FrozenSet[str], BDD] = {}
+    transitions: Dict[int, Dict[int, BDD]] = {}
+    for start_state, outgoing in output.transitions.items():
+        for end_state, guards in outgoing.items():
+            key = frozenset(guards)
+            guard = guard_by_cubes.get(key)
+            if guard is None:
+                guard = manager.from_mona_guards(key, output.variable_names)
+                guard_by_cubes[key] = guard
+            transitions.setdefault(start_state, {})[end_state] = guard
+    return BDDDFA(
+        output.nb_states,
+        output.initial_state,
+        output.accepting_states,
+        transitions,
+        manager,
+    )
+
+
+@copy_automaton.register
+def _(automaton: BDDDFA) -> BDDDFA:
+    """Share the automaton, since BDDDFAs are immutable."""
+    return automaton
+
+
+@relabel.register
+def _(automaton: BDDDFA, mapping: Mapping[str, str]) -> BDDDFA:
+    """Relabel a BDDDFA, renaming the variables of its guards in its manager."""
+    memo: Dict[int, int] = {}
+    transitions = {
+        start: {end: guard.rename(mapping, memo) for end, guard in outgoing.items()}
+        for start, outgoing in automaton._transitions.items()
+    }
+    return BDDDFA(
+        len(automaton.states),
+        automaton.initial_state,
+        automaton.accepting_states,
+        transitions,
+        automaton.manager,
+    )
+
+
+@to_mona_output.register
+def _(automaton: BDDDFA) -> MONAOutput:
+    """Convert a BDDDFA, over the variables that occur in its guards."""
+    transitions: Dict[int, Dict[int, Iterable[Dict[str, bool]]]] = {}
+    for state in automaton.states:
+        for _, guard, end_state in automaton.get_transitions_from(state):
+            transitions.setdefault(state, {})[end_state] = list(guard.cubes())
+    occurring = {
+        name
+        for outgoing in transitions.values()
+        for cubes in outgoing.values()
+        for cube in cubes
+        for name in cube
+    }
+    return cubes_to_mona_output(
+        automaton.states,
+        automaton.initial_state,
+        automaton.accepting_states,
+        transitions,
+        [name for name in automaton.manager.variables if name in occurring],
+    )
+
+
+def _coreachable_states(automaton: BDDDFA) -> Set[int]:
+    """Get the states from which an accepting state can be reached."""
+    predecessors: Dict[int, Set[int]] = {}
+    for state in automaton.states:
+        for _, _, end_state in automaton.get_transitions_from(state):
+            predecessors.setdefault(end_state, set()).add(state)
+    result = set(automaton.accepting_states)
+    stack = list(result)
+    while stack:
+        for predecessor in predecessors.get(stack.pop(), ()):
+            if predecessor not in result:
+                result.add(predecessor)
+                stack.append(predecessor)
+    return result
+
+
+def _universal_states(automaton: BDDDFA) -> Set[int]:
+    """Get the states from which every trace is accepted."""
+    manager = automaton.manager
+    # states that are rejecting, or that miss a transition.
+    candidates = set(automaton.accepting_states)
+    for state in list(candidates):
+        guards = [guard for _, guard, _ in automaton.get_transitions_from(state)]
+        if not functools.reduce(BDD.__or__, guards, manager.false).is_valid():
+            candidates.discard(state)
+    changed = True
+    while changed:
+        changed = False
+        for state in list(candidates):
+            if any(
+                s not in candidates for _, _, s in automaton.get_transitions_from(state)
+            ):
+                candidates.discard(state)
+                changed = True
+    return candidates
+
+
+_Pair = Tuple[Optional[int], Optional[int]]
+
+
+class _Product:
+    """The on-the-fly product of two DFAs; see 'product'."""
+
+    # the state that accepts every trace, in a disjunction.
+    _UNIVERSAL: _Pair = (-1, -1)
+
+    def __init__(self, first: BDDDFA, second: BDDDFA, conjunction: bool) -> None:
+        """Initialize the product."""
+        self._automata = (first, second)
+        self._manager = first.manager
+        self._conjunction = conjunction
+        self._useful: Tuple[Set[int], Set[int]] = (set(), set())
+        self._universal: Tuple[Set[int], Set[int]] = (set(), set())
+        if conjunction:
+            self._useful = (_coreachable_states(first), _coreachable_states(second))
+        else:
+            self._universal = (_universal_states(first), _universal_states(second))
+        self._pair_ids: Dict[_Pair, int] = {}
+        self._queue: List[_Pair] = []
+        self._successors_cache: Tuple[Dict, Dict] = ({}, {})
+
+    def _get_id(self, pair: _Pair) -> Optional[int]:
+        """Get the id of a pair of states, or None if it rejects every trace."""
+        if self._conjunction:
+            if pair[0] not in self._useful[0] or pair[1] not in self._useful[1]:
+                return None
+        elif pair[0] in self._universal[0] or pair[1] in self._universal[1]:
+            pair = self._UNIVERSAL
+        elif pair == (None, None):
+            return None
+        pair_id = self._pair_ids.get(pair)
+        if pair_id is None:
+            pair_id = self._pair_ids[pair] = len(self._pair_ids)
+            self._queue.append(pair)
+        return pair_id
+
+    def _successors(
+        self, index: int, state: Optional[int]
+    ) -> List[Tuple[BDD, Optional[int]]]:
+        """Get the successors of a state, where None rejects every trace."""
+        successors = self._successors_cache[index].get(state)
+        if successors is not None:
+            return successors
+        if state is None:
+            successors = [(self._manager.true, None)]
+        else:
+            successors = [
+                (guard, end_state)
+                for _, guard, end_state in self._automata[index].get_transitions_from(
+                    state
+                )
+            ]
+            covered = functools.reduce(
+                BDD.__or__, (g for g, _ in successors), self._manager.false
+            )
+            if not covered.is_valid():
+                successors.append((~covered, None))
+        if self._conjunction:
+            # the other successors reject every trace.
+            useful = self._useful[index]
+            successors = [(g, s) for g, s in successors if s in useful]
+        self._successors_cache[index][state] = successors
+        return successors
+
+    def _is_accepting(self, pair: _Pair) -> bool:
+        """Check whether a pair of states is accepting."""
+        if pair == self._UNIVERSAL:
+            return True
+        values = [s in a.accepting_states for s, a in zip(pair, self._automata)]
+        return all(values) if self._conjunction else any(values)
+
+    def _expand(self, pair: _Pair) -> Dict[int, BDD]:
+        """Compute the outgoing transitions of a pair of states."""
+        if pair == self._UNIVERSAL:
+            return {self._pair_ids[pair]: self._manager.true}
+        outgoing: Dict[int, BDD] = {}
+        for guard_1, state_1 in self._successors(0, pair[0]):
+            for guard_2, state_2 in self._successors(1, pair[1]):
+                guard = guard_1 & guard_2
+                if not guard.is_satisfiable():
+                    continue
+                successor_id = self._get_id((state_1, state_2))
+                if successor_id is not None:
+                    previous = outgoing.get(successor_id)
+                    outgoing[successor_id] = (
+                        guard if previous is None else guard | previous
+                    )
+        return outgoing
+
+    def build(self) -> BDDDFA:
+        """Build the product DFA."""
+        first, second = self._automata
+        initial_state = self._get_id((first.initial_state, second.initial_state))
+        if initial_state is None:
+            return BDDDFA(1, 0, set(), {}, self._manager)
+        accepting_states: Set[int] = set()
+        transitions: Dict[int, Dict[int, BDD]] = {}
+        while self._queue:
+            pair = self._queue.pop()
+            pair_id = self._pair_ids[pair]
+            if self._is_accepting(pair):
+                accepting_states.add(pair_id)
+            transitions[pair_id] = self._expand(pair)
+        return BDDDFA(
+            len(self._pair_ids),
+            initial_state,
+            accepting_states,
+            transitions,
+            self._manager,
+        )
+
+
+def product(first: BDDDFA, second: BDDDFA, conjunction: bool = True) -> BDDDFA:
+    """
+    Compute the product of two DFAs, on the fly.
+
+    Only the pairs of states reachable from the initial one are built.
+    In a conjunction, the pairs where either state cannot reach an accepting
+    state are dropped; in a disjunction, the pairs where either state accepts
+    every trace are merged into a single state.
+
+    :param first: the first DFA.
+    :param second: the second DFA, with the same BDD manager.
+    :param conjunction: whether to accept the intersection of the languages,
+      or their union.
+    :return: the product DFA.
+    """
+    if first.manager is not second.manager:
+        raise ValueError("the DFAs must have the same BDD manager")
+    return _Product(first, second, conjunction).build()
+
+
+def refine_alphabet(
+    guards: Sequence[BDD], manager: BDDManager
+) -> Tuple[List[BDD], List[List[int]]]:
+    """
+    Partition the alphabet into the classes induced by some guards.
+
+    :param guards: the guards.
+    :param manager: the BDD manager of the guards.
+    :return: the classes, and for each guard the ids of the classes it contains.
+    """
+    classes = [manager.true]
+    members: List[List[int]] = [[]]
+    for guard_id, guard in enumerate(guards):
+        new_classes: List[BDD] = []
+        new_members: List[List[int]] = []
+        for class_, guard_ids in zip(classes, members):
+            inside = class_ & guard
+            if inside == class_:
+                new_classes.append(class_)
+                new_members.append(guard_ids + [guard_id])
+            elif not inside.is_satisfiable():
+                new_classes.append(class_)
+                new_members.append(guard_ids)
+            else:
+                new_classes.extend([inside, class_ & ~guard])
+                new_members.extend([guard_ids + [guard_id], guard_ids])
+        classes, members = new_classes, new_members
+    classes_by_guard: List[List[int]] = [[] for _ in guards]
+    for class_id, guard_ids in enumerate(members):
+        for guard_id in guard_ids:
+            classes_by_guard[guard_id].append(class_id)
+    return classes, classes_by_guard
+
+
+def minimize(automaton: BDDDFA) -> BDDDFA:
+    """
+    Minimize a DFA, by Hopcroft's algorithm on the minterms of its guards.
+
+    The states that cannot reach an accepting state are removed,
+    so the result has no rejecting sink.
+
+    :param automaton: the DFA.
+    :return: the minimal DFA.
+    """
+    manager = automaton.manager
+    guard_ids: Dict[BDD, int] = {}
+    edges = []
+    for state in automaton.states:
+        for _, guard, end_state in automaton.get_transitions_from(state):
+            edges.append(
+                (state, end_state, guard_ids.setdefault(guard, len(guard_ids)))
+            )
+    classes, classes_by_guard = refine_alphabet(list(guard_ids), manager)
+    nb_states = max(automaton.states) + 1
+    table = [[_NO_SUCCESSOR] * len(classes) for _ in range(nb_states)]
+    for start_state, end_state, guard_id in edges:
+        row = table[start_state]
+        for class_id in classes_by_guard[guard_id]:
+            row[class_id] = end_state
+    accepting = [state in automaton.accepting_states for state in range(nb_states)]
+    blocks, nb_blocks = minimize_table(table, accepting, automaton.initial_state)
+
+    transitions: Dict[int, Dict[int, BDD]] = {}
+    for state, block in enumerate(blocks):
+        if block == _NO_SUCCESSOR or block in transitions:
+            continue
+        outgoing = transitions[block] = {}
+        for class_id, end_state in enumerate(table[state]):
+            end_block = (
+                blocks[end_state] if end_state != _NO_SUCCESSOR else _NO_SUCCESSOR
+            )
+            if end_block != _NO_SUCCESSOR:
+                previous = outgoing.get(end_block)
+                class_ = classes[class_id]
+                outgoing[end_block] = class_ if previous is None else previous | class_
+    return BDDDFA(
+        nb_blocks,
+        0,
+        {
+            blocks[state]
+            for state in automaton.accepting_states
+            if blocks[state] != _NO_SUCCESSOR
+        },
+        transitions,
+        manager,
+    )
+
+
+@minimize_automaton.register
+def _(automaton: BDDDFA) -> BDDDFA:
+    """Minimize a BDDDFA."""
+    return minimize(automaton)
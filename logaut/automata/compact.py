@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Compact, array-backed, DFAs.
+
+The guards of a DFA partition the alphabet, i.e. the valuations of the
+atoms, into classes of symbols that are read in the same way in every state.
+A CompactDFA stores its transitions in a NumPy table indexed by state and
+class id, and its accepting states in a boolean array. Hence, reading a
+symbol means packing it into a bit-mask, getting its class, and looking up
+the table.
+
+With few atoms, the class of each bit-mask is precomputed, so the class
+lookup is an array access too. With many atoms, the classes are stored as
+packed bit-cubes, as in logaut.automata.cube.
+
+This module requires NumPy.
+"""
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+from pythomata.core import DFA, Rendering
+from pythomata.impl.symbolic import PropositionalInterpretation, SymbolicDFA
+
+from logaut.automata import (
+    cubes_to_mona_output,
+    minimize,
+    relabel,
+    relabel_variables,
+    to_mona_output,
+)
+from logaut.automata.bdd import BDD, BDDManager, refine_alphabet
+from logaut.automata.cube import _mask_dtype, _to_mask
+from logaut.automata.hopcroft import minimize_table
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.cache import copy_automaton
+
+# up to this number of atoms, the class of every bit-mask is precomputed.
+_MAX_NB_INDEXED_VARIABLES = 16
+
+# the maximum number of cube comparisons per chunk, when classifying many masks.
+_CLASSIFY_CHUNK_SIZE = 1 << 20
+
+_NO_SUCCESSOR = -1
+
+
+def _smallest_int_dtype(max_value: int) -> np.dtype:
+    """Get the smallest signed integer dtype that holds the values up to max_value."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class CompactDFA(
+    Rendering[int, PropositionalInterpretation, BDD],
+    DFA[int, PropositionalInterpretation, BDD],
+):
+    """
+    An immutable DFA backed by NumPy arrays.
+
+    Like pythomata.SymbolicDFA, it reads propositional interpretations, e.g.
+    {"a": True, "b": False}; missing propositions are assumed to be false.
+    Guards are BDDs, computed from the alphabet classes on request.
+    """
+
+    __slots__ = (
+        "_initial_state",
+        "_table",
+        "_accepting",
+        "_variable_names",
+        "_variable_index",
+        "_classes",
+        "_class_of",
+        "_class_care",
+        "_class_value",
+        "_class_ids",
+    )
+
+    def __init__(
+        self,
+        initial_state: int,
+        table: np.ndarray,
+        accepting: np.ndarray,
+        variable_names: Tuple[str, ...],
+        classes: Sequence[BDD],
+    ) -> None:
+        """
+        Initialize the DFA.
+
+        :param initial_state: the initial state.
+        :param table: the transition table: state x class id -> state,
+          or -1 if there is no successor.
+        :param accepting: the acceptance bitmap, indexed by state.
+        :param variable_names: the variable names, in order of bit.
+        :param classes: the alphabet classes, as disjoint BDDs
+          over the variable names.
+        """
+        super().__init__()
+        self._initial_state = initial_state
+        self._table = table
+        self._accepting = accepting
+        self._variable_names = variable_names
+        self._variable_index = {name: i for i, name in enumerate(variable_names)}
+        self._classes = tuple(classes)
+        self._class_of: Optional[np.ndarray] = None
+        self._class_care: Optional[np.ndarray] = None
+        self._class_value: Optional[np.ndarray] = None
+        self._class_ids: Optional[np.ndarray] = None
+        self._index_classes()
+
+    def _index_classes(self) -> None:
+        """Build the data structures to get the class of a bit-mask."""
+        cubes: List[Tuple[int, int, int]] = []
+        for class_id, class_ in enumerate(self._classes):
+            for assignment in class_.cubes():
+                care, value = 0, 0
+                for name, truth in assignment.items():
+                    bit = 1 << self._variable_index[name]
+                    care |= bit
+                    value |= bit if truth else 0
+                cubes.append((care, value, class_id))
+        nb_variables = len(self._variable_names)
+        class_dtype = _smallest_int_dtype(len(self._classes))
+        if nb_variables <= _MAX_NB_INDEXED_VARIABLES:
+            masks = np.arange(1 << nb_variables, dtype=np.int64)
+            self._class_of = np.full(len(masks), _NO_SUCCESSOR, dtype=class_dtype)
+            for care, value, class_id in cubes:
+                self._class_of[(masks & care) == value] = class_id
+        else:
+            dtype = _mask_dtype(nb_variables)
+            self._class_care = np.array([c for c, _, _ in cubes], dtype=dtype)
+            self._class_value = np.array([v for _, v, _ in cubes], dtype=dtype)
+            self._class_ids = np.array([i for _, _, i in cubes], dtype=class_dtype)
+
+    @property
+    def states(self) -> AbstractSet[int]:
+        """Get the states."""
+        return frozenset(range(len(self._table)))
+
+    @property
+    def initial_state(self) -> int:
+        """Get the initial state."""
+        return self._initial_state
+
+    @property
+    def accepting_states(self) -> AbstractSet[int]:
+        """Get the accepting states."""
+        return frozenset(np.flatnonzero(self._accepting).tolist())
+
+    @property
+    def variable_names(self) -> Tuple[str, ...]:
+        """Get the variable names, in order of bit."""
+        return self._variable_names
+
+    @property
+    def table(self) -> np.ndarray:
+        """Get the transition table: state x class id -> state, or -1."""
+        return self._table
+
+    @property
+    def accepting_bitmap(self) -> np.ndarray:
+        """Get the acceptance bitmap, indexed by state."""
+        return self._accepting
+
+    @property
+    def classes(self) -> Tuple[BDD, ...]:
+        """Get the alphabet classes, as disjoint BDDs."""
+        return self._classes
+
+    @property
+    def nb_classes(self) -> int:
+        """Get the number of alphabet classes."""
+        return len(self._classes)
+
+    @property
+    def nbytes(self) -> int:
+        """Get the number of bytes of the arrays of the DFA."""
+        arrays = (
+            self._table,
+            self._accepting,
+            self._class_of,
+            self._class_care,
+            self._class_value,
+            self._class_ids,
+        )
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def is_accepting(self, state: int) -> bool:
+        """Check whether a state is accepting."""
+        return bool(self._accepting[state])
+
+    def encode(self, symbol: PropositionalInterpretation) -> int:
+        """
+        Pack a propositional interpretation into a bit-mask.
+
+        Propositions that do not occur in the DFA are ignored.
+
+        :param symbol: the propositional interpretation.
+        :return: the bit-mask.
+        """
+        valuation = 0
+        for name, truth in symbol.items():
+            index = self._variable_index.get(str(name))
+            if truth and index is not None:
+                valuation |= 1 << index
+        return valuation
+
+    def classify(self, valuation: int) -> int:
+        """
+        Get the alphabet class of a bit-mask.
+
+        :param valuation: the bit-mask.
+        :return: the class id.
+        """
+        if self._class_of is not None:
+            return int(self._class_of[valuation])
+        care, value = self._class_care, self._class_value
+        mask = _to_mask(valuation, care.dtype)  # type: ignore
+        matches = np.flatnonzero((care & mask) == value)
+        return int(self._class_ids[matches[0]])  # type: ignore
+
+    def _classify_batch(self, symbols: np.ndarray, atoms: Sequence[str]) -> np.ndarray:
+        """
+        Get the alphabet classes of many symbols.
+
+        :param symbols: boolean array, symbols x atoms.
+        :param atoms: the names of the atoms, in order of column.
+        :return: the class ids, one per symbol.
+        """
+        if self._class_of is not None:
+            dtype = np.dtype(np.int64)
+        else:
+            dtype = self._class_care.dtype  # type: ignore
+        masks = np.zeros(len(symbols), dtype=dtype)
+        for column, atom in enumerate(atoms):
+            index = self._variable_index.get(atom)
+            if index is not None:
+                bit = _to_mask(1 << index, dtype)
+                masks |= symbols[:, column].astype(dtype) * bit
+        if self._class_of is not None:
+            return self._class_of[masks]
+        care, value = self._class_care[None, :], self._class_value[None, :]  # type: ignore
+        chunk_size = max(1, _CLASSIFY_CHUNK_SIZE // care.shape[1])
+        first_matches = [
+            np.argmax((chunk[:, None] & care) == value, axis=1)
+            for chunk in np.array_split(
+                masks, range(chunk_size, len(masks), chunk_size)
+            )
+        ]
+        return self._class_ids[np.concatenate(first_matches)]  # type: ignore
+
+    def accepts_batch(
+        self,
+        traces: np.ndarray,
+        lengths: Optional[np.ndarray] = None,
+        offsets: Optional[np.ndarray] = None,
+        atoms: Optional[Sequence[str]] = None,
+        return_states: bool = False,
+    ):
+        """
+        Check whether the automaton accepts many traces, with vectorized lookups.
+
+        Traces are boolean arrays, with a column per atom. They are given either
+        padded to the same length, in a 3D array traces x steps x atoms,
+        or concatenated, in a 2D array steps x atoms together with the offsets
+        at which the traces start.
+
+        :param traces: the boolean array of the traces.
+        :param lengths: for padded traces, the length of each trace;
+          by default, all the steps.
+        :param offsets: for concatenated traces, the T + 1 offsets of T traces:
+          trace i is traces[offsets[i]:offsets[i + 1]].
+        :param atoms: the names of the atoms, in order of column;
+          by default, the variable names of the DFA.
+        :param return_states: whether to also return the final states.
+        :return: the boolean acceptance vector, and, if requested,
+          the vector of the final states (-1 if the run got stuck).
+        """
+        traces = np.asarray(traces, dtype=np.bool_)
+        atoms = self._variable_names if atoms is None else tuple(map(str, atoms))
+        if offsets is None:
+            if traces.ndim != 3:
+                raise ValueError("padded traces must be a 3D array.")
+            nb_traces, nb_steps = traces.shape[:2]
+            classes = self._classify_batch(traces.reshape(-1, len(atoms)), atoms)
+            classes = classes.reshape(nb_traces, nb_steps)
+            lengths = (
+                np.full(nb_traces, nb_steps) if lengths is None else np.asarray(lengths)
+            )
+        else:
+            if traces.ndim != 2:
+                raise ValueError("concatenated traces must be a 2D array.")
+            offsets = np.asarray(offsets, dtype=np.int64)
+            starts, lengths = offsets[:-1], np.diff(offsets)
+            nb_steps = int(lengths.max()) if len(lengths) > 0 else 0
+            indices = starts[:, None] + np.arange(nb_steps)[None, :]
+            indices = np.where(
+                np.arange(nb_steps)[None, :] < lengths[:, None], indices, 0
+            )
+            classes = self._classify_batch(traces, atoms)[indices]
+        # the last row of the table is a sink, reached from the state -1.
+        table = np.vstack(
+            [self._table, np.full((1, len(self._classes)), _NO_SUCCESSOR)]
+        )
+        states = np.full(len(classes), self._initial_state, dtype=np.int64)
+        for step in range(classes.shape[1]):
+            states = np.where(step < lengths, table[states, classes[:, step]], states)
+        accepted = np.append(self._accepting, False)[states]
+        return (accepted, states) if return_states else accepted
+
+    def step(self, state: int, valuation: int) -> int:
+        """
+        Read a bit-mask.
+
+        :param state: the current state.
+        :param valuation: the bit-mask of the symbol.
+        :return: the next state, or -1 if there is no successor.
+        """
+        return int(self._table[state, self.classify(valuation)])
+
+    def get_successor(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> Optional[int]:
+        """Get the (unique) successor, or None if not defined."""
+        if not 0 <= state < len(self._table):
+            raise ValueError(f"State {state} not found.")
+        successor = self.step(state, self.encode(symbol))
+        return successor if successor != _NO_SUCCESSOR else None
+
+    def get_successors(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> AbstractSet[int]:
+        """Get the successors."""
+        successor = self.get_successor(state, symbol)
+        return {successor} if successor is not None else set()
+
+    def accepts(self, word: Sequence[PropositionalInterpretation]) -> bool:
+        """
+        Check whether the automaton accepts the word.
+
+        :param word: the list of symbols.
+        :return: True if the automaton accepts the word, False otherwise.
+        """
+        state = self._initial_state
+        for symbol in word:
+            state = self.step(state, self.encode(symbol))
+            if state == _NO_SUCCESSOR:
+                return False
+        return bool(self._accepting[state])
+
+    def get_transitions_from(self, state: int) -> AbstractSet[Tuple[int, BDD, int]]:
+        """Get the outgoing transitions of a state."""
+        if not 0 <= state < len(self._table):
+            raise ValueError(f"State {state} not found.")
+        guards: Dict[int, BDD] = {}
+        for class_id, end_state in enumerate(self._table[state].tolist()):
+            if end_state != _NO_SUCCESSOR:
+                class_ = self._classes[class_id]
+                guard = guards.get(end_state)
+                guards[end_state] = class_ if guard is None else guard | class_
+        return {(state, guard, end_state) for end_state, guard in guards.items()}
+
+    def to_symbolic(self) -> SymbolicDFA:
+        """Convert to a pythomata.SymbolicDFA, computing the SymPy guards."""
+        automaton = SymbolicDFA()
+        for _ in range(1, len(self._table)):
+            automaton.create_state()
+        automaton.set_initial_state(self._initial_state)
+        for state in self.accepting_states:
+            automaton.set_accepting_state(state, True)
+        for state in range(len(self._table)):
+            for _, guard, end_state in self.get_transitions_from(state):
+                automaton._transition_function.setdefault(state, {})[
+                    end_state
+                ] = guard.to_sympy()
+        return automaton
+
+
+def from_mona_output(output: MONAOutput) -> CompactDFA:
+    """
+    Build a CompactDFA, given the MONAOutput object.
+
+    :param output: a MONAOutput instance.
+    :return: the DFA.
+    """
+    # a dedicated manager, so that the nodes are freed together with the DFA.
+    manager = BDDManager()
+    manager.declare(*output.variable_names)
+    guard_ids: Dict[FrozenSet[str], int] = {}
+    guards: List[BDD] = []
+    edges: List[Tuple[int, int, int]] = []
+    for start_state, outgoing in output.transitions.items():
+        for end_state, mona_guards in outgoing.items():
+            key = frozenset(mona_guards)
+            guard_id = guard_ids.get(key)
+            if guard_id is None:
+                guard_id = guard_ids[key] = len(guards)
+                guards.append(manager.from_mona_guards(key, output.variable_names))
+            edges.append((start_state, end_state, guard_id))
+    classes, classes_by_guard = refine_alphabet(guards, manager)
+
+    state_dtype = _smallest_int_dtype(output.nb_states)
+    table = np.full((output.nb_states, len(classes)), _NO_SUCCESSOR, dtype=state_dtype)
+    for start_state, end_state, guard_id in edges:
+        table[start_state, classes_by_guard[guard_id]] = end_state
+    accepting = np.zeros(output.nb_states, dtype=np.bool_)
+    accepting[list(output.accepting_states)] = True
+    return CompactDFA(
+        output.initial_state, table, accepting, output.variable_names, classes
+    )
+
+
+@copy_automaton.register
+def _(automaton: CompactDFA) -> CompactDFA:
+    """Share the automaton, since CompactDFAs are immutable."""
+    return automaton
+
+
+@minimize.register
+def _(automaton: CompactDFA) -> CompactDFA:
+    """Minimize a CompactDFA, on its transition table."""
+    table = automaton.table
+    blocks, nb_blocks = minimize_table(
+        table.tolist(), automaton.accepting_bitmap.tolist(), automaton.initial_state
+    )
+    # map each state to its block, and each dropped state to no successor.
+    block_of = np.array(blocks + [_NO_SUCCESSOR], dtype=np.int64)
+    representatives = np.zeros(nb_blocks, dtype=np.int64)
+    kept = block_of[:-1] != _NO_SUCCESSOR
+    representatives[block_of[:-1][kept]] = np.flatnonzero(kept)
+    new_table = block_of[table[representatives]].astype(_smallest_int_dtype(nb_blocks))
+    accepting = automaton.accepting_bitmap[representatives]
+    return CompactDFA(
+        0, new_table, accepting, automaton.variable_names, automaton.classes
+    )
+
+
+@relabel.register
+def _(automaton: CompactDFA, mapping: Mapping[str, str]) -> CompactDFA:
+    """Relabel a CompactDFA: only the classes of symbols change."""
+    names = relabel_variables(automaton.variable_names, mapping)
+    memo: Dict[int, int] = {}
+    return CompactDFA(
+        automaton.initial_state,
+        automaton.table,
+        automaton.accepting_bitmap,
+        names,
+        [class_.rename(mapping, memo) for class_ in automaton.classes],
+    )
+
+
+@to_mona_output.register
+def _(automaton: CompactDFA) -> MONAOutput:
+    """Convert a CompactDFA."""
+    transitions: Dict[int, Dict[int, Iterable[Dict[str, bool]]]] = {}
+    for state in automaton.states:
+        for _, guard, end_state in automaton.get_transitions_from(state):
+            transitions.setdefault(state, {})[end_state] = list(guard.cubes())
+    return cubes_to_mona_output(
+        automaton.states,
+        automaton.initial_state,
+        automaton.accepting_states,
+        transitions,
+        automaton.variable_names,
+    )
+
+
+def to_compact(automaton: DFA) -> CompactDFA:
+    """
+    Convert a DFA into a CompactDFA.
+
+    Any DFA supported by logaut.automata.to_mona_output can be converted,
+    e.g. the ones computed by the backends.
+
+    :param automaton: the DFA.
+    :return: the CompactDFA, or the automaton itself if it is already one.
+    """
+    if isinstance(automaton, CompactDFA):
+        return automaton
+    return from_mona_output(to_mona_output(automaton))
+
+
+def accepts_batch(automaton: DFA, traces: np.ndarray, **kwargs):
+    """
+    Check whether a DFA accepts many traces, with vectorized lookups.
+
+    The DFA is first converted into a CompactDFA; to check many batches,
+    convert it once with 'to_compact'. See CompactDFA.accepts_batch
+    for the arguments.
+
+    :param automaton: the DFA.
+    :param traces: the boolean array of the traces.
+    :param kwargs: the other arguments of CompactDFA.accepts_batch.
+    :return: the boolean acceptance vector (and the final states, if requested).
+    """
+    return to_compact(automaton).accepts_batch(traces, **kwargs)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+DFAs whose guards are packed bit-cubes.
+
+A guard is a disjunction of cubes, i.e. conjunctions of literals, as in the
+MONA output. Each cube over n variables is stored as two n-bit masks:
+the 'care' mask has the ith bit set if the ith variable occurs in the cube,
+and the 'value' mask has it set if the variable occurs positively.
+A valuation, packed in the same way, satisfies the cube if and only if
+(valuation & care) == value.
+
+Masks are stored in NumPy arrays of 64-bit unsigned integers, or of Python
+integers when there are more than 64 variables. SymPy formulas are computed
+only on request.
+
+This module requires NumPy.
+"""
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+import numpy as np
+from pythomata.core import DFA, Rendering
+from pythomata.impl.symbolic import PropositionalInterpretation, SymbolicDFA
+from sympy.logic.boolalg import BooleanFunction
+
+from logaut.automata import (
+    cubes_to_mona_output,
+    minimize,
+    minimize_states,
+    relabel,
+    relabel_variables,
+    to_mona_output,
+)
+from logaut.backends.common.cubes import format_cube, parse_cube
+from logaut.backends.common.process_mona_output import (
+    MONAOutput,
+    from_set_of_guards_to_sympy_formula,
+)
+from logaut.cache import copy_automaton
+
+_MAX_NB_FIXED_SIZE_VARIABLES = 64
+
+
+def _mask_dtype(nb_variables: int) -> np.dtype:
+    """Get the dtype of the masks over a number of variables."""
+    if nb_variables <= _MAX_NB_FIXED_SIZE_VARIABLES:
+        return np.dtype(np.uint64)
+    return np.dtype(object)
+
+
+def _to_mask(valuation: int, dtype: np.dtype):
+    """Convert a packed valuation into a scalar of the mask dtype."""
+    return np.uint64(valuation) if dtype == np.uint64 else valuation
+
+
+class CubeGuard:
+    """A guard, i.e. a disjunction of bit-cubes."""
+
+    __slots__ = ("_care", "_value", "_variable_names")
+
+    def __init__(
+        self, care: np.ndarray, value: np.ndarray, variable_names: Tuple[str, ...]
+    ) -> None:
+        """
+        Initialize the guard.
+
+        :param care: the care masks, one per cube.
+        :param value: the value masks, one per cube.
+        :param variable_names: the variable names, in order of bit.
+        """
+        self._care = care
+        self._value = value
+        self._variable_names = variable_names
+
+    @classmethod
+    def from_mona_guards(
+        cls, guards: Iterable[str], variable_names: Tuple[str, ...]
+    ) -> "CubeGuard":
+        """
+        Build the guard from MONA guards, e.g. {'1X0', '01X'}.
+
+        :param guards: the MONA guards, in disjunction.
+        :param variable_names: the variable names.
+        :return: the guard.
+        """
+        dtype = _mask_dtype(len(variable_names))
+        cubes = [parse_cube(guard) for guard in guards]
+        care = np.array([c for c, _ in cubes], dtype=dtype)
+        value = np.array([v for _, v in cubes], dtype=dtype)
+        return cls(care, value, variable_names)
+
+    @property
+    def care(self) -> np.ndarray:
+        """Get the care masks."""
+        return self._care
+
+    @property
+    def value(self) -> np.ndarray:
+        """Get the value masks."""
+        return self._value
+
+    @property
+    def variable_names(self) -> Tuple[str, ...]:
+        """Get the variable names."""
+        return self._variable_names
+
+    def evaluate(self, valuation: int) -> bool:
+        """
+        Evaluate the guard.
+
+        :param valuation: the valuation, packed as a bit-mask.
+        :return: True if the valuation satisfies the guard, False otherwise.
+        """
+        mask = _to_mask(valuation, self._care.dtype)
+        return bool(np.any((self._care & mask) == self._value))
+
+    def to_mona_guards(self) -> Set[str]:
+        """Get the MONA guards, e.g. {'1X0', '01X'}."""
+        nb_variables = len(self._variable_names)
+        return {
+            format_cube(cube, nb_variables)
+            for cube in zip(self._care.tolist(), self._value.tolist())
+        }
+
+    def to_sympy(self) -> BooleanFunction:
+        """Get the equivalent SymPy formula."""
+        return from_set_of_guards_to_sympy_formula(
+            self.to_mona_guards(), self._variable_names
+        )
+
+    def __str__(self) -> str:
+        """Get the string representation, i.e. the one of the SymPy formula."""
+        return str(self.to_sympy())
+
+    def __repr__(self) -> str:
+        """Get the representation."""
+        return f"{type(self).__name__}({sorted(self.to_mona_guards())})"
+
+
+class CubeDFA(
+    Rendering[int, PropositionalInterpretation, CubeGuard],
+    DFA[int, PropositionalInterpretation, CubeGuard],
+):
+    """
+    An immutable DFA whose guards are bit-cubes.
+
+    Like pythomata.SymbolicDFA, it reads propositional interpretations, e.g.
+    {"a": True, "b": False}; missing propositions are assumed to be false.
+    """
+
+    def __init__(
+        self,
+        nb_states: int,
+        initial_state: int,
+        accepting_states: AbstractSet[int],
+        transitions: Dict[int, Dict[int, CubeGuard]],
+        variable_names: Tuple[str, ...],
+    ) -> None:
+        """
+        Initialize the DFA.
+
+        :param nb_states: the number of states, numbered from 0.
+        :param initial_state: the initial state.
+        :param accepting_states: the accepting states.
+        :param transitions: mapping: start state -> end state -> guard.
+        :param variable_names: the variable names, in order of bit.
+        """
+        super().__init__()
+        self._states = frozenset(range(nb_states))
+        self._initial_state = initial_state
+        self._accepting_states = frozenset(accepting_states)
+        self._transitions = transitions
+        self._variable_names = variable_names
+        self._variable_index = {name: i for i, name in enumerate(variable_names)}
+        self._dtype = _mask_dtype(len(variable_names))
+        # the cubes of all the outgoing transitions of a state, packed together.
+        self._packed: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        for state, outgoing in transitions.items():
+            guards = list(outgoing.values())
+            self._packed[state] = (
+                np.concatenate([guard.care for guard in guards]),
+                np.concatenate([guard.value for guard in guards]),
+                np.repeat(list(outgoing.keys()), [len(g.care) for g in guards]),
+            )
+
+    @property
+    def states(self) -> AbstractSet[int]:
+        """Get the states."""
+        return self._states
+
+    @property
+    def initial_state(self) -> int:
+        """Get the initial state."""
+        return self._initial_state
+
+    @property
+    def accepting_states(self) -> AbstractSet[int]:
+        """Get the accepting states."""
+        return self._accepting_states
+
+    @property
+    def variable_names(self) -> Tuple[str, ...]:
+        """Get the variable names, in order of bit."""
+        return self._variable_names
+
+    def encode(self, symbol: PropositionalInterpretation) -> int:
+        """
+        Pack a propositional interpretation into a bit-mask.
+
+        Propositions that do not occur in the DFA are ignored.
+
+        :param symbol: the propositional interpretation.
+        :return: the bit-mask.
+        """
+        valuation = 0
+        for name, truth in symbol.items():
+            index = self._variable_index.get(str(name))
+            if truth and index is not None:
+                valuation |= 1 << index
+        return valuation
+
+    def get_successor(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> Optional[int]:
+        """Get the (unique) successor, or None if not defined."""
+        if state not in self._states:
+            raise ValueError(f"State {state} not found.")
+        packed = self._packed.get(state)
+        if packed is None:
+            return None
+        care, value, destinations = packed
+        mask = _to_mask(self.encode(symbol), self._dtype)
+        matches = np.flatnonzero((care & mask) == value)
+        return int(destinations[matches[0]]) if len(matches) > 0 else None
+
+    def get_successors(
+        self, state: int, symbol: PropositionalInterpretation
+    ) -> AbstractSet[int]:
+        """Get the successors."""
+        successor = self.get_successor(state, symbol)
+        return {successor} if successor is not None else set()
+
+    def get_guard(self, start_state: int, end_state: int) -> Optional[CubeGuard]:
+        """Get the guard of a transition, or None if there is no such transition."""
+        return self._transitions.get(start_state, {}).get(end_state)
+
+    def get_transitions_from(
+        self, state: int
+    ) -> AbstractSet[Tuple[int, CubeGuard, int]]:
+        """Get the outgoing transitions of a state."""
+        if state not in self._states:
+            raise ValueError(f"State {state} not found.")
+        return {
+            (state, guard, end_state)
+            for end_state, guard in self._transitions.get(state, {}).items()
+        }
+
+    def to_symbolic(self) -> SymbolicDFA:
+        """Convert to a pythomata.SymbolicDFA, computing the SymPy guards."""
+        automaton = SymbolicDFA()
+        for _ in range(1, len(self._states)):
+            automaton.create_state()
+        automaton.set_initial_state(self._initial_state)
+        for state in self._accepting_states:
+            automaton.set_accepting_state(state, True)
+        for start_state, outgoing in self._transitions.items():
+            for end_state, guard in outgoing.items():
+                automaton._transition_function.setdefault(start_state, {})[
+                    end_state
+                ] = guard.to_sympy()
+        return automaton
+
+
+def from_mona_output(output: MONAOutput) -> CubeDFA:
+    """
+    Build a CubeDFA, given the MONAOutput object.
+
+    :param output: a MONAOutput instance.
+    :return: the DFA.
+    """
+    # the same guards occur in many transitions: build (and store) them once.
+    guard_by_cubes: Dict[FrozenSet[str], CubeGuard] = {}
+    transitions: Dict[int, Dict[int, CubeGuard]] = {}
+    for start_state, outgoing in output.transitions.items():
+        for end_state, guards in outgoing.items():
+            key = frozenset(guards)
+            guard = guard_by_cubes.get(key)
+            if guard is None:
+                guard = CubeGuard.from_mona_guards(key, output.variable_names)
+                guard_by_cubes[key] = guard
+            transitions.setdefault(start_state, {})[end_state] = guard
+    return CubeDFA(
+        output.nb_states,
+        output.initial_state,
+        output.accepting_states,
+        transitions,
+        output.variable_names,
+    )
+
+
+@copy_automaton.register
+def _(automaton: CubeDFA) -> CubeDFA:
+    """Share the automaton, since CubeDFAs are immutable."""
+    return automaton
+
+
+@minimize.register
+def _(automaton: CubeDFA) -> CubeDFA:
+    """Minimize a CubeDFA."""
+    return from_mona_output(minimize_states(to_mona_output(automaton)))
+
+
+@relabel.register
+def _(automaton: CubeDFA, mapping: Mapping[str, str]) -> CubeDFA:
+    """Relabel a CubeDFA: the bits of the guards keep their position."""
+    names = relabel_variables(automaton.variable_names, mapping)
+    guard_by_id: Dict[int, CubeGuard] = {}
+    transitions: Dict[int, Dict[int, CubeGuard]] = {}
+    for start_state, outgoing in automaton._transitions.items():
+        for end_state, guard in outgoing.items():
+            new_guard = guard_by_id.get(id(guard))
+            if new_guard is None:
+                new_guard = CubeGuard(guard.care, guard.value, names)
+                guard_by_id[id(guard)] = new_guard
+            transitions.setdefault(start_state, {})[end_state] = new_guard
+    return CubeDFA(
+        len(automaton.states),
+        automaton.initial_state,
+        automaton.accepting_states,
+        transitions,
+        names,
+    )
+
+
+@to_mona_output.register
+def _(automaton: CubeDFA) -> MONAOutput:
+    """Convert a CubeDFA."""
+    names = automaton.variable_names
+    return cubes_to_mona_output(
+        automaton.states,
+        automaton.initial_state,
+        automaton.accepting_states,
+        {
+            start: {
+                end: [
+                    {names[i]: c == "1" for i, c in enumerate(g) if c != "X"}
+                    for g in guard.to_mona_guards()
+                ]
+                for _, guard, end in automaton.get_transitions_from(start)
+            }
+            for start in automaton.states
+        },
+        names,
+    )
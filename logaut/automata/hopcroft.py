@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Minimization of DFAs, by Hopcroft's partition refinement.
+
+The algorithm works on transition tables indexed by state and alphabet
+class, i.e. by the minterms of the guards: a symbolic DFA is minimized
+by first splitting its alphabet into the classes of symbols that every
+state reads in the same way. The partition of the states is stored in
+arrays, so that each block is a contiguous slice and splitting a block
+takes time linear in the number of its marked states; the time of the
+whole algorithm is O(k n log n), for n states and k classes.
+"""
+from typing import Dict, List, Sequence, Set, Tuple
+
+_NO_SUCCESSOR = -1
+
+
+def _live_states(
+    table: Sequence[Sequence[int]], accepting: Sequence[bool], initial_state: int
+) -> List[int]:
+    """Get the states reachable from the initial one that can reach an accepting one."""
+    reachable = {initial_state}
+    stack = [initial_state]
+    predecessors: Dict[int, List[int]] = {}
+    while stack:
+        state = stack.pop()
+        for end_state in table[state]:
+            if end_state == _NO_SUCCESSOR:
+                continue
+            predecessors.setdefault(end_state, []).append(state)
+            if end_state not in reachable:
+                reachable.add(end_state)
+                stack.append(end_state)
+    live = {state for state in reachable if accepting[state]}
+    stack = list(live)
+    while stack:
+        for state in predecessors.get(stack.pop(), ()):
+            if state not in live:
+                live.add(state)
+                stack.append(state)
+    return sorted(live)
+
+
+class _Partition:
+    """A refinable partition of the integers 0, ..., n - 1."""
+
+    def __init__(self, nb_elements: int) -> None:
+        """Initialize the partition, with a single block."""
+        self.elements = list(range(nb_elements))
+        self.location = list(range(nb_elements))
+        self.block_of = [0] * nb_elements
+        self.first = [0]
+        self.end = [nb_elements]
+        self.mid = [0]
+        self.touched: List[int] = []
+
+    @property
+    def nb_blocks(self) -> int:
+        """Get the number of blocks."""
+        return len(self.first)
+
+    def size(self, block: int) -> int:
+        """Get the size of a block."""
+        return self.end[block] - self.first[block]
+
+    def mark(self, element: int) -> None:
+        """Mark an element, moving it to the marked prefix of its block."""
+        block = self.block_of[element]
+        location = self.location[element]
+        mid = self.mid[block]
+        if location < mid:
+            return
+        other = self.elements[mid]
+        self.elements[location], self.elements[mid] = other, element
+        self.location[other], self.location[element] = location, mid
+        if mid == self.first[block]:
+            self.touched.append(block)
+        self.mid[block] = mid + 1
+
+    def split(self) -> List[Tuple[int, int]]:
+        """
+        Split the touched blocks into their marked and unmarked elements.
+
+        :return: the pairs (old block, new block), where the new block
+          has the marked elements.
+        """
+        splits = []
+        for block in self.touched:
+            mid = self.mid[block]
+            if mid == self.end[block]:
+                self.mid[block] = self.first[block]
+                continue
+            new_block = len(self.first)
+            self.first.append(self.first[block])
+            self.end.append(mid)
+            self.mid.append(self.first[block])
+            self.first[block] = self.mid[block] = mid
+            for location in range(self.first[new_block], mid):
+                self.block_of[self.elements[location]] = new_block
+            splits.append((block, new_block))
+        self.touched = []
+        return splits
+
+
+def _predecessors(
+    table: Sequence[Sequence[int]], live: List[int], nb_classes: int
+) -> Dict[int, List[int]]:
+    """
+    Compute the predecessors of the live states, and of a sink.
+
+    The live states are numbered from 0, and the sink is numbered last.
+
+    :return: mapping: state * nb_classes + class id -> predecessors.
+    """
+    index = {state: i for i, state in enumerate(live)}
+    sink = len(live)
+    predecessors: Dict[int, List[int]] = {}
+    for i, state in enumerate(live):
+        row = table[state]
+        for class_id in range(nb_classes):
+            end = index.get(row[class_id], sink)
+            predecessors.setdefault(end * nb_classes + class_id, []).append(i)
+    for class_id in range(nb_classes):
+        predecessors.setdefault(sink * nb_classes + class_id, []).append(sink)
+    return predecessors
+
+
+def _refine(
+    partition: _Partition, predecessors: Dict[int, List[int]], nb_classes: int
+) -> None:
+    """Refine a partition until it is stable, by Hopcroft's algorithm."""
+    # all the blocks but the largest are splitters.
+    largest = max(range(partition.nb_blocks), key=partition.size)
+    waiting: List[Tuple[int, int]] = [
+        (block, class_id)
+        for block in range(partition.nb_blocks)
+        if block != largest
+        for class_id in range(nb_classes)
+    ]
+    is_waiting: Set[Tuple[int, int]] = set(waiting)
+    while waiting:
+        splitter = waiting.pop()
+        is_waiting.discard(splitter)
+        block, class_id = splitter
+        first, end = partition.first[block], partition.end[block]
+        for element in partition.elements[first:end]:
+            for predecessor in predecessors.get(element * nb_classes + class_id, ()):
+                partition.mark(predecessor)
+        for old_block, new_block in partition.split():
+            smaller = (
+                new_block
+                if partition.size(new_block) <= partition.size(old_block)
+                else old_block
+            )
+            for other_class in range(nb_classes):
+                if (old_block, other_class) in is_waiting:
+                    added = (new_block, other_class)
+                else:
+                    added = (smaller, other_class)
+                waiting.append(added)
+                is_waiting.add(added)
+
+
+def minimize_table(
+    table: Sequence[Sequence[int]],
+    accepting: Sequence[bool],
+    initial_state: int,
+) -> Tuple[List[int], int]:
+    """
+    Compute the equivalence classes of the states of a DFA.
+
+    The states that are unreachable, or that cannot reach an accepting
+    state, are dropped: the minimal DFA has no rejecting sink.
+
+    :param table: the transition table: state x class id -> state,
+      or -1 if there is no successor.
+    :param accepting: whether each state is accepting.
+    :param initial_state: the initial state.
+    :return: the block of each state, or -1 if it is dropped,
+      and the number of blocks. The block of the initial state is 0.
+    """
+    blocks = [_NO_SUCCESSOR] * len(table)
+    live = _live_states(table, accepting, initial_state)
+    if not live:
+        blocks[initial_state] = 0
+        return blocks, 1
+    sink = len(live)
+    nb_classes = len(table[initial_state])
+    partition = _Partition(sink + 1)
+    # the initial partition: accepting, rejecting, and sink states.
+    for i, state in enumerate(live):
+        if accepting[state]:
+            partition.mark(i)
+    partition.split()
+    partition.mark(sink)
+    partition.split()
+    _refine(partition, _predecessors(table, live, nb_classes), nb_classes)
+
+    # renumber the blocks, from the one of the initial state; drop the sink.
+    sink_block = partition.block_of[sink]
+    numbering = {partition.block_of[live.index(initial_state)]: 0}
+    for i, state in enumerate(live):
+        block = partition.block_of[i]
+        if block != sink_block:
+            blocks[state] = numbering.setdefault(block, len(numbering))
+    return blocks, len(numbering)
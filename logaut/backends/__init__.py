@@ -26,15 +26,24 @@ Backends for logaut.
 This subpackage contains backend abstract definitions
 and some of its implementations.
 """
+import threading
+from typing import Any, Dict, Hashable, Tuple, Type
+
 from logaut._registry import Registry
 from logaut.backends.base import Backend
+from logaut.helpers import make_options_key
 
 _backend_registry = Registry[Backend]()
+_backend_pool: Dict[Tuple[str, Hashable], Backend] = {}
+_backend_pool_lock = threading.Lock()
+# the classes of the backends, by id, so that the registry is looked up once.
+_backend_classes: Dict[str, Type[Backend]] = {}
 
 
 def register(*args, **kwargs) -> None:
     """Register a backend."""
     _backend_registry.register(*args, **kwargs)
+    _backend_classes.clear()
 
 
 def make(*args, **kwargs) -> Backend:
@@ -42,5 +51,54 @@ def make(*args, **kwargs) -> Backend:
     return _backend_registry.make(*args, **kwargs)
 
 
+def get_backend_class(id_: str) -> Type[Backend]:
+    """
+    Get the class of a backend, without instantiating it.
+
+    The class is looked up in the registry only the first time.
+
+    :param id_: the backend identifier.
+    :return: the backend class.
+    """
+    backend_cls = _backend_classes.get(id_)
+    if backend_cls is None:
+        backend_cls = _backend_registry.make_cls(id_)
+        _backend_classes[id_] = backend_cls
+    return backend_cls
+
+
+def get_backend(id_: str, **kwargs: Any) -> Backend:
+    """
+    Get a backend instance from the pool of backends.
+
+    The backend is instantiated (hence, checked) only the first time it is
+    requested with a given id and set of options; afterwards, the same
+    instance is returned to every caller. Hence, backends must not keep
+    per-translation state.
+
+    :param id_: the backend identifier.
+    :param kwargs: the backend options.
+    :return: the backend instance.
+    """
+    key = (id_, make_options_key(kwargs))
+    backend = _backend_pool.get(key)
+    if backend is None:
+        with _backend_pool_lock:
+            backend = _backend_pool.get(key)
+            if backend is None:
+                backend = make(id_, **kwargs)
+                _backend_pool[key] = backend
+    return backend
+
+
+def reset() -> None:
+    """Empty the pool of backends, so that they get instantiated again."""
+    with _backend_pool_lock:
+        _backend_pool.clear()
+    _backend_classes.clear()
+
+
 register(id_="lydia", entry_point="logaut.backends.lydia.core:LydiaBackend")
 register(id_="ltlf2dfa", entry_point="logaut.backends.ltlf2dfa.core:LTLf2DFABackend")
+register(id_="native", entry_point="logaut.backends.native.core:NativeBackend")
+register(id_="mona", entry_point="logaut.backends.mona.core:MonaBackend")
@@ -21,12 +21,14 @@
 #
 
 """Abstract definition of a backend."""
+import asyncio
 import inspect
 import re
 from abc import ABC, ABCMeta
 from enum import Enum
 from functools import wraps
 from operator import attrgetter
+from typing import Callable
 
 from pylogics.syntax.base import Formula
 from pythomata.core import DFA
@@ -86,7 +88,16 @@ class _MetaBackend(ABCMeta):
 
 
 class Backend(ABC, metaclass=_MetaBackend):
-    """Logaut back-end interface."""
+    """
+    Logaut back-end interface.
+
+    If 'direct_construction' is true, the DFAs of simple formulas,
+    e.g. temporal-free ones, are built by logaut.patterns without calling
+    the backend; the backend must then accept the 'representation'
+    and 'minimize_guards' options, like the built-in ones.
+    """
+
+    direct_construction: bool = False
 
     def __init__(self) -> None:
         """Initialize the backend."""
@@ -102,6 +113,31 @@ class Backend(ABC, metaclass=_MetaBackend):
     def init_checks(self) -> None:
         """Do initialization checks."""
 
+    @classmethod
+    def check_atoms(cls, formula: Formula) -> None:
+        """
+        Check that the backend supports the atoms of a formula.
+
+        It is also called before building the DFA of a simple formula
+        directly (see 'direct_construction'), so that the same formulas
+        are rejected with or without the backend.
+
+        :param formula: the formula
+        :raises ValueError: if an atom is not supported.
+        """
+
+    @property
+    def tool_version(self) -> str:
+        """
+        Get the version of the tool the backend relies on.
+
+        It is used, e.g., to invalidate cached translations when the tool changes.
+        Backends that wrap an external tool should override it.
+
+        :return: a string identifying the tool version.
+        """
+        return ""
+
     def ltl2dfa(self, formula: Formula) -> DFA:
         """
         Transform an LTL formula into a DFA.
@@ -155,3 +191,70 @@ class Backend(ABC, metaclass=_MetaBackend):
         :return: the equivalent DFA
         """
         raise self.__not_supported_error(self.mso2dfa.__name__)
+
+    @staticmethod
+    async def _run_in_executor(
+        method: Callable[[Formula], DFA], formula: Formula
+    ) -> DFA:
+        """
+        Run a synchronous translation in the default executor of the event loop.
+
+        This is the default implementation of the asynchronous methods;
+        backends that call external tools should override them.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, method, formula)
+
+    async def altl2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform an LTL formula into a DFA, asynchronously.
+
+        :param formula: an LTL formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.ltl2dfa, formula)
+
+    async def aldl2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform an LDL formula into a DFA, asynchronously.
+
+        :param formula: an LDL formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.ldl2dfa, formula)
+
+    async def apltl2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform a PLTL formula into a DFA, asynchronously.
+
+        :param formula: a PLTL formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.pltl2dfa, formula)
+
+    async def apldl2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform a PLDL formula into a DFA, asynchronously.
+
+        :param formula: a PLDL formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.pldl2dfa, formula)
+
+    async def afol2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform a FOL formula into a DFA, asynchronously.
+
+        :param formula: a FOL formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.fol2dfa, formula)
+
+    async def amso2dfa(self, formula: Formula) -> DFA:
+        """
+        Transform a MSO formula into a DFA, asynchronously.
+
+        :param formula: a MSO formula
+        :return: the equivalent DFA
+        """
+        return await self._run_in_executor(self.mso2dfa, formula)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Operations on MONA guards, seen as cubes.
+
+A MONA guard over n variables, e.g. '1X0', is a cube, i.e. a conjunction
+of literals: character ith is '1' if the ith variable occurs positively,
+'0' if it occurs negatively, and 'X' if it does not occur.
+A cube is encoded by two n-bit masks: 'care' has the ith bit set if the
+ith variable occurs, 'value' has it set if the variable occurs positively.
+A set of guards is intended to be in disjunction, i.e. it is a cover.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from logaut.backends.common.process_mona_output import MONAOutput
+
+Cube = Tuple[int, int]
+
+
+def parse_cube(guard: str) -> Cube:
+    """
+    Parse a MONA guard.
+
+    :param guard: the MONA guard, e.g. '1X0'.
+    :return: the pair of masks (care, value).
+    """
+    care = 0
+    value = 0
+    for index, character in enumerate(guard):
+        if character != "X":
+            care |= 1 << index
+            if character == "1":
+                value |= 1 << index
+    return care, value
+
+
+def format_cube(cube: Cube, nb_variables: int) -> str:
+    """
+    Format a cube as a MONA guard.
+
+    :param cube: the pair of masks (care, value).
+    :param nb_variables: the number of variables.
+    :return: the MONA guard, e.g. '1X0'.
+    """
+    care, value = cube
+    return "".join(
+        ("1" if (value >> index) & 1 else "0") if (care >> index) & 1 else "X"
+        for index in range(nb_variables)
+    )
+
+
+def _is_contained(cube: Cube, other: Cube) -> bool:
+    """Check whether a cube implies another cube."""
+    care, value = cube
+    other_care, other_value = other
+    return other_care & ~care == 0 and (value ^ other_value) & other_care == 0
+
+
+def _cofactor(cubes: Iterable[Cube], cube: Cube) -> List[Cube]:
+    """Compute the cofactor of a cover with respect to a cube."""
+    care, value = cube
+    return [
+        (other_care & ~care, other_value & ~care)
+        for other_care, other_value in cubes
+        if (other_value ^ value) & other_care & care == 0
+    ]
+
+
+def _most_frequent_bit(cubes: List[Cube], variables: int) -> int:
+    """Get the bit of the variable that occurs in most cubes."""
+    best_bit, best_count = 0, -1
+    while variables:
+        bit = variables & -variables
+        variables ^= bit
+        count = sum(1 for care, _ in cubes if care & bit)
+        if count > best_count:
+            best_bit, best_count = bit, count
+    return best_bit
+
+
+def _is_tautology(cubes: List[Cube]) -> bool:
+    """Check whether a cover is a tautology, by Shannon expansion."""
+    variables = 0
+    for care, _ in cubes:
+        if care == 0:
+            return True
+        variables |= care
+    if not cubes:
+        return False
+    bit = _most_frequent_bit(cubes, variables)
+    return _is_tautology(_cofactor(cubes, (bit, 0))) and _is_tautology(
+        _cofactor(cubes, (bit, bit))
+    )
+
+
+def _covers(cubes: List[Cube], cube: Cube) -> bool:
+    """Check whether a cube implies a cover."""
+    return _is_tautology(_cofactor(cubes, cube))
+
+
+def _remove_contained(cubes: List[Cube]) -> List[Cube]:
+    """Remove the cubes that imply another cube of the cover."""
+    # cubes with fewer literals first, so to meet the containing cubes first.
+    result: List[Cube] = []
+    for cube in sorted(set(cubes), key=lambda c: bin(c[0]).count("1")):
+        if not any(_is_contained(cube, other) for other in result):
+            result.append(cube)
+    return result
+
+
+def _expand(cubes: List[Cube]) -> List[Cube]:
+    """Expand each cube into a prime implicant, by removing its literals."""
+    function = list(cubes)
+    result: List[Cube] = []
+    for cube in cubes:
+        if any(_is_contained(cube, other) for other in result):
+            continue
+        care, value = cube
+        literals = care
+        while literals:
+            bit = literals & -literals
+            literals ^= bit
+            candidate = (care & ~bit, value & ~bit)
+            if _covers(function, candidate):
+                care, value = candidate
+        result.append((care, value))
+    return _remove_contained(result)
+
+
+def _irredundant(cubes: List[Cube]) -> List[Cube]:
+    """Remove the cubes that are covered by the other ones."""
+    result = list(cubes)
+    # try to remove the cubes with more literals first.
+    for cube in sorted(cubes, key=lambda c: -bin(c[0]).count("1")):
+        others = [other for other in result if other != cube]
+        if _covers(others, cube):
+            result = others
+    return result
+
+
+def minimize_cubes(cubes: Iterable[Cube]) -> List[Cube]:
+    """
+    Minimize a cover.
+
+    Like the Espresso heuristic, the cubes are expanded into prime implicants,
+    and then the redundant ones are removed. The result is an equivalent
+    irredundant cover of primes, which is minimal with respect to the removal
+    of cubes and of literals (not necessarily of minimum size).
+
+    :param cubes: the cover.
+    :return: the minimized cover.
+    """
+    return _irredundant(_expand(_remove_contained(list(cubes))))
+
+
+def minimize_guards(guards: Iterable[str], nb_variables: int) -> Set[str]:
+    """
+    Minimize a set of MONA guards, in disjunction.
+
+    :param guards: the MONA guards.
+    :param nb_variables: the number of variables.
+    :return: an equivalent, minimized, set of MONA guards.
+    """
+    cubes = minimize_cubes(map(parse_cube, guards))
+    return {format_cube(cube, nb_variables) for cube in cubes}
+
+
+def minimize_mona_output(output: MONAOutput) -> MONAOutput:
+    """
+    Minimize the guards of all the transitions of a MONA output.
+
+    :param output: a MONAOutput instance.
+    :return: the MONAOutput instance with minimized guards.
+    """
+    nb_variables = len(output.variable_names)
+    # the same guards occur in many transitions: minimize them once.
+    minimized: Dict[FrozenSet[str], Set[str]] = {}
+    transitions: Dict[int, Dict[int, Set[str]]] = {}
+    for start_state, outgoing in output.transitions.items():
+        for end_state, guards in outgoing.items():
+            key = frozenset(guards)
+            if key not in minimized:
+                minimized[key] = minimize_guards(key, nb_variables)
+            transitions.setdefault(start_state, {})[end_state] = minimized[key]
+    return MONAOutput(
+        output.nb_states,
+        output.variable_names,
+        output.initial_state,
+        output.accepting_states,
+        output.rejecting_states,
+        transitions,
+    )
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""This module contains utilities to call the MONA tool from Python."""
+import os
+from functools import lru_cache
+from typing import List, Mapping, Optional
+
+from logaut.backends.common.process import (
+    NO_LIMITS,
+    ResourceLimits,
+    arun_command,
+    run_command,
+)
+from logaut.backends.common.process_mona_output import MONAOutput, MONAOutputParser
+from logaut.exceptions import ResourceLimitException
+from logaut.helpers import temporary_directory
+
+_MONA_PROGRAM_FILENAME = "automa.mona"
+_MONA_COMMAND = ["mona", "-q", "-u", "-w", _MONA_PROGRAM_FILENAME]
+# write the programs in memory, if a tmpfs is available.
+_SCRATCH_PARENT: Optional[str] = (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+)
+
+
+def _check_mona_result(returncode: int, output: str, stderr: str) -> str:
+    """Check that MONA succeeded, and return its output."""
+    if returncode != 0:
+        raise Exception(
+            f"the MONA command {' '.join(_MONA_COMMAND)} failed.\nstdout={output}\nstderr={stderr}"
+        )
+    return output.strip()
+
+
+def call_mona(program: str, limits: ResourceLimits = NO_LIMITS) -> str:
+    """
+    Run the MONA CLI tool on a program, and print the resulting DFA.
+
+    The program is written in a private scratch directory, so concurrent
+    calls do not interfere with each other.
+
+    :param program: the MONA program.
+    :param limits: the resource limits of the MONA process.
+    :return: the output of MONA.
+    """
+    try:
+        with temporary_directory(_SCRATCH_PARENT) as tmpdir:
+            (tmpdir / _MONA_PROGRAM_FILENAME).write_text(program)
+            result = run_command(_MONA_COMMAND, cwd=str(tmpdir), limits=limits)
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running MONA: {str(e)}") from e
+    return _check_mona_result(*result)
+
+
+async def acall_mona(program: str, limits: ResourceLimits = NO_LIMITS) -> str:
+    """
+    Run the MONA CLI tool on a program, asynchronously.
+
+    If the calling task is cancelled, the MONA process is killed.
+
+    :param program: the MONA program.
+    :param limits: the resource limits of the MONA process.
+    :return: the output of MONA.
+    """
+    try:
+        with temporary_directory(_SCRATCH_PARENT) as tmpdir:
+            (tmpdir / _MONA_PROGRAM_FILENAME).write_text(program)
+            result = await arun_command(_MONA_COMMAND, cwd=str(tmpdir), limits=limits)
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running MONA: {str(e)}") from e
+    return _check_mona_result(*result)
+
+
+def call_mona_to_mona_output(
+    program: str,
+    limits: ResourceLimits = NO_LIMITS,
+    variable_mapping: Optional[Mapping[str, str]] = None,
+) -> MONAOutput:
+    """
+    Run the MONA CLI tool on a program, and parse the DFA as its output is produced.
+
+    :param program: the MONA program.
+    :param limits: the resource limits of the MONA process.
+    :param variable_mapping: mapping: MONA variable -> variable name.
+    :return: the MONA output of the computed DFA.
+    """
+    parser = MONAOutputParser(variable_mapping)
+    try:
+        with temporary_directory(_SCRATCH_PARENT) as tmpdir:
+            (tmpdir / _MONA_PROGRAM_FILENAME).write_text(program)
+            result = run_command(
+                _MONA_COMMAND, cwd=str(tmpdir), limits=limits, sink=parser.feed
+            )
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running MONA: {str(e)}") from e
+    _check_mona_result(*result)
+    return parser.close()
+
+
+async def acall_mona_to_mona_output(
+    program: str,
+    limits: ResourceLimits = NO_LIMITS,
+    variable_mapping: Optional[Mapping[str, str]] = None,
+) -> MONAOutput:
+    """
+    Run the MONA CLI tool on a program asynchronously, and parse the DFA as it is produced.
+
+    If the calling task is cancelled, the MONA process is killed.
+
+    :param program: the MONA program.
+    :param limits: the resource limits of the MONA process.
+    :param variable_mapping: mapping: MONA variable -> variable name.
+    :return: the MONA output of the computed DFA.
+    """
+    parser = MONAOutputParser(variable_mapping)
+    try:
+        with temporary_directory(_SCRATCH_PARENT) as tmpdir:
+            (tmpdir / _MONA_PROGRAM_FILENAME).write_text(program)
+            result = await arun_command(
+                _MONA_COMMAND, cwd=str(tmpdir), limits=limits, sink=parser.feed
+            )
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running MONA: {str(e)}") from e
+    _check_mona_result(*result)
+    return parser.close()
+
+
+def skip_initial_state(output: MONAOutput) -> MONAOutput:
+    """
+    Skip the initial state of a DFA computed by MONA for a WS1S formula.
+
+    The initial state reads a dummy letter, with a single transition
+    to the state where the traces are actually read from. The result has
+    that state as initial state, numbered 0, and only the states reachable
+    from it.
+
+    :param output: the MONA output.
+    :return: the MONA output of the DFA on traces.
+    """
+    successors = output.transitions.get(output.initial_state, {})
+    if len(successors) != 1:
+        raise Exception(
+            f"expected one transition from the initial state of the MONA DFA, "
+            f"got {len(successors)}"
+        )
+    (start,) = successors
+    index = {start: 0}
+    queue: List[int] = [start]
+    while queue:
+        for end in output.transitions.get(queue.pop(), {}):
+            if end not in index:
+                index[end] = len(index)
+                queue.append(end)
+    return MONAOutput(
+        len(index),
+        output.variable_names,
+        0,
+        {index[state] for state in output.accepting_states if state in index},
+        {index[state] for state in output.rejecting_states if state in index},
+        {
+            index[state]: {index[end]: guards for end, guards in outgoing.items()}
+            for state, outgoing in output.transitions.items()
+            if state in index
+        },
+    )
+
+
+@lru_cache(maxsize=None)
+def get_mona_version() -> str:
+    """
+    Get the version of the MONA CLI tool.
+
+    The result is computed once per process.
+
+    :return: the first line printed by 'mona --version',
+      or 'unknown' if it cannot be determined.
+    """
+    try:
+        returncode, output, _ = run_command(["mona", "--version"])
+    except Exception:  # pylint: disable=broad-except
+        return "unknown"
+    lines = output.strip().splitlines()
+    if returncode != 0 or not lines:
+        return "unknown"
+    return lines[0].strip()
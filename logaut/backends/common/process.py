@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""This module contains utilities to run the external tools within resource limits."""
+import asyncio
+import os
+import re
+import signal
+import subprocess  # nosec
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from logaut.exceptions import (
+    MemoryLimitException,
+    StateLimitException,
+    TimeLimitException,
+)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+_IS_POSIX = os.name == "posix"
+_CHUNK_SIZE = 1 << 16
+_NB_STATES_REGEX = re.compile(rb"Automaton has ([0-9]+) state")
+# enough to contain the header line with the number of states.
+_TAIL_SIZE = 64
+_OUT_OF_MEMORY_REGEX = re.compile(
+    r"bad_alloc|MemoryError|out of memory|cannot allocate memory", flags=re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Resource limits of a run of an external tool.
+
+    timeout: the maximum wall-clock time, in seconds.
+    memory_limit: the maximum size, in bytes, of the address space (POSIX only).
+    max_states: the maximum number of states of the computed DFA.
+    """
+
+    timeout: Optional[float] = None
+    memory_limit: Optional[int] = None
+    max_states: Optional[int] = None
+
+    def __post_init__(self):
+        """Do consistency checks after initialization."""
+        for name in ("timeout", "memory_limit", "max_states"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"'{name}' must be positive, got {value}")
+        if self.memory_limit is not None and resource is None:
+            raise ValueError("'memory_limit' is supported only on POSIX systems")
+
+
+NO_LIMITS = ResourceLimits()
+
+
+class _OutputMonitor:
+    """
+    Collect the standard output of a tool, and look for the number of states.
+
+    The number of states is printed before the transitions,
+    so the run can be stopped before the whole DFA is printed.
+    """
+
+    def __init__(
+        self, max_states: Optional[int], sink: Optional[Callable[[bytes], None]]
+    ) -> None:
+        """Initialize the monitor."""
+        self.chunks: List[bytes] = []
+        self.error: Optional[Exception] = None
+        self._sink = sink
+        self.nb_states: Optional[int] = None
+        self._max_states = max_states
+        self._tail = b""
+
+    @property
+    def exceeded(self) -> bool:
+        """Check whether the number of states is over the limit."""
+        return (
+            self._max_states is not None
+            and self.nb_states is not None
+            and self.nb_states > self._max_states
+        )
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Feed a chunk of the output.
+
+        :param chunk: the chunk.
+        :return: False if the number of states is over the limit, True otherwise.
+        """
+        if self._sink is None:
+            self.chunks.append(chunk)
+        else:
+            self._sink(chunk)
+        if self._max_states is None or self.nb_states is not None:
+            return True
+        buffer = self._tail + chunk
+        match = _NB_STATES_REGEX.search(buffer)
+        if match is None:
+            self._tail = buffer[-_TAIL_SIZE:]
+            return True
+        self.nb_states = int(match.group(1))
+        return not self.exceeded
+
+    @property
+    def output(self) -> str:
+        """Get the whole output."""
+        return b"".join(self.chunks).decode()
+
+
+def _popen_kwargs() -> Dict[str, Any]:
+    """Get the keyword arguments to start a tool process."""
+    kwargs: Dict[str, Any] = {}
+    if _IS_POSIX:
+        # the tool (and any process it spawns) can be killed as a group.
+        kwargs["start_new_session"] = True
+    return kwargs
+
+
+def _limited_command(command: Sequence[str], limits: ResourceLimits) -> List[str]:
+    """
+    Get the command that runs a tool within the memory limit.
+
+    The limit is set by a shell that then replaces itself with the tool,
+    rather than by a 'preexec_fn' hook, which is not safe when the calling
+    process has other threads (e.g. the readers of the other runs).
+    """
+    if limits.memory_limit is None:
+        return list(command)
+    # 'ulimit -v' takes kibibytes.
+    memory_limit_kib = max(1, limits.memory_limit // 1024)
+    return [
+        "/bin/sh",
+        "-c",
+        f'ulimit -v {memory_limit_kib} && exec "$@"',
+        "sh",
+        *command,
+    ]
+
+
+def _kill(process: Any) -> None:
+    """Kill a tool process, together with its process group on POSIX systems."""
+    try:
+        if _IS_POSIX:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:  # pragma: no cover
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _check_result(
+    command: Sequence[str],
+    limits: ResourceLimits,
+    monitor: _OutputMonitor,
+    returncode: int,
+    stderr: str,
+) -> None:
+    """Raise the right exception if the run violated a limit."""
+    if monitor.exceeded:
+        raise StateLimitException(
+            f"the DFA computed by '{command[0]}' has {monitor.nb_states} states, "
+            f"more than the limit of {limits.max_states}"
+        )
+    out_of_memory = returncode < 0 or _OUT_OF_MEMORY_REGEX.search(stderr)
+    if returncode != 0 and limits.memory_limit is not None and out_of_memory:
+        raise MemoryLimitException(
+            f"'{command[0]}' exceeded the memory limit of {limits.memory_limit} bytes"
+        )
+
+
+def _time_limit_exception(
+    command: Sequence[str], limits: ResourceLimits
+) -> TimeLimitException:
+    """Get the exception for a run that timed out."""
+    return TimeLimitException(
+        f"'{command[0]}' did not terminate within {limits.timeout} seconds"
+    )
+
+
+def _start_readers(
+    process: subprocess.Popen, monitor: _OutputMonitor, stderr_chunks: List[bytes]
+) -> List[threading.Thread]:
+    """Start the threads that read the standard output and error of a tool."""
+
+    def _read_stdout() -> None:
+        try:
+            for chunk in iter(lambda: process.stdout.read1(_CHUNK_SIZE), b""):  # type: ignore
+                if not monitor.feed(chunk):
+                    # the rest of the output is discarded.
+                    _kill(process)
+                    break
+        except Exception as e:  # pylint: disable=broad-except
+            # e.g. the sink failed: stop the tool, and re-raise in the caller.
+            monitor.error = e
+            _kill(process)
+
+    def _read_stderr() -> None:
+        stderr_chunks.append(process.stderr.read())  # type: ignore
+
+    readers = [
+        threading.Thread(target=_read_stdout, daemon=True),
+        threading.Thread(target=_read_stderr, daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    return readers
+
+
+def run_command(
+    command: Sequence[str],
+    cwd: str = ".",
+    limits: ResourceLimits = NO_LIMITS,
+    sink: Optional[Callable[[bytes], None]] = None,
+) -> Tuple[int, str, str]:
+    """
+    Run a tool within resource limits.
+
+    On any violation, the tool process is killed and a
+    ResourceLimitException is raised.
+
+    :param command: the command and its arguments.
+    :param cwd: the working directory of the tool.
+    :param limits: the resource limits.
+    :param sink: if provided, it consumes the standard output chunk by chunk,
+      as it is produced; then, the returned standard output is empty.
+    :return: the return code, the standard output and the standard error.
+    """
+    process = subprocess.Popen(  # nosec
+        _limited_command(command, limits),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        **_popen_kwargs(),
+    )
+    monitor = _OutputMonitor(limits.max_states, sink)
+    stderr_chunks: List[bytes] = []
+    readers = _start_readers(process, monitor, stderr_chunks)
+    try:
+        returncode = process.wait(timeout=limits.timeout)
+    except subprocess.TimeoutExpired:
+        _kill(process)
+        process.wait()
+        raise _time_limit_exception(command, limits)
+    except BaseException:
+        _kill(process)
+        process.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join()
+        process.stdout.close()  # type: ignore
+        process.stderr.close()  # type: ignore
+
+    if monitor.error is not None:
+        raise monitor.error
+    stderr = b"".join(stderr_chunks).decode()
+    _check_result(command, limits, monitor, returncode, stderr)
+    return returncode, monitor.output, stderr
+
+
+async def arun_command(
+    command: Sequence[str],
+    cwd: str = ".",
+    limits: ResourceLimits = NO_LIMITS,
+    sink: Optional[Callable[[bytes], None]] = None,
+) -> Tuple[int, str, str]:
+    """
+    Run a tool within resource limits, without blocking the event loop.
+
+    On any violation, or if the calling task is cancelled,
+    the tool process is killed.
+
+    :param command: the command and its arguments.
+    :param cwd: the working directory of the tool.
+    :param limits: the resource limits.
+    :param sink: if provided, it consumes the standard output chunk by chunk,
+      as it is produced; then, the returned standard output is empty.
+    :return: the return code, the standard output and the standard error.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *_limited_command(command, limits),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        **_popen_kwargs(),
+    )
+    monitor = _OutputMonitor(limits.max_states, sink)
+
+    async def _read_stdout() -> None:
+        while True:
+            chunk = await process.stdout.read(_CHUNK_SIZE)  # type: ignore
+            if not chunk:
+                break
+            if not monitor.feed(chunk):
+                # the rest of the output is discarded.
+                _kill(process)
+                break
+
+    try:
+        _, stderr_bytes, returncode = await asyncio.wait_for(
+            asyncio.gather(
+                _read_stdout(),
+                process.stderr.read(),  # type: ignore
+                process.wait(),
+            ),
+            timeout=limits.timeout,
+        )
+    except asyncio.TimeoutError:
+        _kill(process)
+        await process.wait()
+        raise _time_limit_exception(command, limits)
+    except BaseException:
+        if process.returncode is None:
+            _kill(process)
+            await asyncio.shield(process.wait())
+        raise
+
+    stderr = stderr_bytes.decode()
+    _check_result(command, limits, monitor, returncode, stderr)
+    return returncode, monitor.output, stderr
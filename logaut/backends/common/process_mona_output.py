@@ -22,14 +22,16 @@
 
 """Parse Lydia output to produce a pythomata.DFA."""
 
-import re
+from collections.abc import MutableMapping
 from dataclasses import dataclass
-from typing import Dict, List, Match, Set, Tuple, Union, cast
+from typing import BinaryIO, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 from pythomata.impl.symbolic import SymbolicDFA
 from sympy import And, Not, Or, Symbol, true
 from sympy.logic.boolalg import BooleanAtom, BooleanFunction
 
+_CHUNK_SIZE = 1 << 16
+
 
 @dataclass
 class MONAOutput:
@@ -55,117 +57,167 @@ class MONAOutput:
         )
 
 
-@dataclass
-class _MONAOutputWrapper:
-    """A wrapper to the textual output of MONA."""
+def _after_colon(line: bytes) -> bytes:
+    """Get the part of a line after the first colon."""
+    return line.partition(b":")[2]
 
-    output: str
 
-    @property
-    def variable_names(self) -> Tuple[str, ...]:
-        """Get the variable names."""
-        return tuple(
-            cast(
-                Match,
-                re.search("DFA for formula with free variables: (.*)", self.output),
-            )
-            .group(1)
-            .split()
-        )
+class MONAOutputParser:
+    """
+    Incremental, single-pass parser of the MONA DFA output.
 
-    @property
-    def initial_state(self) -> int:
-        """Get the initial state."""
-        return int(
-            cast(Match, re.search("Initial state: (.*)\n", self.output)).group(1)
-        )
+    Feed it the output in chunks of bytes, e.g. as they are read from a pipe,
+    then call 'close' to get the parsed output. Only the last incomplete line
+    is buffered, and each line is looked at once. The lines before the
+    automaton description (e.g. the log of Lydia) and after its transitions
+    (e.g. the verdict of MONA) are skipped.
 
-    @property
-    def accepting_states(self) -> Set[int]:
-        """Get the accepting states."""
-        return set(
-            map(
-                int,
-                cast(Match, re.search("Accepting states: (.*)\n", self.output))
-                .group(1)
-                .split(),
-            )
-        )
+    The names of the variables can be mapped, e.g. to undo their upper-casing:
+    only the header line that lists them is affected.
+    """
 
-    @property
-    def rejecting_states(self) -> Set[int]:
-        """Get the rejecting states."""
-        return set(
-            map(
-                int,
-                cast(Match, re.search("Rejecting states: (.*)\n", self.output))
-                .group(1)
-                .split(),
-            )
-        )
+    _HEADER = b"DFA for formula with free variables:"
+    _INITIAL_STATE = b"Initial state:"
+    _ACCEPTING_STATES = b"Accepting states:"
+    _REJECTING_STATES = b"Rejecting states:"
+    _NB_STATES = b"Automaton has "
+    _TRANSITION = b"State "
+    _ARROW = b" -> state "
 
-    @property
-    def nb_states(self) -> int:
-        """Get the number of states."""
-        return int(
-            cast(
-                Match,
-                re.search(
-                    r"Automaton has ([0-9]+) state(\(?s\)?)? and .* BDD-node(\(?s\)?)?",
-                    self.output,
-                ),
-            ).group(1)
-        )
+    def __init__(self, variable_mapping: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Initialize the parser.
+
+        :param variable_mapping: mapping: name in the output -> variable name.
+          The names not in the mapping are kept.
+        """
+        self._variable_mapping = variable_mapping
+        self._buffer = b""
+        self._in_automaton = False
+        self._is_done = False
+        self._variable_names: Optional[Tuple[str, ...]] = None
+        self._initial_state: Optional[int] = None
+        self._accepting_states: Optional[Set[int]] = None
+        self._rejecting_states: Optional[Set[int]] = None
+        self._nb_states: Optional[int] = None
+        self._transitions: Dict[int, Dict[int, Set[str]]] = {}
+        # guards repeat a lot: decode each of them once, and share the string.
+        self._guards: Dict[bytes, str] = {}
 
     @property
-    def raw_transitions(self) -> Dict[int, Dict[int, Set[str]]]:
+    def nb_states(self) -> Optional[int]:
+        """Get the number of states, if already parsed."""
+        return self._nb_states
+
+    def feed(self, chunk: bytes) -> None:
         """
-        Get the raw transitions.
+        Feed a chunk of the output.
 
-        mapping: start state -> end state -> {guard to reach end from start}
+        :param chunk: the chunk.
         """
-        raw_transitions: Dict[int, Dict[int, Set[str]]] = {}
-        lines = self.output.splitlines()
-        # from the 8th line, the output specifies the transitions.
-        transition_strings = lines[7:]
-        for t in transition_strings:
-            match = cast(
-                Match, re.search("State ([0-9]+): ([01X]+|) -> state ([0-9]+)", t)
-            )
-            if match is None:
-                continue
-            start_state = int(match.group(1))
-            guard = match.group(2)
-            end_state = int(match.group(3))
-            raw_transitions.setdefault(start_state, {}).setdefault(
-                end_state, set()
-            ).add(guard)
-        return raw_transitions
+        lines = (self._buffer + chunk).split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self._parse_line(line.rstrip(b"\r"))
+
+    def close(self) -> MONAOutput:
+        """
+        Terminate the parsing.
 
+        :return: the parsed MONA output.
+        """
+        self._parse_line(self._buffer.rstrip(b"\r"))
+        self._buffer = b""
+        if (
+            self._variable_names is None
+            or self._initial_state is None
+            or self._accepting_states is None
+            or self._rejecting_states is None
+            or self._nb_states is None
+        ):
+            raise Exception("cannot find automaton description in MONA output.")
+        return MONAOutput(
+            self._nb_states,
+            self._variable_names,
+            self._initial_state,
+            self._accepting_states,
+            self._rejecting_states,
+            self._transitions,
+        )
 
-def parse_mona_output(dfa_output: str) -> MONAOutput:
+    def _parse_line(self, line: bytes) -> None:
+        """Parse a line of the output."""
+        if line.startswith(self._HEADER):
+            if self._in_automaton or self._is_done:
+                raise Exception("found more than one automaton in MONA output.")
+            self._in_automaton = True
+            self._parse_header(line)
+        elif not self._in_automaton:
+            return
+        elif line.startswith(self._TRANSITION):
+            self._parse_transition(line)
+        elif line.startswith(self._INITIAL_STATE):
+            self._initial_state = int(_after_colon(line))
+        elif line.startswith(self._ACCEPTING_STATES):
+            self._accepting_states = set(map(int, _after_colon(line).split()))
+        elif line.startswith(self._REJECTING_STATES):
+            self._rejecting_states = set(map(int, _after_colon(line).split()))
+        elif line.startswith(self._NB_STATES):
+            # e.g. 'Automaton has 2 states and 2 BDD-nodes'
+            self._nb_states = int(line.split(maxsplit=3)[2])
+        elif self._transitions:
+            # the description ends with the last transition.
+            self._in_automaton = False
+            self._is_done = True
+
+    def _parse_header(self, line: bytes) -> None:
+        """Parse the line of the free variables, mapping their names."""
+        names = _after_colon(line).decode().split()
+        if self._variable_mapping is not None:
+            names = [self._variable_mapping.get(name, name) for name in names]
+        self._variable_names = tuple(names)
+
+    def _parse_transition(self, line: bytes) -> None:
+        """Parse a transition line, e.g. 'State 0: 1X0 -> state 1'."""
+        start, _, rest = line.partition(b":")
+        raw_guard, _, end = rest.partition(self._ARROW)
+        guard = self._guards.get(raw_guard)
+        if guard is None:
+            guard = self._guards[raw_guard] = raw_guard.strip().decode()
+        self._transitions.setdefault(int(start.split()[1]), {}).setdefault(
+            int(end), set()
+        ).add(guard)
+
+
+def parse_mona_output(
+    dfa_output: str, variable_mapping: Optional[Mapping[str, str]] = None
+) -> MONAOutput:
     """
     Parse the MONA DFA output.
 
     :param dfa_output: the textual description of the MONA DFA.
+    :param variable_mapping: mapping: name in the output -> variable name.
     :return: a MONAOutput instance.
     """
-    wrapper = _MONAOutputWrapper(dfa_output)
-    variable_names: Tuple[str, ...] = wrapper.variable_names
-    initial_state: int = wrapper.initial_state
-    accepting_states: Set[int] = wrapper.accepting_states
-    rejecting_states = wrapper.rejecting_states
-    nb_states: int = wrapper.nb_states
-    raw_transitions = wrapper.raw_transitions
-    mona_output = MONAOutput(
-        nb_states,
-        variable_names,
-        initial_state,
-        accepting_states,
-        rejecting_states,
-        raw_transitions,
-    )
-    return mona_output
+    parser = MONAOutputParser(variable_mapping)
+    parser.feed(dfa_output.encode())
+    return parser.close()
+
+
+def parse_mona_output_stream(
+    stream: BinaryIO, chunk_size: int = _CHUNK_SIZE
+) -> MONAOutput:
+    """
+    Parse the MONA DFA output from a binary stream, e.g. a file.
+
+    :param stream: the binary stream.
+    :param chunk_size: the number of bytes read at once.
+    :return: a MONAOutput instance.
+    """
+    parser = MONAOutputParser()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        parser.feed(chunk)
+    return parser.close()
 
 
 def from_set_of_guards_to_sympy_formula(
@@ -204,14 +256,131 @@ def from_set_of_guards_to_sympy_formula(
     return result
 
 
-def parse_automaton(output: MONAOutput) -> SymbolicDFA:
+class _LazyGuards(MutableMapping):
+    """
+    The outgoing transitions of a state, with lazily computed SymPy guards.
+
+    mapping: end state -> SymPy guard.
+    The guard of a transition is computed from the MONA guards the first time
+    it is accessed, and then stored.
+    """
+
+    def __init__(
+        self, raw_guards: Dict[int, Set[str]], variable_names: Tuple[str, ...]
+    ) -> None:
+        """
+        Initialize the transitions.
+
+        :param raw_guards: mapping: end state -> MONA guards.
+        :param variable_names: the variable names.
+        """
+        self._raw_guards = dict(raw_guards)
+        self._variable_names = variable_names
+        self._guards: Dict[int, BooleanFunction] = {}
+
+    def __getitem__(self, end_state: int) -> BooleanFunction:
+        """Get the guard, computing it if needed."""
+        guard = self._guards.get(end_state)
+        if guard is not None:
+            return guard
+        raw_guard = self._raw_guards.get(end_state)
+        if raw_guard is None:
+            # computed by a concurrent reader meanwhile, or missing.
+            return self._guards[end_state]
+        guard = from_set_of_guards_to_sympy_formula(raw_guard, self._variable_names)
+        # store the guard before removing the raw one, so that concurrent
+        # readers of a shared DFA always find the transition in one of them.
+        self._guards[end_state] = guard
+        self._raw_guards.pop(end_state, None)
+        return guard
+
+    def __setitem__(self, end_state: int, guard: BooleanFunction) -> None:
+        """Set the guard."""
+        self._guards[end_state] = guard
+        self._raw_guards.pop(end_state, None)
+
+    def __delitem__(self, end_state: int) -> None:
+        """Remove the transition."""
+        guard = self._guards.pop(end_state, None)
+        raw_guard = self._raw_guards.pop(end_state, None)
+        if guard is None and raw_guard is None:
+            raise KeyError(end_state)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the end states."""
+        # a snapshot: accessing the guards while iterating moves them between dicts.
+        # The raw guards are read first: a guard computed meanwhile is then
+        # in the computed ones.
+        raw_end_states = list(self._raw_guards)
+        return iter(dict.fromkeys([*self._guards, *raw_end_states]))
+
+    def __len__(self) -> int:
+        """Get the number of transitions."""
+        return sum(1 for _ in self)
+
+    def __contains__(self, end_state: object) -> bool:
+        """Check whether there is a transition, without computing its guard."""
+        return end_state in self._raw_guards or end_state in self._guards
+
+    def __copy__(self) -> "_LazyGuards":
+        """Copy the transitions, sharing the (immutable) guards."""
+        result = _LazyGuards(self._raw_guards, self._variable_names)
+        result._guards = dict(self._guards)
+        for end_state in result._guards:
+            result._raw_guards.pop(end_state, None)
+        return result
+
+    def relabel(
+        self, variable_names: Tuple[str, ...], symbols: Dict[Symbol, Symbol]
+    ) -> "_LazyGuards":
+        """
+        Copy the transitions, renaming the variables of the guards.
+
+        :param variable_names: the new variable names, in order of character.
+        :param symbols: the new symbol of each symbol to rename.
+        :return: the relabeled transitions.
+        """
+        result = _LazyGuards(self._raw_guards, variable_names)
+        result._guards = {
+            end_state: guard.xreplace(symbols)
+            for end_state, guard in list(self._guards.items())
+        }
+        for end_state in result._guards:
+            result._raw_guards.pop(end_state, None)
+        return result
+
+    def get_raw_guards(self, end_state: int) -> Optional[Set[str]]:
+        """Get the MONA guards, if the SymPy guard has not been computed yet."""
+        return self._raw_guards.get(end_state)
+
+
+class LazySymbolicDFA(SymbolicDFA):
+    """
+    A pythomata.SymbolicDFA whose SymPy guards are computed lazily.
+
+    The MONA guards of each transition are kept until its guard is first
+    accessed, e.g. to compute a successor or to render the DFA. Hence,
+    using only the states and the acceptance condition costs no SymPy work.
+    """
+
+    def is_guard_computed(self, start_state: int, end_state: int) -> bool:
+        """Check whether the SymPy guard of a transition has been computed."""
+        transitions = self._transition_function.get(start_state, {})
+        if isinstance(transitions, _LazyGuards):
+            return transitions.get_raw_guards(end_state) is None
+        return True
+
+
+def parse_automaton(output: MONAOutput, lazy: bool = False) -> SymbolicDFA:
     """
     Build a pythomata.SymbolicDFA, given the MONAOutput object.
 
     :param output: a MONAOutput instance.
+    :param lazy: if True, return a LazySymbolicDFA, whose SymPy guards
+      are computed only when accessed.
     :return: the (symbolic) DFA.
     """
-    automaton = SymbolicDFA()
+    automaton = LazySymbolicDFA() if lazy else SymbolicDFA()
 
     # create states, set initial state and set accepting states.
     automaton.set_accepting_state(0, 0 in output.accepting_states)
@@ -224,6 +393,11 @@ def parse_automaton(output: MONAOutput) -> SymbolicDFA:
 
     # populate transitions.
     for start_state, outgoing_transitions in output.transitions.items():
+        if lazy:
+            automaton._transition_function[start_state] = _LazyGuards(
+                outgoing_transitions, output.variable_names
+            )
+            continue
         for end_state, guards in outgoing_transitions.items():
             symbolic_guard = from_set_of_guards_to_sympy_formula(
                 guards, output.variable_names
@@ -28,30 +28,28 @@ Repository:
     https://github.com/whitemech/LTLf2DFA/
 
 """
-import re
 import shutil
-from functools import singledispatch
-from typing import Match, Set, Tuple, cast
+from typing import Dict, Iterable, Optional, Tuple
 
 import ltlf2dfa
-from ltlf2dfa.base import AtomicFormula, BinaryOperator
 from ltlf2dfa.base import Formula as LTLf2DFAFormula
-from ltlf2dfa.base import UnaryOperator
-from ltlf2dfa.ltlf import LTLfFalse, LTLfFormula, LTLfTrue
-from ltlf2dfa.parser.ltlf import LTLfParser
-from ltlf2dfa.parser.pltlf import PLTLfParser
-from ltlf2dfa.pltlf import PLTLfFalse, PLTLfTrue
-from pylogics.syntax.base import Formula, Logic
+from ltlf2dfa.base import MonaProgram
+from pylogics.syntax.base import Formula
 from pythomata.core import DFA
-from pythomata.impl.symbolic import SymbolicDFA
 
+from logaut.automata import check_representation, from_mona_output
 from logaut.backends.base import Backend
-from logaut.backends.common.process_mona_output import (
-    parse_automaton,
-    parse_mona_output,
+from logaut.backends.common.find_atoms.base import find_atoms
+from logaut.backends.common.mona import (
+    acall_mona_to_mona_output,
+    call_mona_to_mona_output,
+    get_mona_version,
+    skip_initial_state,
 )
+from logaut.backends.common.process import NO_LIMITS, ResourceLimits
+from logaut.backends.common.process_mona_output import MONAOutput
 from logaut.backends.common.utils import _check_atoms_match_regex
-from logaut.backends.ltlf2dfa.to_ltlf2dfa_formula import to_string
+from logaut.backends.ltlf2dfa.to_ltlf2dfa_formula import to_ltlf2dfa_formula
 
 # this is stricter than the actual regex used by ltlf2dfa (no double quotes supported for now).
 _LTLf2DFA_SYMBOL_REGEX = "[a-z_][a-z0-9_]*"
@@ -60,9 +58,37 @@ _LTLf2DFA_SYMBOL_REGEX = "[a-z_][a-z0-9_]*"
 class LTLf2DFABackend(Backend):
     """The LTLf2DFA backend."""
 
+    direct_construction = True
+
     _LOWERBOUND_VERSION: Tuple[int, int, int] = (0, 1, 0)
     _UPPERBOUND_VERSION: Tuple[int, int, int] = (0, 2, 0)
 
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        max_states: Optional[int] = None,
+        representation: str = "symbolic",
+        minimize_guards: bool = False,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        :param timeout: the maximum time, in seconds, of each MONA run.
+        :param memory_limit: the maximum address space, in bytes, of each MONA run
+          (POSIX only).
+        :param max_states: the maximum number of states of the computed DFAs.
+        :param representation: the representation of the computed DFAs,
+          e.g. 'symbolic' (the default) or 'cube'; see logaut.automata.
+        :param minimize_guards: whether to minimize the guards of the transitions
+          computed by MONA.
+        """
+        check_representation(representation)
+        self._limits = ResourceLimits(timeout, memory_limit, max_states)
+        self._representation = representation
+        self._minimize_guards = minimize_guards
+        super().__init__()
+
     @classmethod
     def __check_mona(cls):
         """Check that the MONA CLI tool is available."""
@@ -86,112 +112,95 @@ class LTLf2DFABackend(Backend):
         self.__check_mona()
         self.__check_ltlf2dfa()
 
+    @classmethod
+    def check_atoms(cls, formula: Formula) -> None:
+        """Check that the atoms are valid LTLf2DFA identifiers."""
+        _check_atoms_match_regex(formula, _LTLf2DFA_SYMBOL_REGEX, "LTLf2DFA")
+
+    @property
+    def tool_version(self) -> str:
+        """Get the LTLf2DFA version, and the MONA version."""
+        return f"ltlf2dfa-{ltlf2dfa.__version__}-{get_mona_version()}"
+
     def ltl2dfa(self, formula: Formula) -> DFA:
         """From LTL to DFA."""
-        return _process_formula(formula)
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
 
     def pltl2dfa(self, formula: Formula) -> DFA:
         """From PLTL to DFA."""
-        return _process_formula(formula)
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
 
+    async def altl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
 
-def _process_formula(formula: Formula) -> SymbolicDFA:
+    async def apltl2dfa(self, formula: Formula) -> DFA:
+        """From PLTL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
+
+
+def _to_ltlf2dfa_formula(formula: Formula) -> LTLf2DFAFormula:
     """
-    Process a formula with Lydia.
+    Convert a formula into an LTLf2DFA formula.
 
     :param formula: the formula
-    :return: the DFA
+    :return: the LTLf2DFA formula
     """
     _check_atoms_match_regex(formula, _LTLf2DFA_SYMBOL_REGEX, "LTLf2DFA")
-
-    logic = formula.logic
-    formula_str = to_string(formula)
-    parser = LTLfParser() if logic == Logic.LTL else PLTLfParser()
-    ltlf2dfa_formula = parser(formula_str)
-    mona_output_string = ltlf2dfa_formula.to_dfa(mona_dfa_out=True)
-    mona_output = parse_mona_output(
-        postprocess_output(mona_output_string, ltlf2dfa_formula)
-    )
-    automaton = parse_automaton(mona_output)
-    return automaton
+    return to_ltlf2dfa_formula(formula)
 
 
-def postprocess_output(output: str, formula: LTLfFormula) -> str:
+def _process_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
     """
-    Post-process MONA output.
+    Process a formula with LTLf2DFA.
 
-    Capture the output related to the MONA DFA transitions.
-
-    :param output: the raw output from the LTLf2DFA tool.
     :param formula: the formula
-    :return: the output associated to the DFA.
+    :param limits: the resource limits of the MONA process.
+    :return: the MONA output of the DFA
     """
-    # hotfix: remove uppercased symbols
-    propositions = get_atomic_propositions(formula)
-    for proposition in propositions:
-        upper = proposition.upper()
-        output = re.sub(f"(?<= ){upper}(?= )", proposition, output)
-
-    regex = re.compile(
-        r".*(?=\nFormula is (valid|unsatisfiable)|A counter-example)",
-        flags=re.MULTILINE | re.DOTALL | re.IGNORECASE,
-    )
-    match = regex.search(output)
-    if match is None:
-        raise Exception(
-            f"cannot find automaton description in MONA output. MONA Output: '{output}'"
-        )
-    return cast(Match, regex.search(output)).group(0)
-
-
-@singledispatch
-def get_atomic_propositions(formula: LTLf2DFAFormula) -> Set[str]:
+    ltlf2dfa_formula = _to_ltlf2dfa_formula(formula)
+    # the MONA variables are the upper-cased atoms.
+    mapping = _variable_mapping(find_atoms(formula))
+    # run MONA ourselves: ltlf2dfa writes the program in a file shared by all callers.
+    program = MonaProgram(ltlf2dfa_formula).mona_program()
+    output = call_mona_to_mona_output(program, limits, mapping)
+    # the dummy initial state of the WS1S encoding is skipped.
+    return skip_initial_state(output)
+
+
+async def _aprocess_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
     """
-    Get the set of all atomic propositions in the PPLTL/LTLf formula.
+    Process a formula with LTLf2DFA, asynchronously.
 
-    :param formula: a PLTL/LTLfFormula instance.
-    :return: a set of all atomic propositions.
+    :param formula: the formula
+    :param limits: the resource limits of the MONA process.
+    :return: the MONA output of the DFA
     """
-    raise NotImplementedError("Unsupported formula type")
-
-
-@get_atomic_propositions.register
-def _(formula: AtomicFormula) -> Set[str]:
-    """Return its symbol if the formula is an atomic proposition."""
-    return {formula.s}  # Assuming 's' is the symbol of the atomic proposition
-
-
-@get_atomic_propositions.register
-def _(formula: LTLfTrue) -> Set[str]:
-    """Return empty if the formula is a boolean constant."""
-    return set()
-
-
-@get_atomic_propositions.register
-def _(formula: LTLfFalse) -> Set[str]:
-    """Return empty if the formula is a boolean constant."""
-    return set()
-
-
-@get_atomic_propositions.register
-def _(formula: PLTLfTrue) -> Set[str]:
-    """Return empty if the formula is a boolean constant."""
-    return set()
-
-
-@get_atomic_propositions.register
-def _(formula: PLTLfFalse) -> Set[str]:
-    """Return empty if the formula is a boolean constant."""
-    return set()
-
-
-@get_atomic_propositions.register
-def _(formula: UnaryOperator) -> Set[str]:
-    # If the formula is a unary operator, recursively call for its child
-    return get_atomic_propositions(formula.f)
+    ltlf2dfa_formula = _to_ltlf2dfa_formula(formula)
+    mapping = _variable_mapping(find_atoms(formula))
+    program = MonaProgram(ltlf2dfa_formula).mona_program()
+    output = await acall_mona_to_mona_output(program, limits, mapping)
+    return skip_initial_state(output)
 
 
-@get_atomic_propositions.register
-def _(formula: BinaryOperator) -> Set[str]:
-    # If the formula is a binary operator, recursively call for its children and union the results
-    return set().union(*(get_atomic_propositions(f) for f in formula.formulas))
+def _variable_mapping(atoms: Iterable[str]) -> Dict[str, str]:
+    """Get the mapping from the MONA variables, i.e. the upper-cased atoms, to the atoms."""
+    return {atom.upper(): atom for atom in atoms}
@@ -20,11 +20,42 @@
 # along with logaut.  If not, see <https://www.gnu.org/licenses/>.
 #
 
-"""Transform a formula to a LTLf2DFA grammar."""
+"""Transform a formula into an LTLf2DFA formula."""
 
 import functools
-from typing import Sequence
-
+from typing import Dict, NamedTuple, Sequence, Type
+
+from ltlf2dfa.base import Formula as LTLf2DFAFormula
+from ltlf2dfa.ltlf import (
+    LTLfAlways,
+    LTLfAnd,
+    LTLfAtomic,
+    LTLfEquivalence,
+    LTLfEventually,
+    LTLfFalse,
+    LTLfImplies,
+    LTLfNext,
+    LTLfNot,
+    LTLfOr,
+    LTLfRelease,
+    LTLfTrue,
+    LTLfUntil,
+    LTLfWeakNext,
+)
+from ltlf2dfa.pltlf import (
+    PLTLfAnd,
+    PLTLfAtomic,
+    PLTLfBefore,
+    PLTLfEquivalence,
+    PLTLfFalse,
+    PLTLfHistorically,
+    PLTLfImplies,
+    PLTLfNot,
+    PLTLfOnce,
+    PLTLfOr,
+    PLTLfSince,
+    PLTLfTrue,
+)
 from pylogics.syntax.base import (
     AbstractAtomic,
     And,
@@ -32,6 +63,7 @@ from pylogics.syntax.base import (
     FalseFormula,
     Formula,
     Implies,
+    Logic,
     Not,
     Or,
     TrueFormula,
@@ -46,124 +78,199 @@ from pylogics.syntax.ltl import (
     WeakNext,
     WeakUntil,
 )
-from pylogics.utils.to_string import to_string as pylogics_to_string
+from pylogics.syntax.pltl import Before, Historically, Once, Since
+
+
+class _Classes(NamedTuple):
+    """The LTLf2DFA classes of the propositional connectives of a logic."""
+
+    atomic: Type[LTLf2DFAFormula]
+    true: Type[LTLf2DFAFormula]
+    false: Type[LTLf2DFAFormula]
+    not_: Type[LTLf2DFAFormula]
+    and_: Type[LTLf2DFAFormula]
+    or_: Type[LTLf2DFAFormula]
+    implies: Type[LTLf2DFAFormula]
+    equivalence: Type[LTLf2DFAFormula]
+
+
+_CLASSES_BY_LOGIC: Dict[Logic, _Classes] = {
+    Logic.LTL: _Classes(
+        LTLfAtomic,
+        LTLfTrue,
+        LTLfFalse,
+        LTLfNot,
+        LTLfAnd,
+        LTLfOr,
+        LTLfImplies,
+        LTLfEquivalence,
+    ),
+    Logic.PLTL: _Classes(
+        PLTLfAtomic,
+        PLTLfTrue,
+        PLTLfFalse,
+        PLTLfNot,
+        PLTLfAnd,
+        PLTLfOr,
+        PLTLfImplies,
+        PLTLfEquivalence,
+    ),
+}
+
+
+def _classes(formula: Formula) -> _Classes:
+    """Get the LTLf2DFA classes of the logic of a formula."""
+    classes = _CLASSES_BY_LOGIC.get(formula.logic)
+    if classes is None:
+        raise ValueError(f"logic {formula.logic} is not supported by LTLf2DFA")
+    return classes
 
 
 @functools.singledispatch
-def to_string(formula: Formula) -> str:
-    """Transform a formula to a parsable string."""
-    return pylogics_to_string(formula)
+def to_ltlf2dfa_formula(formula: Formula) -> LTLf2DFAFormula:
+    """
+    Transform a formula into an LTLf2DFA formula, without parsing.
 
+    :param formula: an LTLf or a PLTLf formula.
+    :return: the equivalent LTLf2DFA formula.
+    """
+    raise ValueError(f"formula {formula} is not supported by LTLf2DFA")
 
-def _map_operands_to_string(operands: Sequence[Formula]):
-    """Map a list of operands to a list of strings (with brackets)."""
-    return map(lambda sub_formula: f"({to_string(sub_formula)})", operands)
 
+def _map_operands(operands: Sequence[Formula]) -> Sequence[LTLf2DFAFormula]:
+    """Map a list of operands to a list of LTLf2DFA formulas."""
+    return [to_ltlf2dfa_formula(operand) for operand in operands]
 
-@to_string.register(And)
-def to_string_and(formula: And) -> str:
-    """Transform an And into string."""
-    return " & ".join(_map_operands_to_string(formula.operands))
 
+@to_ltlf2dfa_formula.register(And)
+def to_ltlf2dfa_and(formula: And) -> LTLf2DFAFormula:
+    """Transform an And."""
+    return _classes(formula).and_(_map_operands(formula.operands))
 
-@to_string.register(Or)
-def to_string_or(formula: Or) -> str:
-    """Transform an Or into string."""
-    return " | ".join(_map_operands_to_string(formula.operands))
 
+@to_ltlf2dfa_formula.register(Or)
+def to_ltlf2dfa_or(formula: Or) -> LTLf2DFAFormula:
+    """Transform an Or."""
+    return _classes(formula).or_(_map_operands(formula.operands))
 
-@to_string.register(Not)
-def to_string_not(formula: Not) -> str:
-    """Transform a Not into string."""
-    return f"~({to_string(formula.argument)})"
 
+@to_ltlf2dfa_formula.register(Not)
+def to_ltlf2dfa_not(formula: Not) -> LTLf2DFAFormula:
+    """Transform a Not."""
+    return _classes(formula).not_(to_ltlf2dfa_formula(formula.argument))
 
-@to_string.register(Implies)
-def to_string_implies(formula: Implies) -> str:
-    """Transform an Implies into string."""
-    return " -> ".join(_map_operands_to_string(formula.operands))
 
+@to_ltlf2dfa_formula.register(Implies)
+def to_ltlf2dfa_implies(formula: Implies) -> LTLf2DFAFormula:
+    """Transform an Implies."""
+    return _classes(formula).implies(_map_operands(formula.operands))
 
-@to_string.register(Equivalence)
-def to_string_equivalence(formula: Equivalence) -> str:
-    """Transform an Equivalence into string."""
-    return " <-> ".join(_map_operands_to_string(formula.operands))
 
+@to_ltlf2dfa_formula.register(Equivalence)
+def to_ltlf2dfa_equivalence(formula: Equivalence) -> LTLf2DFAFormula:
+    """Transform an Equivalence."""
+    return _classes(formula).equivalence(_map_operands(formula.operands))
 
-@to_string.register(AbstractAtomic)
-def to_string_atomic(formula: AbstractAtomic) -> str:
-    """Transform an atomic formula into string."""
-    return formula.name
 
+@to_ltlf2dfa_formula.register(AbstractAtomic)
+def to_ltlf2dfa_atomic(formula: AbstractAtomic) -> LTLf2DFAFormula:
+    """Transform an atomic formula."""
+    return _classes(formula).atomic(formula.name)
 
-@to_string.register(TrueFormula)
-def to_string_true(_formula: TrueFormula) -> str:
-    """Transform the "true" formula into string."""
-    return "true"
 
+@to_ltlf2dfa_formula.register(TrueFormula)
+def to_ltlf2dfa_true(formula: TrueFormula) -> LTLf2DFAFormula:
+    """Transform the "true" formula."""
+    return _classes(formula).true()
 
-@to_string.register(FalseFormula)
-def to_string_false(_formula: FalseFormula) -> str:
-    """Transform the "false" formula into string."""
-    return "false"
 
+@to_ltlf2dfa_formula.register(FalseFormula)
+def to_ltlf2dfa_false(formula: FalseFormula) -> LTLf2DFAFormula:
+    """Transform the "false" formula."""
+    return _classes(formula).false()
 
-@to_string.register(Next)
-def to_string_next(formula: Next) -> str:
-    """Transform a next formula into string."""
-    return f"X({to_string(formula.argument)})"
 
+@to_ltlf2dfa_formula.register(Next)
+def to_ltlf2dfa_next(formula: Next) -> LTLf2DFAFormula:
+    """Transform a next formula."""
+    return LTLfNext(to_ltlf2dfa_formula(formula.argument))
 
-@to_string.register(WeakNext)
-def to_string_weak_next(formula: WeakNext) -> str:
-    """Transform a weak next formula into string."""
-    return f"WX({to_string(formula.argument)})"
 
+@to_ltlf2dfa_formula.register(WeakNext)
+def to_ltlf2dfa_weak_next(formula: WeakNext) -> LTLf2DFAFormula:
+    """Transform a weak next formula."""
+    return LTLfWeakNext(to_ltlf2dfa_formula(formula.argument))
 
-@to_string.register(Until)
-def to_string_until(formula: Until) -> str:
-    """Transform a until formula into string."""
-    return " U ".join(_map_operands_to_string(formula.operands))
 
+@to_ltlf2dfa_formula.register(Until)
+def to_ltlf2dfa_until(formula: Until) -> LTLf2DFAFormula:
+    """Transform an until formula."""
+    return LTLfUntil(_map_operands(formula.operands))
 
-@to_string.register(WeakUntil)
-def to_string_weak_until(formula: WeakUntil):
-    """Transform the 'weak until' formula."""
 
-    def _translate_weak_until(left: Formula, right: Formula):
-        return Or(Until(left, right), Always(right))
+@to_ltlf2dfa_formula.register(WeakUntil)
+def to_ltlf2dfa_weak_until(formula: WeakUntil) -> LTLf2DFAFormula:
+    """
+    Transform a weak until formula.
 
-    result = _translate_weak_until(formula.operands[-1], formula.operands[-2])
-    for sub_formula in reversed(formula.operands[:-2]):
-        result = _translate_weak_until(sub_formula, result)
-    return to_string(result)
+    Note that the weak until is not supported (yet) by LTLf2DFA.
+    We reduce it to '(a U b) | G(a)', associating to the right.
+    """
+    operands = _map_operands(formula.operands)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = LTLfOr([LTLfUntil([operand, result]), LTLfAlways(operand)])
+    return result
 
 
-@to_string.register(Release)
-def to_string_release(formula: Release) -> str:
-    """Transform a release formula into string."""
-    return " R ".join(_map_operands_to_string(formula.operands))
+@to_ltlf2dfa_formula.register(Release)
+def to_ltlf2dfa_release(formula: Release) -> LTLf2DFAFormula:
+    """Transform a release formula."""
+    return LTLfRelease(_map_operands(formula.operands))
 
 
-@to_string.register(StrongRelease)
-def to_string_strong_release(formula: StrongRelease) -> str:
+@to_ltlf2dfa_formula.register(StrongRelease)
+def to_ltlf2dfa_strong_release(formula: StrongRelease) -> LTLf2DFAFormula:
     """
-    Transform a strong release formula into string.
+    Transform a strong release formula.
 
     Note that the strong release is not supported (yet) by LTLf2DFA.
     We reduce it to weak until by duality.
     """
-    result = to_string(WeakUntil(*map(Not, formula.operands)))
-    return f"!({result})"
+    return LTLfNot(to_ltlf2dfa_formula(WeakUntil(*map(Not, formula.operands))))
+
+
+@to_ltlf2dfa_formula.register(Eventually)
+def to_ltlf2dfa_eventually(formula: Eventually) -> LTLf2DFAFormula:
+    """Transform an eventually formula."""
+    return LTLfEventually(to_ltlf2dfa_formula(formula.argument))
+
+
+@to_ltlf2dfa_formula.register(Always)
+def to_ltlf2dfa_always(formula: Always) -> LTLf2DFAFormula:
+    """Transform an always formula."""
+    return LTLfAlways(to_ltlf2dfa_formula(formula.argument))
+
+
+@to_ltlf2dfa_formula.register(Before)
+def to_ltlf2dfa_before(formula: Before) -> LTLf2DFAFormula:
+    """Transform a before formula."""
+    return PLTLfBefore(to_ltlf2dfa_formula(formula.argument))
+
+
+@to_ltlf2dfa_formula.register(Since)
+def to_ltlf2dfa_since(formula: Since) -> LTLf2DFAFormula:
+    """Transform a since formula."""
+    return PLTLfSince(_map_operands(formula.operands))
 
 
-@to_string.register(Eventually)
-def to_string_eventually(formula: Eventually) -> str:
-    """Transform a eventually formula into string."""
-    return f"F({to_string(formula.argument)})"
+@to_ltlf2dfa_formula.register(Once)
+def to_ltlf2dfa_once(formula: Once) -> LTLf2DFAFormula:
+    """Transform a once formula."""
+    return PLTLfOnce(to_ltlf2dfa_formula(formula.argument))
 
 
-@to_string.register(Always)
-def to_string_always(formula: Always) -> str:
-    """Transform a always formula into string."""
-    return f"G({to_string(formula.argument)})"
+@to_ltlf2dfa_formula.register(Historically)
+def to_ltlf2dfa_historically(formula: Historically) -> LTLf2DFAFormula:
+    """Transform a historically formula."""
+    return PLTLfHistorically(to_ltlf2dfa_formula(formula.argument))
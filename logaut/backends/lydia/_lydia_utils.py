@@ -21,50 +21,132 @@
 #
 
 """This module contains utilities to call the Lydia tool from Python."""
-import re
-import subprocess
 import sys
-from typing import Match, cast
+from functools import lru_cache
+from typing import List
 
-from pylogics.helpers.misc import enforce
+from logaut.backends.common.process import (
+    NO_LIMITS,
+    ResourceLimits,
+    arun_command,
+    run_command,
+)
+from logaut.backends.common.process_mona_output import MONAOutput, MONAOutputParser
+from logaut.exceptions import ResourceLimitException
 
-from logaut.exceptions import LogautException
 
+def _lydia_command(*args) -> List[str]:
+    """Get the command line to run the Lydia CLI tool."""
+    return ["lydia" if sys.platform != "win32" else "lydia.bat", *args]
 
-def call_lydia(*args, cwd: str = ".") -> str:
-    """Call the Lydia CLI tool with the arguments provided."""
-    command = ["lydia" if sys.platform != "win32" else "lydia.bat", *args]
-    output = ""
-    stderr = ""
-    try:
-        result = subprocess.run(
-            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd
-        )
-        output = result.stdout.decode()
-        stderr = result.stderr.decode()
-        enforce(result.returncode == 0, exception_cls=LogautException)
-        return output
-    except LogautException:
-        raise Exception(  # type: ignore
+
+def _check_lydia_result(
+    command: List[str], returncode: int, output: str, stderr: str
+) -> str:
+    """Check that Lydia succeeded, and return its output."""
+    if returncode != 0:
+        raise Exception(
             f"the Lydia command {' '.join(command)} failed.\nstdout={output}\nstderr={stderr}"
         )
+    return output
+
+
+def call_lydia(*args, cwd: str = ".", limits: ResourceLimits = NO_LIMITS) -> str:
+    """
+    Call the Lydia CLI tool with the arguments provided.
+
+    :param args: the arguments of the Lydia CLI tool.
+    :param cwd: the working directory.
+    :param limits: the resource limits of the Lydia process.
+    :return: the output of Lydia.
+    """
+    command = _lydia_command(*args)
+    try:
+        result = run_command(command, cwd=cwd, limits=limits)
+    except ResourceLimitException:
+        raise
     except Exception as e:
         raise Exception(f"an error occurred while running lydia: {str(e)}") from e
+    return _check_lydia_result(command, *result)
 
 
-def postprocess_lydia_output(output: str) -> str:
+async def acall_lydia(*args, cwd: str = ".", limits: ResourceLimits = NO_LIMITS) -> str:
     """
-    Post-process Lydia output.
+    Call the Lydia CLI tool with the arguments provided, asynchronously.
 
-    Capture the output related to the MONA DFA transitions.
+    If the calling task is cancelled, the Lydia process is killed.
 
-    :param: the raw output of the Lydia CLI tool.
-    :return: the output associated to the DFA.
+    :param args: the arguments of the Lydia CLI tool.
+    :param cwd: the working directory.
+    :param limits: the resource limits of the Lydia process.
+    :return: the output of Lydia.
     """
-    regex = re.compile(
-        r"(?<=Computed automaton:\n).*(?=\n\[2)", flags=re.MULTILINE | re.DOTALL
-    )
-    match = regex.search(output)
-    if match is None:
-        raise Exception("cannot find automaton description in Lydia output.")
-    return cast(Match, regex.search(output)).group(0)
+    command = _lydia_command(*args)
+    try:
+        result = await arun_command(command, cwd=cwd, limits=limits)
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running lydia: {str(e)}") from e
+    return _check_lydia_result(command, *result)
+
+
+def call_lydia_to_mona_output(
+    *args, cwd: str = ".", limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Call the Lydia CLI tool, and parse the DFA as its output is produced.
+
+    :param args: the arguments of the Lydia CLI tool.
+    :param cwd: the working directory.
+    :param limits: the resource limits of the Lydia process.
+    :return: the MONA output of the computed DFA.
+    """
+    command = _lydia_command(*args)
+    parser = MONAOutputParser()
+    try:
+        result = run_command(command, cwd=cwd, limits=limits, sink=parser.feed)
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running lydia: {str(e)}") from e
+    _check_lydia_result(command, *result)
+    return parser.close()
+
+
+async def acall_lydia_to_mona_output(
+    *args, cwd: str = ".", limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Call the Lydia CLI tool asynchronously, and parse the DFA as its output is produced.
+
+    :param args: the arguments of the Lydia CLI tool.
+    :param cwd: the working directory.
+    :param limits: the resource limits of the Lydia process.
+    :return: the MONA output of the computed DFA.
+    """
+    command = _lydia_command(*args)
+    parser = MONAOutputParser()
+    try:
+        result = await arun_command(command, cwd=cwd, limits=limits, sink=parser.feed)
+    except ResourceLimitException:
+        raise
+    except Exception as e:
+        raise Exception(f"an error occurred while running lydia: {str(e)}") from e
+    _check_lydia_result(command, *result)
+    return parser.close()
+
+
+@lru_cache(maxsize=None)
+def get_lydia_version() -> str:
+    """
+    Get the version of the Lydia CLI tool.
+
+    The result is computed once per process.
+
+    :return: the version string printed by Lydia, or 'unknown' if it cannot be determined.
+    """
+    try:
+        return call_lydia("--version").strip() or "unknown"
+    except Exception:  # pylint: disable=broad-except
+        return "unknown"
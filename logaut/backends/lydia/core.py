@@ -22,20 +22,26 @@
 
 """Implementation of the Lydia backend."""
 import shutil
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from pylogics.syntax.base import Formula
+from pylogics.syntax.base import Formula, Logic
 from pythomata.core import DFA
-from pythomata.impl.symbolic import SymbolicDFA
 
+from logaut.automata import check_representation, from_mona_output
 from logaut.backends.base import Backend
-from logaut.backends.common.process_mona_output import (
-    parse_automaton,
-    parse_mona_output,
-)
+from logaut.backends.common.process import NO_LIMITS, ResourceLimits
+from logaut.backends.common.process_mona_output import MONAOutput
 from logaut.backends.common.utils import _check_atoms_match_regex
-from logaut.backends.lydia._lydia_utils import call_lydia, postprocess_lydia_output
+from logaut.backends.lydia._lydia_utils import (
+    acall_lydia_to_mona_output,
+    call_lydia_to_mona_output,
+    get_lydia_version,
+)
 from logaut.backends.lydia.to_lydia_grammar import to_string
+from logaut.cache import copy_automaton
+from logaut.exceptions import BadLogicFormulaException
 from logaut.helpers import temporary_directory
 
 # this is stricter than the actual regex used by lydia.
@@ -45,9 +51,37 @@ _LYDIA_SYMBOL_REGEX = "[a-z_][a-z0-9_]*"
 class LydiaBackend(Backend):
     """The Lydia backend."""
 
+    direct_construction = True
+
     _LOWERBOUND_VERSION: Tuple[int, int, int] = (0, 1, 0)
     _UPPERBOUND_VERSION: Tuple[int, int, int] = (0, 2, 0)
 
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        max_states: Optional[int] = None,
+        representation: str = "symbolic",
+        minimize_guards: bool = False,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        :param timeout: the maximum time, in seconds, of each Lydia run.
+        :param memory_limit: the maximum address space, in bytes, of each Lydia run
+          (POSIX only).
+        :param max_states: the maximum number of states of the computed DFAs.
+        :param representation: the representation of the computed DFAs,
+          e.g. 'symbolic' (the default) or 'cube'; see logaut.automata.
+        :param minimize_guards: whether to minimize the guards of the transitions
+          computed by MONA.
+        """
+        check_representation(representation)
+        self._limits = ResourceLimits(timeout, memory_limit, max_states)
+        self._representation = representation
+        self._minimize_guards = minimize_guards
+        super().__init__()
+
     @classmethod
     def __check_lydia(cls):
         """Check that the Lydia CLI tool is available."""
@@ -64,38 +98,193 @@ class LydiaBackend(Backend):
         """Do post-initialization checks."""
         self.__check_lydia()
 
+    @classmethod
+    def check_atoms(cls, formula: Formula) -> None:
+        """Check that the atoms are valid Lydia identifiers."""
+        _check_atoms_match_regex(formula, _LYDIA_SYMBOL_REGEX, "Lydia")
+
+    @property
+    def tool_version(self) -> str:
+        """Get the Lydia version."""
+        return f"lydia-{get_lydia_version()}"
+
     def ldl2dfa(self, formula: Formula) -> DFA:
         """From LDL to DFA."""
-        return _process_formula(formula)
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
 
     def ltl2dfa(self, formula: Formula) -> DFA:
         """From LTL to DFA."""
-        return _process_formula(formula)
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
 
+    async def aldl2dfa(self, formula: Formula) -> DFA:
+        """From LDL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
+
+    async def altl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
 
-def _process_formula(formula: Formula) -> SymbolicDFA:
+    def ldl2dfa_many(
+        self, formulas: Sequence[Formula], max_workers: Optional[int] = None
+    ) -> List[DFA]:
+        """
+        From many LDL formulas to DFAs.
+
+        :param formulas: the formulas to translate.
+        :param max_workers: the maximum number of concurrent Lydia processes.
+        :return: the DFAs, in the same order of the formulas.
+        """
+        return _process_formulas(
+            formulas,
+            Logic.LDL,
+            self.ldl2dfa_many.__name__,
+            max_workers,
+            self._limits,
+            self._representation,
+            self._minimize_guards,
+        )
+
+    def ltl2dfa_many(
+        self, formulas: Sequence[Formula], max_workers: Optional[int] = None
+    ) -> List[DFA]:
+        """
+        From many LTL formulas to DFAs.
+
+        :param formulas: the formulas to translate.
+        :param max_workers: the maximum number of concurrent Lydia processes.
+        :return: the DFAs, in the same order of the formulas.
+        """
+        return _process_formulas(
+            formulas,
+            Logic.LTL,
+            self.ltl2dfa_many.__name__,
+            max_workers,
+            self._limits,
+            self._representation,
+            self._minimize_guards,
+        )
+
+
+def _write_formula(formula: Formula, tmpdir: Path) -> List[str]:
     """
-    Process a formula with Lydia.
+    Write a formula in a scratch directory, and get the Lydia arguments to process it.
 
     :param formula: the formula
-    :return: the DFA
+    :param tmpdir: the scratch directory, i.e. the working directory of Lydia.
+    :return: the arguments of the Lydia CLI tool.
     """
     _check_atoms_match_regex(formula, _LYDIA_SYMBOL_REGEX, "Lydia")
-    formula_str = to_string(formula)
+    tmpfilename = "formula.txt"
+    (tmpdir / tmpfilename).resolve().write_text(to_string(formula))
+    return [f"--logic={formula.logic.value}f", f"--file={tmpfilename}", "-p"]
+
+
+def _process_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Process a formula with Lydia.
 
+    :param formula: the formula
+    :param limits: the resource limits of the Lydia process.
+    :return: the MONA output of the DFA
+    """
     with temporary_directory() as tmpdir:
-        tmpfilename = "formula.txt"
-        tmpfile = tmpdir / tmpfilename
-        tmpfile = tmpfile.resolve()
-        tmpfile.write_text(formula_str)
-
-        output = call_lydia(
-            f"--logic={formula.logic.value}f",
-            f"--file={tmpfilename}",
-            "-p",
-            cwd=str(tmpdir),
-        )
-    mona_output_string = postprocess_lydia_output(output)
-    mona_output = parse_mona_output(mona_output_string)
-    automaton = parse_automaton(mona_output)
-    return automaton
+        args = _write_formula(formula, tmpdir)
+        return call_lydia_to_mona_output(*args, cwd=str(tmpdir), limits=limits)
+
+
+async def _aprocess_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Process a formula with Lydia, asynchronously.
+
+    :param formula: the formula
+    :param limits: the resource limits of the Lydia process.
+    :return: the MONA output of the DFA
+    """
+    with temporary_directory() as tmpdir:
+        args = _write_formula(formula, tmpdir)
+        return await acall_lydia_to_mona_output(*args, cwd=str(tmpdir), limits=limits)
+
+
+def _process_formulas(
+    formulas: Sequence[Formula],
+    logic: Logic,
+    method_name: str,
+    max_workers: Optional[int] = None,
+    limits: ResourceLimits = NO_LIMITS,
+    representation: str = "symbolic",
+    minimize_guards: bool = False,
+) -> List[DFA]:
+    """
+    Process many formulas with Lydia.
+
+    Thanks to hash-consing, duplicated formulas are processed only once.
+    All the formulas are written in the same scratch directory, and the Lydia
+    processes are run concurrently, so to overlap their start-up times.
+
+    :param formulas: the formulas, all of the same logic.
+    :param logic: the expected logic of the formulas.
+    :param method_name: the name of the calling method, for error reporting.
+    :param max_workers: the maximum number of concurrent Lydia processes.
+    :param limits: the resource limits of each Lydia process.
+    :param representation: the representation of the DFAs.
+    :param minimize_guards: whether to minimize the guards of the transitions.
+    :return: the DFAs, in the same order of the formulas.
+    """
+    unique_formulas = list(dict.fromkeys(formulas))
+    for formula in unique_formulas:
+        if formula.logic != logic:
+            raise BadLogicFormulaException(
+                method_name, logic.value, formula.logic.value
+            )
+        _check_atoms_match_regex(formula, _LYDIA_SYMBOL_REGEX, "Lydia")
+
+    with temporary_directory() as tmpdir:
+        filenames = []
+        for index, formula in enumerate(unique_formulas):
+            filename = f"formula_{index}.txt"
+            (tmpdir / filename).write_text(to_string(formula))
+            filenames.append(filename)
+
+        def _call(filename: str) -> MONAOutput:
+            return call_lydia_to_mona_output(
+                f"--logic={logic.value}f",
+                f"--file={filename}",
+                "-p",
+                cwd=str(tmpdir),
+                limits=limits,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(_call, filenames))
+
+    automata: Dict[Formula, DFA] = {
+        formula: from_mona_output(output, representation, minimize_guards)
+        for formula, output in zip(unique_formulas, outputs)
+    }
+
+    result: List[DFA] = []
+    returned = set()
+    for formula in formulas:
+        automaton = automata[formula]
+        # each occurrence of a duplicated formula gets its own automaton.
+        result.append(copy_automaton(automaton) if formula in returned else automaton)
+        returned.add(formula)
+    return result
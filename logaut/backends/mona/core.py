@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Implementation of the MONA backend.
+
+The formulas are encoded into MONA programs by logaut itself,
+see logaut.backends.mona.to_mona, and compiled by the MONA CLI tool:
+
+    https://www.brics.dk/mona/
+
+"""
+import shutil
+from typing import Dict, Optional
+
+from pylogics.syntax.base import Formula
+from pythomata.core import DFA
+
+from logaut.automata import check_representation, from_mona_output
+from logaut.backends.base import Backend
+from logaut.backends.common.find_atoms.base import find_atoms
+from logaut.backends.common.mona import (
+    acall_mona_to_mona_output,
+    call_mona_to_mona_output,
+    get_mona_version,
+    skip_initial_state,
+)
+from logaut.backends.common.process import NO_LIMITS, ResourceLimits
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.backends.common.utils import _check_atoms_match_regex
+from logaut.backends.mona.to_mona import to_mona_program
+
+# the atoms are upper-cased, and MONA identifiers start with a letter.
+_MONA_SYMBOL_REGEX = "[a-z][a-z0-9_]*"
+
+
+class MonaBackend(Backend):
+    """The MONA backend."""
+
+    direct_construction = True
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        max_states: Optional[int] = None,
+        representation: str = "symbolic",
+        minimize_guards: bool = False,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        :param timeout: the maximum time, in seconds, of each MONA run.
+        :param memory_limit: the maximum address space, in bytes, of each MONA run
+          (POSIX only).
+        :param max_states: the maximum number of states of the computed DFAs.
+        :param representation: the representation of the computed DFAs,
+          e.g. 'symbolic' (the default) or 'cube'; see logaut.automata.
+        :param minimize_guards: whether to minimize the guards of the transitions
+          computed by MONA.
+        """
+        check_representation(representation)
+        self._limits = ResourceLimits(timeout, memory_limit, max_states)
+        self._representation = representation
+        self._minimize_guards = minimize_guards
+        super().__init__()
+
+    def init_checks(self) -> None:
+        """Check that the MONA CLI tool is available."""
+        if shutil.which("mona") is None:
+            raise Exception(
+                "MONA binary is not installed. Please follow "
+                "the installation instructions at https://github.com/whitemech/MONA.\n"
+                "If instead it is installed, please check that it is in the system PATH."
+            )
+
+    @classmethod
+    def check_atoms(cls, formula: Formula) -> None:
+        """Check that the atoms are valid MONA identifiers."""
+        _check_atoms_match_regex(formula, _MONA_SYMBOL_REGEX, "MONA")
+
+    @property
+    def tool_version(self) -> str:
+        """Get the version of the encoding, i.e. of logaut, and of MONA."""
+        from logaut import __version__  # pylint: disable=import-outside-toplevel
+
+        return f"mona-{__version__}-{get_mona_version()}"
+
+    def ltl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA."""
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
+
+    def pltl2dfa(self, formula: Formula) -> DFA:
+        """From PLTL to DFA."""
+        return from_mona_output(
+            _process_formula(formula, self._limits),
+            self._representation,
+            self._minimize_guards,
+        )
+
+    async def altl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
+
+    async def apltl2dfa(self, formula: Formula) -> DFA:
+        """From PLTL to DFA, asynchronously."""
+        mona_output = await _aprocess_formula(formula, self._limits)
+        return from_mona_output(
+            mona_output, self._representation, self._minimize_guards
+        )
+
+
+def _variable_mapping(formula: Formula) -> Dict[str, str]:
+    """Get the mapping from the MONA variables, i.e. the upper-cased atoms, to the atoms."""
+    _check_atoms_match_regex(formula, _MONA_SYMBOL_REGEX, "MONA")
+    return {atom.upper(): atom for atom in find_atoms(formula)}
+
+
+def _process_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Process a formula with MONA.
+
+    :param formula: the formula
+    :param limits: the resource limits of the MONA process.
+    :return: the MONA output of the DFA
+    """
+    mapping = _variable_mapping(formula)
+    output = call_mona_to_mona_output(to_mona_program(formula), limits, mapping)
+    return skip_initial_state(output)
+
+
+async def _aprocess_formula(
+    formula: Formula, limits: ResourceLimits = NO_LIMITS
+) -> MONAOutput:
+    """
+    Process a formula with MONA, asynchronously.
+
+    :param formula: the formula
+    :param limits: the resource limits of the MONA process.
+    :return: the MONA output of the DFA
+    """
+    mapping = _variable_mapping(formula)
+    program = to_mona_program(formula)
+    output = await acall_mona_to_mona_output(program, limits, mapping)
+    return skip_initial_state(output)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Encode LTLf and PLTLf formulas into MONA programs.
+
+A trace of length n is encoded as in LTLf2DFA: the second-order variable '$'
+is the set of its instants, {0, ..., n - 1}, and each atom is the set of
+the instants where it is true. The variable of an atom is its upper-cased name,
+so it cannot clash with the MONA keywords and the position variables.
+
+LTLf formulas are evaluated at the instant 0: on the empty trace,
+the atoms and 'true' are false. PLTLf formulas are evaluated at the last
+instant: the empty trace is rejected.
+"""
+import functools
+from typing import Sequence, Tuple
+
+from pylogics.syntax.base import (
+    AbstractAtomic,
+    And,
+    Equivalence,
+    FalseFormula,
+    Formula,
+    Implies,
+    Logic,
+    Not,
+    Or,
+    TrueFormula,
+)
+from pylogics.syntax.ltl import Always, Eventually, Next
+from pylogics.syntax.ltl import PropositionalTrue as LTLPropositionalTrue
+from pylogics.syntax.ltl import Release, StrongRelease, Until, WeakNext, WeakUntil
+from pylogics.syntax.pltl import Before, Historically, Once
+from pylogics.syntax.pltl import PropositionalTrue as PLTLPropositionalTrue
+from pylogics.syntax.pltl import Since
+
+from logaut.backends.common.find_atoms.base import find_atoms
+
+# '$' is the set of the instants of the trace, i.e. it is downward closed.
+_HEADER = "var2 $ where ~ex1 p where true: p notin $ & p+1 in $;\nallpos $;"
+
+
+class _Positions:
+    """A generator of fresh names of position variables."""
+
+    def __init__(self) -> None:
+        """Initialize the generator."""
+        self._nb_positions = 0
+
+    def fresh(self) -> str:
+        """Get a fresh name."""
+        self._nb_positions += 1
+        return f"p{self._nb_positions}"
+
+
+def to_mona_program(formula: Formula) -> str:
+    """
+    Encode an LTLf or a PLTLf formula into a MONA program.
+
+    :param formula: the formula.
+    :return: the MONA program.
+    """
+    positions = _Positions()
+    if formula.logic == Logic.LTL:
+        body = to_mona(formula, "0", positions)
+    elif formula.logic == Logic.PLTL:
+        last = positions.fresh()
+        encoding = to_mona(formula, last, positions)
+        body = f"(ex1 {last}: {last} in $ & {last} = max($) & {encoding})"
+    else:
+        raise ValueError(f"logic {formula.logic} is not supported by MONA")
+    lines = [_HEADER]
+    atoms = sorted(find_atoms(formula))
+    if atoms:
+        lines.append(f"var2 {', '.join(atom.upper() for atom in atoms)};")
+    lines.append(f"{body};")
+    return "\n".join(lines) + "\n"
+
+
+@functools.singledispatch
+def to_mona(formula: Formula, position: str, positions: _Positions) -> str:
+    """
+    Encode a formula, evaluated at a position, into a MONA formula.
+
+    :param formula: the formula.
+    :param position: the position, i.e. a position variable or 0.
+    :param positions: the generator of fresh position variables.
+    :return: the MONA formula.
+    """
+    raise ValueError(f"formula {formula} is not supported by MONA")
+
+
+def _split(formula: Formula) -> Tuple[Formula, Formula]:
+    """Split a binary temporal operator, associating to the right."""
+    first, *rest = formula.operands
+    return first, rest[0] if len(rest) == 1 else type(formula)(*rest)
+
+
+def _map_operands(
+    operands: Sequence[Formula], position: str, positions: _Positions
+) -> Sequence[str]:
+    """Encode a list of operands, evaluated at the same position."""
+    return [to_mona(operand, position, positions) for operand in operands]
+
+
+@to_mona.register(AbstractAtomic)
+def _(formula: AbstractAtomic, position: str, _positions: _Positions) -> str:
+    """Encode an atomic formula."""
+    return f"({position} in $ & {position} in {formula.name.upper()})"
+
+
+@to_mona.register(TrueFormula)
+def _(_formula: TrueFormula, _position: str, _positions: _Positions) -> str:
+    """Encode 'tt'."""
+    return "true"
+
+
+@to_mona.register(LTLPropositionalTrue)
+@to_mona.register(PLTLPropositionalTrue)
+def _(_formula: TrueFormula, position: str, _positions: _Positions) -> str:
+    """Encode 'true', that needs an instant."""
+    return f"({position} in $)"
+
+
+@to_mona.register(FalseFormula)
+def _(_formula: FalseFormula, _position: str, _positions: _Positions) -> str:
+    """Encode 'ff', or 'false'."""
+    return "false"
+
+
+@to_mona.register(Not)
+def _(formula: Not, position: str, positions: _Positions) -> str:
+    """Encode a negation."""
+    return f"~{to_mona(formula.argument, position, positions)}"
+
+
+@to_mona.register(And)
+def _(formula: And, position: str, positions: _Positions) -> str:
+    """Encode a conjunction."""
+    return f"({' & '.join(_map_operands(formula.operands, position, positions))})"
+
+
+@to_mona.register(Or)
+def _(formula: Or, position: str, positions: _Positions) -> str:
+    """Encode a disjunction."""
+    return f"({' | '.join(_map_operands(formula.operands, position, positions))})"
+
+
+@to_mona.register(Implies)
+def _(formula: Implies, position: str, positions: _Positions) -> str:
+    """Encode an implication, associating to the right."""
+    operands = _map_operands(formula.operands, position, positions)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = f"({operand} => {result})"
+    return result
+
+
+@to_mona.register(Equivalence)
+def _(formula: Equivalence, position: str, positions: _Positions) -> str:
+    """Encode an equivalence, i.e. all the operands have the same value."""
+    operands = _map_operands(formula.operands, position, positions)
+    all_true = " & ".join(operands)
+    all_false = " & ".join(f"~{operand}" for operand in operands)
+    return f"(({all_true}) | ({all_false}))"
+
+
+@to_mona.register(Next)
+def _(formula: Next, position: str, positions: _Positions) -> str:
+    """Encode 'X[!] f': the next instant exists and satisfies f."""
+    next_ = positions.fresh()
+    argument = to_mona(formula.argument, next_, positions)
+    return f"(ex1 {next_}: {next_} in $ & {next_} = {position} + 1 & {argument})"
+
+
+@to_mona.register(WeakNext)
+def _(formula: WeakNext, position: str, positions: _Positions) -> str:
+    """Encode 'X f': if the next instant exists, it satisfies f."""
+    next_ = positions.fresh()
+    argument = to_mona(formula.argument, next_, positions)
+    return f"(all1 {next_}: ({next_} in $ & {next_} = {position} + 1) => {argument})"
+
+
+@to_mona.register(Eventually)
+def _(formula: Eventually, position: str, positions: _Positions) -> str:
+    """Encode 'F f'."""
+    later = positions.fresh()
+    argument = to_mona(formula.argument, later, positions)
+    return f"(ex1 {later}: {later} in $ & {position} <= {later} & {argument})"
+
+
+@to_mona.register(Always)
+def _(formula: Always, position: str, positions: _Positions) -> str:
+    """Encode 'G f'."""
+    later = positions.fresh()
+    argument = to_mona(formula.argument, later, positions)
+    return f"(all1 {later}: ({later} in $ & {position} <= {later}) => {argument})"
+
+
+def _until(left: Formula, right: Formula, position: str, positions: _Positions) -> str:
+    """Encode 'left U right'."""
+    later, between = positions.fresh(), positions.fresh()
+    right_encoding = to_mona(right, later, positions)
+    left_encoding = to_mona(left, between, positions)
+    return (
+        f"(ex1 {later}: {later} in $ & {position} <= {later} & {right_encoding} & "
+        f"(all1 {between}: ({position} <= {between} & {between} < {later}) "
+        f"=> {left_encoding}))"
+    )
+
+
+def _release(
+    left: Formula, right: Formula, position: str, positions: _Positions
+) -> str:
+    """Encode 'left R right', i.e. '!(!left U !right)'."""
+    later, between = positions.fresh(), positions.fresh()
+    right_encoding = to_mona(right, later, positions)
+    left_encoding = to_mona(left, between, positions)
+    return (
+        f"(all1 {later}: ({later} in $ & {position} <= {later}) => "
+        f"({right_encoding} | (ex1 {between}: {position} <= {between} & "
+        f"{between} < {later} & {left_encoding})))"
+    )
+
+
+@to_mona.register(Until)
+def _(formula: Until, position: str, positions: _Positions) -> str:
+    """Encode an until."""
+    return _until(*_split(formula), position, positions)
+
+
+@to_mona.register(Release)
+def _(formula: Release, position: str, positions: _Positions) -> str:
+    """Encode a release."""
+    return _release(*_split(formula), position, positions)
+
+
+@to_mona.register(WeakUntil)
+def _(formula: WeakUntil, position: str, positions: _Positions) -> str:
+    """Encode 'f W g' as '(f U g) | G f'."""
+    left, right = _split(formula)
+    until = _until(left, right, position, positions)
+    return f"({until} | {to_mona(Always(left), position, positions)})"
+
+
+@to_mona.register(StrongRelease)
+def _(formula: StrongRelease, position: str, positions: _Positions) -> str:
+    """Encode 'f M g' as 'g U (f & g)'."""
+    left, right = _split(formula)
+    return _until(right, And(left, right), position, positions)
+
+
+@to_mona.register(Before)
+def _(formula: Before, position: str, positions: _Positions) -> str:
+    """Encode 'Y f': the previous instant exists and satisfies f."""
+    previous = positions.fresh()
+    argument = to_mona(formula.argument, previous, positions)
+    return (
+        f"(ex1 {previous}: {previous} in $ & {position} = {previous} + 1 "
+        f"& {argument})"
+    )
+
+
+@to_mona.register(Once)
+def _(formula: Once, position: str, positions: _Positions) -> str:
+    """Encode 'O f'."""
+    earlier = positions.fresh()
+    argument = to_mona(formula.argument, earlier, positions)
+    return f"(ex1 {earlier}: {earlier} in $ & {earlier} <= {position} & {argument})"
+
+
+@to_mona.register(Historically)
+def _(formula: Historically, position: str, positions: _Positions) -> str:
+    """Encode 'H f'."""
+    earlier = positions.fresh()
+    argument = to_mona(formula.argument, earlier, positions)
+    return (
+        f"(all1 {earlier}: ({earlier} in $ & {earlier} <= {position}) "
+        f"=> {argument})"
+    )
+
+
+@to_mona.register(Since)
+def _(formula: Since, position: str, positions: _Positions) -> str:
+    """Encode 'f S g', associating to the right."""
+    left, right = _split(formula)
+    earlier, between = positions.fresh(), positions.fresh()
+    right_encoding = to_mona(right, earlier, positions)
+    left_encoding = to_mona(left, between, positions)
+    return (
+        f"(ex1 {earlier}: {earlier} in $ & {earlier} <= {position} & "
+        f"{right_encoding} & (all1 {between}: ({earlier} < {between} & "
+        f"{between} <= {position}) => {left_encoding}))"
+    )
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Implementation of the native backend.
+
+It translates LTLf, LDLf and pure-past PLTLf formulas into DFAs
+in pure Python, without external tools; see logaut.backends.native.ldlf
+and logaut.backends.native.pltl.
+"""
+from typing import Optional
+
+from pylogics.syntax.base import Formula
+from pythomata.core import DFA
+
+from logaut.automata import check_representation, from_mona_output
+from logaut.automata.bdd import BDDManager
+from logaut.backends.base import Backend
+from logaut.backends.common.find_atoms.base import find_atoms
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.backends.native.ldlf import LDLfTerms, LDLfToDFA
+from logaut.backends.native.pltl import PLTLfToDFA
+from logaut.backends.native.to_ldlf import to_ldlf
+
+
+class NativeBackend(Backend):
+    """The native backend."""
+
+    direct_construction = True
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_states: Optional[int] = None,
+        representation: str = "symbolic",
+        minimize_guards: bool = False,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        :param timeout: the maximum time, in seconds, of each translation.
+        :param max_states: the maximum number of states of the computed DFAs.
+        :param representation: the representation of the computed DFAs,
+          e.g. 'symbolic' (the default) or 'cube'; see logaut.automata.
+        :param minimize_guards: whether to minimize the guards of the transitions.
+        """
+        check_representation(representation)
+        for name, value in (("timeout", timeout), ("max_states", max_states)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+        self._timeout = timeout
+        self._max_states = max_states
+        self._representation = representation
+        self._minimize_guards = minimize_guards
+        super().__init__()
+
+    @property
+    def tool_version(self) -> str:
+        """Get the version of the translation, i.e. of logaut."""
+        from logaut import __version__  # pylint: disable=import-outside-toplevel
+
+        return f"native-{__version__}"
+
+    def ltl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA."""
+        return self._to_dfa(formula)
+
+    def ldl2dfa(self, formula: Formula) -> DFA:
+        """From LDL to DFA."""
+        return self._to_dfa(formula)
+
+    def pltl2dfa(self, formula: Formula) -> DFA:
+        """From PLTL to DFA."""
+        output = _process_pltl_formula(formula, self._max_states, self._timeout)
+        return from_mona_output(output, self._representation, self._minimize_guards)
+
+    def _to_dfa(self, formula: Formula) -> DFA:
+        """Translate an LTLf or LDLf formula."""
+        output = _process_formula(formula, self._max_states, self._timeout)
+        return from_mona_output(output, self._representation, self._minimize_guards)
+
+
+def _process_formula(
+    formula: Formula,
+    max_states: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> MONAOutput:
+    """
+    Translate an LTLf or LDLf formula into the MONA output of its DFA.
+
+    :param formula: the formula.
+    :param max_states: the maximum number of states of the DFA.
+    :param timeout: the maximum time of the translation, in seconds.
+    :return: the MONA output of the DFA, whose variables are the sorted atoms.
+    """
+    # a manager per translation, so that its nodes are freed afterwards.
+    manager = BDDManager()
+    manager.declare(*sorted(find_atoms(formula)))
+    terms = LDLfTerms(manager)
+    term = to_ldlf(formula, terms)
+    return LDLfToDFA(terms).to_mona_output(term, manager.variables, max_states, timeout)
+
+
+def _process_pltl_formula(
+    formula: Formula,
+    max_states: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> MONAOutput:
+    """
+    Translate a pure-past PLTLf formula into the MONA output of its DFA.
+
+    :param formula: the formula.
+    :param max_states: the maximum number of states of the DFA.
+    :param timeout: the maximum time of the translation, in seconds.
+    :return: the MONA output of the DFA, whose variables are the sorted atoms.
+    """
+    manager = BDDManager()
+    manager.declare(*sorted(find_atoms(formula)))
+    return PLTLfToDFA(manager).to_mona_output(formula, max_states, timeout)
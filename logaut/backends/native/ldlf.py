@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+From LDLf formulas to DFAs, by derivatives.
+
+LDLf formulas in negation normal form, and regular expressions, are
+hash-consed into integer terms. The transition function 'delta' of the
+alternating automaton of a formula (De Giacomo and Vardi, 2013) is computed
+symbolically: for each term, it is a partition of the alphabet into BDD
+guards, each with the positive Boolean formula, in DNF, over the terms to
+satisfy from the next instant. The DFA is built on the fly by the subset
+construction, whose states are the DNFs reachable from the formula.
+"""
+import time
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from logaut.automata import cubes_to_mona_output
+from logaut.automata.bdd import BDD, BDDManager
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.exceptions import StateLimitException, TimeLimitException
+
+# kinds of formulas
+_TT = "tt"
+_FF = "ff"
+_AND = "and"
+_OR = "or"
+_DIAMOND = "diamond"
+_BOX = "box"
+# the markers F and T of the unrolled Kleene stars
+_MARK_F = "mark_f"
+_MARK_T = "mark_t"
+# kinds of regular expressions
+_PROP = "prop"
+_TEST = "test"
+_SEQ = "seq"
+_UNION = "union"
+_STAR = "star"
+
+"""A DNF over the terms: a set of clauses, i.e. of conjunctions of terms."""
+DNF = FrozenSet[FrozenSet[int]]
+_DNF_TRUE: DNF = frozenset([frozenset()])
+_DNF_FALSE: DNF = frozenset()
+
+"""A partition of the alphabet, with the DNF to satisfy next for each block."""
+Partition = Tuple[Tuple[BDD, DNF], ...]
+
+
+class LDLfTerms:
+    """
+    A store of hash-consed LDLf formulas in NNF, and regular expressions.
+
+    Each term is an integer, that indexes a node (kind, *arguments);
+    arguments are terms, frozensets of terms, or BDD guards.
+    """
+
+    def __init__(self, manager: BDDManager) -> None:
+        """
+        Initialize the store.
+
+        :param manager: the BDD manager of the propositional guards.
+        """
+        self.manager = manager
+        self._nodes: List[tuple] = []
+        self._ids: Dict[tuple, int] = {}
+        self._negations: Dict[int, int] = {}
+        self.tt = self._mk(_TT)
+        self.ff = self._mk(_FF)
+        self._negations[self.tt] = self.ff
+        self._negations[self.ff] = self.tt
+
+    def _mk(self, *node) -> int:
+        """Get the term of a node, adding it if needed."""
+        term = self._ids.get(node)
+        if term is None:
+            term = len(self._nodes)
+            self._nodes.append(node)
+            self._ids[node] = term
+        return term
+
+    def node(self, term: int) -> tuple:
+        """Get the node of a term, i.e. its kind followed by its arguments."""
+        return self._nodes[term]
+
+    def conj(self, operands: Iterable[int]) -> int:
+        """Get the conjunction of formulas."""
+        return self._junction(_AND, self.tt, self.ff, operands)
+
+    def disj(self, operands: Iterable[int]) -> int:
+        """Get the disjunction of formulas."""
+        return self._junction(_OR, self.ff, self.tt, operands)
+
+    def _junction(
+        self, kind: str, unit: int, zero: int, operands: Iterable[int]
+    ) -> int:
+        """Get a conjunction or a disjunction, flattened and simplified."""
+        flattened: Set[int] = set()
+        for operand in operands:
+            node = self._nodes[operand]
+            if node[0] == kind:
+                flattened.update(node[1])
+            elif operand == zero:
+                return zero
+            elif operand != unit:
+                flattened.add(operand)
+        if not flattened:
+            return unit
+        if len(flattened) == 1:
+            return next(iter(flattened))
+        return self._mk(kind, frozenset(flattened))
+
+    def diamond(self, regex: int, formula: int) -> int:
+        """Get the formula <regex>formula."""
+        if formula == self.ff:
+            return self.ff
+        node = self._nodes[regex]
+        if node[0] == _PROP and not node[1].is_satisfiable():
+            return self.ff
+        return self._mk(_DIAMOND, regex, formula)
+
+    def box(self, regex: int, formula: int) -> int:
+        """Get the formula [regex]formula."""
+        if formula == self.tt:
+            return self.tt
+        node = self._nodes[regex]
+        if node[0] == _PROP and not node[1].is_satisfiable():
+            return self.tt
+        return self._mk(_BOX, regex, formula)
+
+    def neg(self, formula: int) -> int:
+        """Get the negation of a formula, in NNF."""
+        result = self._negations.get(formula)
+        if result is None:
+            node = self._nodes[formula]
+            kind = node[0]
+            if kind == _AND:
+                result = self.disj(map(self.neg, node[1]))
+            elif kind == _OR:
+                result = self.conj(map(self.neg, node[1]))
+            elif kind == _DIAMOND:
+                result = self.box(node[1], self.neg(node[2]))
+            elif kind == _BOX:
+                result = self.diamond(node[1], self.neg(node[2]))
+            else:
+                raise ValueError(f"cannot negate a term of kind '{kind}'")
+            self._negations[formula] = result
+            self._negations[result] = formula
+        return result
+
+    def prop(self, guard: BDD) -> int:
+        """Get the regular expression of a propositional formula."""
+        return self._mk(_PROP, guard)
+
+    def test(self, formula: int) -> int:
+        """Get the regular expression formula?."""
+        return self._mk(_TEST, formula)
+
+    def seq(self, operands: Sequence[int]) -> int:
+        """Get the sequence of regular expressions."""
+        result = operands[-1]
+        for operand in reversed(operands[:-1]):
+            result = self._mk(_SEQ, operand, result)
+        return result
+
+    def union(self, operands: Iterable[int]) -> int:
+        """Get the union of regular expressions."""
+        operands = frozenset(operands)
+        if len(operands) == 1:
+            return next(iter(operands))
+        return self._mk(_UNION, operands)
+
+    def star(self, regex: int) -> int:
+        """Get the Kleene star of a regular expression."""
+        return self._mk(_STAR, regex)
+
+    def mark_f(self, formula: int) -> int:
+        """Get the marker F of a formula."""
+        return self._mk(_MARK_F, formula)
+
+    def mark_t(self, formula: int) -> int:
+        """Get the marker T of a formula."""
+        return self._mk(_MARK_T, formula)
+
+
+def _minimize_dnf(clauses: Iterable[FrozenSet[int]]) -> DNF:
+    """Remove the clauses that are supersets of other clauses."""
+    result: List[FrozenSet[int]] = []
+    for clause in sorted(set(clauses), key=len):
+        if not any(other <= clause for other in result):
+            result.append(clause)
+    return frozenset(result)
+
+
+def _and_dnf(left: DNF, right: DNF) -> DNF:
+    """Compute the conjunction of two DNFs."""
+    return _minimize_dnf(a | b for a in left for b in right)
+
+
+def _or_dnf(left: DNF, right: DNF) -> DNF:
+    """Compute the disjunction of two DNFs."""
+    return _minimize_dnf(left | right)
+
+
+class LDLfToDFA:
+    """The translation of LDLf formulas into DFAs."""
+
+    def __init__(self, terms: LDLfTerms) -> None:
+        """
+        Initialize the translation.
+
+        :param terms: the store of the terms.
+        """
+        self._terms = terms
+        self._manager = terms.manager
+        self._true_partition: Partition = ((self._manager.true, _DNF_TRUE),)
+        self._false_partition: Partition = ((self._manager.true, _DNF_FALSE),)
+        self._delta_cache: Dict[int, Partition] = {}
+        self._clause_cache: Dict[FrozenSet[int], Partition] = {}
+        self._end_cache: Dict[int, bool] = {}
+        self._unmark_cache: Dict[int, int] = {}
+        self._dnf_cache: Dict[int, DNF] = {}
+
+    def _combine(
+        self, left: Partition, right: Partition, operator: Callable[[DNF, DNF], DNF]
+    ) -> Partition:
+        """Combine two partitions, block by block."""
+        result: Dict[DNF, BDD] = {}
+        for left_guard, left_dnf in left:
+            for right_guard, right_dnf in right:
+                guard = left_guard & right_guard
+                if guard.is_satisfiable():
+                    dnf = operator(left_dnf, right_dnf)
+                    previous = result.get(dnf)
+                    result[dnf] = guard if previous is None else previous | guard
+        return tuple((guard, dnf) for dnf, guard in result.items())
+
+    def _conj(self, partitions: Iterable[Partition]) -> Partition:
+        """Compute the conjunction of partitions."""
+        result = self._true_partition
+        for partition in partitions:
+            if partition == self._false_partition:
+                return partition
+            result = self._combine(result, partition, _and_dnf)
+        return result
+
+    def _disj(self, partitions: Iterable[Partition]) -> Partition:
+        """Compute the disjunction of partitions."""
+        result = self._false_partition
+        for partition in partitions:
+            if partition == self._true_partition:
+                return partition
+            result = self._combine(result, partition, _or_dnf)
+        return result
+
+    def _step(self, guard: BDD, formula: int, otherwise: DNF) -> Partition:
+        """Get the partition: if guard then go to formula, else otherwise."""
+        then = self.to_dnf(self.unmark(formula))
+        blocks = ((guard, then), (~guard, otherwise))
+        return tuple(block for block in blocks if block[0].is_satisfiable())
+
+    def delta(self, formula: int) -> Partition:
+        """Compute the transition function of a formula."""
+        result = self._delta_cache.get(formula)
+        if result is None:
+            result = self._delta(formula)
+            self._delta_cache[formula] = result
+        return result
+
+    def _delta(self, formula: int) -> Partition:  # noqa: C901
+        """Compute the transition function of a formula, without caching."""
+        terms = self._terms
+        kind, *args = terms.node(formula)
+        if kind in (_TT, _MARK_T):
+            return self._true_partition
+        if kind in (_FF, _MARK_F):
+            return self._false_partition
+        if kind == _AND:
+            return self._conj(map(self.delta, args[0]))
+        if kind == _OR:
+            return self._disj(map(self.delta, args[0]))
+        regex, tail = args
+        regex_kind, *regex_args = terms.node(regex)
+        is_diamond = kind == _DIAMOND
+        modality = terms.diamond if is_diamond else terms.box
+        if regex_kind == _PROP:
+            return self._step(
+                regex_args[0], tail, _DNF_FALSE if is_diamond else _DNF_TRUE
+            )
+        if regex_kind == _TEST:
+            if is_diamond:
+                return self._conj([self.delta(regex_args[0]), self.delta(tail)])
+            return self._disj([self.delta(terms.neg(regex_args[0])), self.delta(tail)])
+        if regex_kind == _SEQ:
+            first, second = regex_args
+            return self.delta(modality(first, modality(second, tail)))
+        if regex_kind == _UNION:
+            partitions = (self.delta(modality(r, tail)) for r in regex_args[0])
+            return self._disj(partitions) if is_diamond else self._conj(partitions)
+        # Kleene star: unroll once, marking the formula to avoid empty loops.
+        (inner,) = regex_args
+        mark = terms.mark_f if is_diamond else terms.mark_t
+        unrolled = modality(inner, mark(formula))
+        unrolled_partitions = (self.delta(tail), self.delta(unrolled))
+        if is_diamond:
+            return self._disj(unrolled_partitions)
+        return self._conj(unrolled_partitions)
+
+    def is_accepting_at_end(self, formula: int) -> bool:
+        """Check whether a formula holds at the end of the trace."""
+        result = self._end_cache.get(formula)
+        if result is None:
+            result = self._is_accepting_at_end(formula)
+            self._end_cache[formula] = result
+        return result
+
+    def _is_accepting_at_end(self, formula: int) -> bool:  # noqa: C901
+        """Check whether a formula holds at the end of the trace, without caching."""
+        terms = self._terms
+        kind, *args = terms.node(formula)
+        if kind in (_TT, _MARK_T):
+            return True
+        if kind in (_FF, _MARK_F):
+            return False
+        if kind == _AND:
+            return all(map(self.is_accepting_at_end, args[0]))
+        if kind == _OR:
+            return any(map(self.is_accepting_at_end, args[0]))
+        regex, tail = args
+        regex_kind, *regex_args = terms.node(regex)
+        is_diamond = kind == _DIAMOND
+        modality = terms.diamond if is_diamond else terms.box
+        if regex_kind == _PROP:
+            return not is_diamond
+        if regex_kind == _TEST:
+            if is_diamond:
+                return self.is_accepting_at_end(
+                    regex_args[0]
+                ) and self.is_accepting_at_end(tail)
+            return self.is_accepting_at_end(
+                terms.neg(regex_args[0])
+            ) or self.is_accepting_at_end(tail)
+        if regex_kind == _SEQ:
+            first, second = regex_args
+            return self.is_accepting_at_end(modality(first, modality(second, tail)))
+        if regex_kind == _UNION:
+            values = (
+                self.is_accepting_at_end(modality(r, tail)) for r in regex_args[0]
+            )
+            return any(values) if is_diamond else all(values)
+        (inner,) = regex_args
+        mark = terms.mark_f if is_diamond else terms.mark_t
+        unrolled_values = (
+            self.is_accepting_at_end(tail),
+            self.is_accepting_at_end(modality(inner, mark(formula))),
+        )
+        return any(unrolled_values) if is_diamond else all(unrolled_values)
+
+    def unmark(self, formula: int) -> int:
+        """Replace the markers F and T with the marked formulas."""
+        result = self._unmark_cache.get(formula)
+        if result is None:
+            terms = self._terms
+            kind, *args = terms.node(formula)
+            if kind in (_MARK_F, _MARK_T):
+                result = self.unmark(args[0])
+            elif kind == _AND:
+                result = terms.conj(map(self.unmark, args[0]))
+            elif kind == _OR:
+                result = terms.disj(map(self.unmark, args[0]))
+            elif kind == _DIAMOND:
+                result = terms.diamond(args[0], self.unmark(args[1]))
+            elif kind == _BOX:
+                result = terms.box(args[0], self.unmark(args[1]))
+            else:
+                result = formula
+            self._unmark_cache[formula] = result
+        return result
+
+    def to_dnf(self, formula: int) -> DNF:
+        """Get the DNF of a formula, over its temporal subformulas."""
+        result = self._dnf_cache.get(formula)
+        if result is None:
+            kind, *args = self._terms.node(formula)
+            if kind == _TT:
+                result = _DNF_TRUE
+            elif kind == _FF:
+                result = _DNF_FALSE
+            elif kind == _AND:
+                result = _DNF_TRUE
+                for operand in args[0]:
+                    result = _and_dnf(result, self.to_dnf(operand))
+            elif kind == _OR:
+                result = _minimize_dnf(
+                    clause for operand in args[0] for clause in self.to_dnf(operand)
+                )
+            else:
+                result = frozenset([frozenset([formula])])
+            self._dnf_cache[formula] = result
+        return result
+
+    def _clause_delta(self, clause: FrozenSet[int]) -> Partition:
+        """Compute the transition function of a clause."""
+        result = self._clause_cache.get(clause)
+        if result is None:
+            result = self._conj(map(self.delta, clause))
+            self._clause_cache[clause] = result
+        return result
+
+    def to_mona_output(
+        self,
+        formula: int,
+        variable_names: Sequence[str],
+        max_states: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> MONAOutput:
+        """
+        Build the DFA of a formula.
+
+        :param formula: the formula.
+        :param variable_names: the names of the atoms of the formula.
+        :param max_states: the maximum number of states of the DFA.
+        :param timeout: the maximum time of the construction, in seconds.
+        :return: the MONAOutput of the DFA.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        initial_state = self.to_dnf(formula)
+        state_ids: Dict[DNF, int] = {initial_state: 0}
+        queue = [initial_state]
+        accepting: Set[int] = set()
+        transitions: Dict[int, Dict[int, Iterable[Dict[str, bool]]]] = {}
+        while queue:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeLimitException(
+                    f"the DFA construction took more than {timeout} seconds"
+                )
+            state = queue.pop()
+            state_id = state_ids[state]
+            if any(all(map(self.is_accepting_at_end, c)) for c in state):
+                accepting.add(state_id)
+            partition = self._disj(map(self._clause_delta, state))
+            for guard, successor in partition:
+                successor_id = state_ids.get(successor)
+                if successor_id is None:
+                    successor_id = state_ids[successor] = len(state_ids)
+                    if max_states is not None and len(state_ids) > max_states:
+                        raise StateLimitException(
+                            f"the DFA has more states than the limit of {max_states}"
+                        )
+                    queue.append(successor)
+                transitions.setdefault(state_id, {})[successor_id] = list(guard.cubes())
+        return cubes_to_mona_output(
+            set(state_ids.values()), 0, accepting, transitions, variable_names
+        )
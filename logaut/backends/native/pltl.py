@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+From pure-past PLTLf formulas to DFAs, directly.
+
+The value of a pure-past formula at an instant depends only on the symbol
+read at that instant and on the values, at the previous instant, of a few
+of its subformulas: the arguments of 'Y', and the 'S', 'O' and 'H'
+subformulas themselves. The formula is compiled into a circuit of gates,
+one per subformula, and the states of the DFA are the vectors of those
+values, plus the initial state, before any symbol is read. The successors
+of a state are computed by evaluating the circuit once, with BDD guards,
+so the construction takes time linear in the size of the formula for each
+state. A trace is accepted if the formula holds at its last instant; hence,
+the empty trace is always rejected.
+"""
+import functools
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pylogics.syntax.base import (
+    AbstractAtomic,
+    And,
+    Equivalence,
+    FalseFormula,
+    Formula,
+    Implies,
+    Not,
+    Or,
+    TrueFormula,
+)
+from pylogics.syntax.pltl import Before, Historically, Once, Since
+
+from logaut.automata import to_mona_output
+from logaut.automata.bdd import BDD, BDDDFA, BDDManager
+from logaut.backends.common.process_mona_output import MONAOutput
+from logaut.exceptions import StateLimitException, TimeLimitException
+
+# kinds of gates
+_ATOM = "atom"
+_TRUE = "true"
+_FALSE = "false"
+_NOT = "not"
+_AND = "and"
+_OR = "or"
+_BEFORE = "before"
+_SINCE = "since"
+_ONCE = "once"
+_HISTORICALLY = "historically"
+
+"""A gate: its kind, and either the indexes of its inputs or an atom name."""
+Gate = Tuple[str, Tuple]
+
+"""The values of the memory gates at the previous instant, if any."""
+State = Optional[Tuple[bool, ...]]
+
+
+class PLTLfCircuit:
+    """A circuit of hash-consed gates, in topological order."""
+
+    def __init__(self) -> None:
+        """Initialize the circuit."""
+        self._gates: List[Gate] = []
+        self._index: Dict[Gate, int] = {}
+        self._memory: Dict[int, int] = {}
+
+    @property
+    def gates(self) -> Sequence[Gate]:
+        """Get the gates, each after its inputs."""
+        return self._gates
+
+    @property
+    def memory(self) -> Sequence[int]:
+        """Get the gates whose values at the previous instant are needed."""
+        return list(self._memory)
+
+    def gate(self, kind: str, *inputs) -> int:
+        """
+        Get the index of a gate, adding it if needed.
+
+        :param kind: the kind of the gate.
+        :param inputs: the indexes of the input gates, or the atom name.
+        :return: the index of the gate.
+        """
+        gate = (kind, inputs)
+        index = self._index.get(gate)
+        if index is None:
+            index = self._index[gate] = len(self._gates)
+            self._gates.append(gate)
+            if kind == _BEFORE:
+                self.remember(inputs[0])
+            elif kind in (_SINCE, _ONCE, _HISTORICALLY):
+                self.remember(index)
+        return index
+
+    def remember(self, index: int) -> None:
+        """Make the value of a gate at the previous instant available."""
+        self._memory.setdefault(index, len(self._memory))
+
+    def evaluate(self, manager: BDDManager, state: State) -> List[BDD]:
+        """
+        Evaluate the gates at an instant, as functions of the symbol read.
+
+        :param manager: the BDD manager, where the atoms are declared.
+        :param state: the values of the memory gates at the previous instant,
+          or None at the first instant.
+        :return: the value of each gate.
+        """
+        values: List[BDD] = []
+        for index, (kind, inputs) in enumerate(self._gates):
+            if kind == _ATOM:
+                value = manager.var(inputs[0])
+            elif kind == _TRUE:
+                value = manager.true
+            elif kind == _FALSE:
+                value = manager.false
+            elif kind == _NOT:
+                value = ~values[inputs[0]]
+            elif kind == _AND:
+                value = functools.reduce(BDD.__and__, (values[i] for i in inputs))
+            elif kind == _OR:
+                value = functools.reduce(BDD.__or__, (values[i] for i in inputs))
+            else:
+                value = self._evaluate_temporal(manager, index, values, state)
+            values.append(value)
+        return values
+
+    def _evaluate_temporal(
+        self, manager: BDDManager, index: int, values: List[BDD], state: State
+    ) -> BDD:
+        """Evaluate a temporal gate."""
+        kind, inputs = self._gates[index]
+        if kind == _BEFORE:
+            previous = state is not None and state[self._memory[inputs[0]]]
+            return manager.true if previous else manager.false
+        argument = values[inputs[-1]]
+        if state is None:
+            return argument
+        previous = state[self._memory[index]]
+        if kind == _SINCE:
+            return (argument | values[inputs[0]]) if previous else argument
+        if kind == _ONCE:
+            return manager.true if previous else argument
+        return argument if previous else manager.false
+
+
+@functools.singledispatch
+def to_circuit(formula: Formula, circuit: PLTLfCircuit) -> int:
+    """
+    Add a pure-past PLTLf formula to a circuit.
+
+    :param formula: the formula.
+    :param circuit: the circuit.
+    :return: the index of the gate of the formula.
+    """
+    raise ValueError(f"formula of type {type(formula)} not supported")
+
+
+@to_circuit.register(AbstractAtomic)
+def _(formula: AbstractAtomic, circuit: PLTLfCircuit) -> int:
+    """Add an atomic formula."""
+    return circuit.gate(_ATOM, formula.name)
+
+
+@to_circuit.register(TrueFormula)
+def _(_formula: TrueFormula, circuit: PLTLfCircuit) -> int:
+    """Add a true formula."""
+    return circuit.gate(_TRUE)
+
+
+@to_circuit.register(FalseFormula)
+def _(_formula: FalseFormula, circuit: PLTLfCircuit) -> int:
+    """Add a false formula."""
+    return circuit.gate(_FALSE)
+
+
+@to_circuit.register(Not)
+def _(formula: Not, circuit: PLTLfCircuit) -> int:
+    """Add a negation."""
+    return circuit.gate(_NOT, to_circuit(formula.argument, circuit))
+
+
+@to_circuit.register(And)
+def _(formula: And, circuit: PLTLfCircuit) -> int:
+    """Add a conjunction."""
+    return circuit.gate(_AND, *_operands(formula, circuit))
+
+
+@to_circuit.register(Or)
+def _(formula: Or, circuit: PLTLfCircuit) -> int:
+    """Add a disjunction."""
+    return circuit.gate(_OR, *_operands(formula, circuit))
+
+
+@to_circuit.register(Implies)
+def _(formula: Implies, circuit: PLTLfCircuit) -> int:
+    """Add an implication, associating to the right."""
+    operands = _operands(formula, circuit)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = circuit.gate(_OR, circuit.gate(_NOT, operand), result)
+    return result
+
+
+@to_circuit.register(Equivalence)
+def _(formula: Equivalence, circuit: PLTLfCircuit) -> int:
+    """Add an equivalence, i.e. all the operands have the same value."""
+    operands = _operands(formula, circuit)
+    all_true = circuit.gate(_AND, *operands)
+    all_false = circuit.gate(_AND, *(circuit.gate(_NOT, op) for op in operands))
+    return circuit.gate(_OR, all_true, all_false)
+
+
+@to_circuit.register(Before)
+def _(formula: Before, circuit: PLTLfCircuit) -> int:
+    """Add a 'before' formula."""
+    return circuit.gate(_BEFORE, to_circuit(formula.argument, circuit))
+
+
+@to_circuit.register(Since)
+def _(formula: Since, circuit: PLTLfCircuit) -> int:
+    """Add a 'since' formula, associating to the right."""
+    operands = _operands(formula, circuit)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = circuit.gate(_SINCE, operand, result)
+    return result
+
+
+@to_circuit.register(Once)
+def _(formula: Once, circuit: PLTLfCircuit) -> int:
+    """Add a 'once' formula."""
+    return circuit.gate(_ONCE, to_circuit(formula.argument, circuit))
+
+
+@to_circuit.register(Historically)
+def _(formula: Historically, circuit: PLTLfCircuit) -> int:
+    """Add a 'historically' formula."""
+    return circuit.gate(_HISTORICALLY, to_circuit(formula.argument, circuit))
+
+
+def _operands(formula, circuit: PLTLfCircuit) -> List[int]:
+    """Add the operands of a formula."""
+    return [to_circuit(operand, circuit) for operand in formula.operands]
+
+
+def _partition(manager: BDDManager, values: Iterable[BDD]) -> List[Tuple[BDD, State]]:
+    """Split the alphabet into the blocks where the values are constant."""
+    blocks: List[Tuple[BDD, Tuple[bool, ...]]] = [(manager.true, ())]
+    for value in values:
+        refined = []
+        for guard, state in blocks:
+            for bit, part in ((True, guard & value), (False, guard & ~value)):
+                if part.is_satisfiable():
+                    refined.append((part, state + (bit,)))
+        blocks = refined
+    return list(blocks)
+
+
+class PLTLfToDFA:
+    """Build the DFAs of pure-past PLTLf formulas."""
+
+    def __init__(self, manager: BDDManager) -> None:
+        """
+        Initialize the builder.
+
+        :param manager: the BDD manager, where the atoms are declared.
+        """
+        self._manager = manager
+
+    def to_mona_output(
+        self,
+        formula: Formula,
+        max_states: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> MONAOutput:
+        """
+        Build the DFA of a formula.
+
+        :param formula: the formula.
+        :param max_states: the maximum number of states of the DFA.
+        :param timeout: the maximum time of the construction, in seconds.
+        :return: the MONAOutput of the DFA.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        circuit = PLTLfCircuit()
+        root = to_circuit(formula, circuit)
+        circuit.remember(root)
+        memory = circuit.memory
+        accepting_bit = memory.index(root)
+        state_ids: Dict[State, int] = {None: 0}
+        queue: List[State] = [None]
+        accepting: Set[int] = set()
+        transitions: Dict[int, Dict[int, BDD]] = {}
+        while queue:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeLimitException(
+                    f"the DFA construction took more than {timeout} seconds"
+                )
+            state = queue.pop()
+            state_id = state_ids[state]
+            if state is not None and state[accepting_bit]:
+                accepting.add(state_id)
+            values = circuit.evaluate(self._manager, state)
+            transitions[state_id] = {}
+            for guard, successor in _partition(
+                self._manager, map(values.__getitem__, memory)
+            ):
+                successor_id = state_ids.get(successor)
+                if successor_id is None:
+                    successor_id = state_ids[successor] = len(state_ids)
+                    if max_states is not None and len(state_ids) > max_states:
+                        raise StateLimitException(
+                            f"the DFA has more states than the limit of {max_states}"
+                        )
+                    queue.append(successor)
+                transitions[state_id][successor_id] = guard
+        return to_mona_output(
+            BDDDFA(len(state_ids), 0, accepting, transitions, self._manager)
+        )
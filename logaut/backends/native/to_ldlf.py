@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Transform LTLf and LDLf formulas into LDLf terms.
+
+LTLf formulas are translated into LDLf as in (De Giacomo and Vardi, 2013),
+e.g. 'a U b' becomes '<(a?; true)*>(b & !end)'; propositional formulas
+are translated into BDD guards.
+"""
+import functools
+from typing import Sequence
+
+from pylogics.syntax.base import (
+    AbstractAtomic,
+    And,
+    Equivalence,
+    FalseFormula,
+    Formula,
+    Implies,
+    Not,
+    Or,
+    TrueFormula,
+)
+from pylogics.syntax.ldl import Box, Diamond, Prop, Seq, Star, Test, Union
+from pylogics.syntax.ltl import (
+    Always,
+    Eventually,
+    Next,
+    PropositionalFalse,
+    PropositionalTrue,
+    Release,
+    StrongRelease,
+    Until,
+    WeakNext,
+    WeakUntil,
+)
+
+from logaut.automata.bdd import BDD, BDDManager
+from logaut.backends.native.ldlf import LDLfTerms
+
+
+@functools.singledispatch
+def to_guard(formula: Formula, manager: BDDManager) -> BDD:
+    """
+    Transform a propositional formula into a BDD guard.
+
+    :param formula: the propositional formula.
+    :param manager: the BDD manager.
+    :return: the BDD guard.
+    """
+    raise ValueError(f"formula of type {type(formula)} not supported")
+
+
+@to_guard.register(AbstractAtomic)
+def _(formula: AbstractAtomic, manager: BDDManager) -> BDD:
+    """Transform an atomic formula."""
+    return manager.var(formula.name)
+
+
+@to_guard.register(TrueFormula)
+def _(_formula: TrueFormula, manager: BDDManager) -> BDD:
+    """Transform a true formula."""
+    return manager.true
+
+
+@to_guard.register(FalseFormula)
+def _(_formula: FalseFormula, manager: BDDManager) -> BDD:
+    """Transform a false formula."""
+    return manager.false
+
+
+@to_guard.register(And)
+def _(formula: And, manager: BDDManager) -> BDD:
+    """Transform a conjunction."""
+    return functools.reduce(
+        BDD.__and__, (to_guard(op, manager) for op in formula.operands)
+    )
+
+
+@to_guard.register(Or)
+def _(formula: Or, manager: BDDManager) -> BDD:
+    """Transform a disjunction."""
+    return functools.reduce(
+        BDD.__or__, (to_guard(op, manager) for op in formula.operands)
+    )
+
+
+@to_guard.register(Not)
+def _(formula: Not, manager: BDDManager) -> BDD:
+    """Transform a negation."""
+    return ~to_guard(formula.argument, manager)
+
+
+@to_guard.register(Implies)
+def _(formula: Implies, manager: BDDManager) -> BDD:
+    """Transform an implication, associating to the right."""
+    guards = [to_guard(op, manager) for op in formula.operands]
+    result = guards[-1]
+    for guard in reversed(guards[:-1]):
+        result = ~guard | result
+    return result
+
+
+@to_guard.register(Equivalence)
+def _(formula: Equivalence, manager: BDDManager) -> BDD:
+    """Transform an equivalence, i.e. all the operands have the same value."""
+    guards = [to_guard(op, manager) for op in formula.operands]
+    all_true = functools.reduce(BDD.__and__, guards)
+    all_false = functools.reduce(BDD.__and__, (~guard for guard in guards))
+    return all_true | all_false
+
+
+@functools.singledispatch
+def to_ldlf(formula: Formula, terms: LDLfTerms) -> int:
+    """
+    Transform an LTLf or LDLf formula, or a regular expression, into a term.
+
+    :param formula: the formula.
+    :param terms: the store of the terms.
+    :return: the term.
+    """
+    raise ValueError(f"formula of type {type(formula)} not supported")
+
+
+def _operands(formula: Formula, terms: LDLfTerms) -> Sequence[int]:
+    """Transform the operands of a formula."""
+    return [to_ldlf(operand, terms) for operand in formula.operands]  # type: ignore
+
+
+def _end(terms: LDLfTerms) -> int:
+    """Get the formula 'end', that holds only at the end of the trace."""
+    return terms.box(terms.prop(terms.manager.true), terms.ff)
+
+
+def _not_end(terms: LDLfTerms) -> int:
+    """Get the formula '!end', that holds only before the end of the trace."""
+    return terms.diamond(terms.prop(terms.manager.true), terms.tt)
+
+
+@to_ldlf.register(AbstractAtomic)
+def _(formula: AbstractAtomic, terms: LDLfTerms) -> int:
+    """Transform an LTLf atom 'a' into '<a>tt'."""
+    return terms.diamond(terms.prop(terms.manager.var(formula.name)), terms.tt)
+
+
+@to_ldlf.register(TrueFormula)
+def _(_formula: TrueFormula, terms: LDLfTerms) -> int:
+    """Transform a logical true."""
+    return terms.tt
+
+
+@to_ldlf.register(FalseFormula)
+def _(_formula: FalseFormula, terms: LDLfTerms) -> int:
+    """Transform a logical false."""
+    return terms.ff
+
+
+@to_ldlf.register(PropositionalTrue)
+def _(_formula: PropositionalTrue, terms: LDLfTerms) -> int:
+    """Transform an LTLf propositional true into '<true>tt'."""
+    return _not_end(terms)
+
+
+@to_ldlf.register(PropositionalFalse)
+def _(_formula: PropositionalFalse, terms: LDLfTerms) -> int:
+    """Transform an LTLf propositional false."""
+    return terms.ff
+
+
+@to_ldlf.register(And)
+def _(formula: And, terms: LDLfTerms) -> int:
+    """Transform a conjunction."""
+    return terms.conj(_operands(formula, terms))
+
+
+@to_ldlf.register(Or)
+def _(formula: Or, terms: LDLfTerms) -> int:
+    """Transform a disjunction."""
+    return terms.disj(_operands(formula, terms))
+
+
+@to_ldlf.register(Not)
+def _(formula: Not, terms: LDLfTerms) -> int:
+    """Transform a negation."""
+    return terms.neg(to_ldlf(formula.argument, terms))
+
+
+@to_ldlf.register(Implies)
+def _(formula: Implies, terms: LDLfTerms) -> int:
+    """Transform an implication, associating to the right."""
+    operands = _operands(formula, terms)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = terms.disj([terms.neg(operand), result])
+    return result
+
+
+@to_ldlf.register(Equivalence)
+def _(formula: Equivalence, terms: LDLfTerms) -> int:
+    """Transform an equivalence, i.e. all the operands have the same value."""
+    operands = _operands(formula, terms)
+    all_true = terms.conj(operands)
+    all_false = terms.conj(map(terms.neg, operands))
+    return terms.disj([all_true, all_false])
+
+
+@to_ldlf.register(Next)
+def _(formula: Next, terms: LDLfTerms) -> int:
+    """Transform 'X[!] f' into '<true>(f & !end)'."""
+    tail = terms.conj([to_ldlf(formula.argument, terms), _not_end(terms)])
+    return terms.diamond(terms.prop(terms.manager.true), tail)
+
+
+@to_ldlf.register(WeakNext)
+def _(formula: WeakNext, terms: LDLfTerms) -> int:
+    """Transform 'X f' into '[true](f | end)'."""
+    tail = terms.disj([to_ldlf(formula.argument, terms), _end(terms)])
+    return terms.box(terms.prop(terms.manager.true), tail)
+
+
+def _until(left: int, right: int, terms: LDLfTerms) -> int:
+    """Get 'left U right' as '<(left?; true)*>(right & !end)'."""
+    step = terms.seq([terms.test(left), terms.prop(terms.manager.true)])
+    tail = terms.conj([right, _not_end(terms)])
+    return terms.diamond(terms.star(step), tail)
+
+
+def _release(left: int, right: int, terms: LDLfTerms) -> int:
+    """Get 'left R right' as '[(!left?; true)*](right | end)'."""
+    step = terms.seq([terms.test(terms.neg(left)), terms.prop(terms.manager.true)])
+    tail = terms.disj([right, _end(terms)])
+    return terms.box(terms.star(step), tail)
+
+
+def _always(formula: int, terms: LDLfTerms) -> int:
+    """Get 'G f' as '[true*](f | end)'."""
+    tail = terms.disj([formula, _end(terms)])
+    return terms.box(terms.star(terms.prop(terms.manager.true)), tail)
+
+
+def _fold_right(formula: Formula, terms: LDLfTerms, operator) -> int:
+    """Transform a binary temporal operator, associating to the right."""
+    operands = _operands(formula, terms)
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        result = operator(operand, result, terms)
+    return result
+
+
+@to_ldlf.register(Until)
+def _(formula: Until, terms: LDLfTerms) -> int:
+    """Transform an until."""
+    return _fold_right(formula, terms, _until)
+
+
+@to_ldlf.register(Release)
+def _(formula: Release, terms: LDLfTerms) -> int:
+    """Transform a release."""
+    return _fold_right(formula, terms, _release)
+
+
+@to_ldlf.register(WeakUntil)
+def _(formula: WeakUntil, terms: LDLfTerms) -> int:
+    """Transform 'f W g' as '(f U g) | G f'."""
+
+    def _weak_until(left: int, right: int, terms: LDLfTerms) -> int:
+        return terms.disj([_until(left, right, terms), _always(left, terms)])
+
+    return _fold_right(formula, terms, _weak_until)
+
+
+@to_ldlf.register(StrongRelease)
+def _(formula: StrongRelease, terms: LDLfTerms) -> int:
+    """Transform 'f M g' as 'g U (f & g)'."""
+
+    def _strong_release(left: int, right: int, terms: LDLfTerms) -> int:
+        return _until(right, terms.conj([left, right]), terms)
+
+    return _fold_right(formula, terms, _strong_release)
+
+
+@to_ldlf.register(Eventually)
+def _(formula: Eventually, terms: LDLfTerms) -> int:
+    """Transform 'F f' into '<true*>(f & !end)'."""
+    tail = terms.conj([to_ldlf(formula.argument, terms), _not_end(terms)])
+    return terms.diamond(terms.star(terms.prop(terms.manager.true)), tail)
+
+
+@to_ldlf.register(Always)
+def _(formula: Always, terms: LDLfTerms) -> int:
+    """Transform 'G f' into '[true*](f | end)'."""
+    return _always(to_ldlf(formula.argument, terms), terms)
+
+
+@to_ldlf.register(Diamond)
+def _(formula: Diamond, terms: LDLfTerms) -> int:
+    """Transform a diamond formula."""
+    regex = to_ldlf(formula.regular_expression, terms)
+    return terms.diamond(regex, to_ldlf(formula.tail_formula, terms))
+
+
+@to_ldlf.register(Box)
+def _(formula: Box, terms: LDLfTerms) -> int:
+    """Transform a box formula."""
+    regex = to_ldlf(formula.regular_expression, terms)
+    return terms.box(regex, to_ldlf(formula.tail_formula, terms))
+
+
+@to_ldlf.register(Prop)
+def _(formula: Prop, terms: LDLfTerms) -> int:
+    """Transform a propositional regular expression."""
+    return terms.prop(to_guard(formula.argument, terms.manager))
+
+
+@to_ldlf.register(Test)
+def _(formula: Test, terms: LDLfTerms) -> int:
+    """Transform a test."""
+    return terms.test(to_ldlf(formula.argument, terms))
+
+
+@to_ldlf.register(Seq)
+def _(formula: Seq, terms: LDLfTerms) -> int:
+    """Transform a sequence of regular expressions."""
+    return terms.seq(_operands(formula, terms))
+
+
+@to_ldlf.register(Union)
+def _(formula: Union, terms: LDLfTerms) -> int:
+    """Transform a union of regular expressions."""
+    return terms.union(_operands(formula, terms))
+
+
+@to_ldlf.register(Star)
+def _(formula: Star, terms: LDLfTerms) -> int:
+    """Transform a Kleene star."""
+    return terms.star(to_ldlf(formula.argument, terms))
@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Caches of translation results."""
+
+import copy
+import hashlib
+import json
+import os
+import pickle  # nosec
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from functools import singledispatch
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+from pylogics.syntax.base import (
+    AbstractAtomic,
+    FalseFormula,
+    Formula,
+    TrueFormula,
+    _BinaryOp,
+    _CommutativeBinaryOp,
+    _UnaryOp,
+)
+from pylogics.syntax.ldl import _TemporalFormula
+from pythomata.core import DFA
+from pythomata.impl.symbolic import SymbolicDFA
+
+from logaut.helpers import make_options_key
+from logaut.renaming import canonicalize
+
+"""Bump this number whenever the format of the cache entries (or keys) changes."""
+_CACHE_FORMAT_VERSION = 2
+
+_DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+_DEFAULT_MAX_ENTRIES = 1024
+_ENTRY_SUFFIX = ".pickle"
+
+
+@singledispatch
+def _serialize_formula(formula: Formula) -> List:
+    """
+    Serialize a formula by its structure, deterministically.
+
+    Unlike the representation of a formula, it does not depend on the
+    interpreter instance (e.g. on the addresses of the objects, or on
+    PYTHONHASHSEED through the order of sets).
+
+    :param formula: the formula.
+    :return: a JSON-serializable list: the type of the formula, and its content.
+    """
+    return [_type_name(formula)]
+
+
+def _type_name(formula: Formula) -> str:
+    """Get the qualified name of the type of a formula."""
+    return f"{type(formula).__module__}.{type(formula).__qualname__}"
+
+
+@_serialize_formula.register
+def _(formula: AbstractAtomic) -> List:
+    """Serialize an atomic proposition."""
+    return [_type_name(formula), formula.name]
+
+
+@_serialize_formula.register(TrueFormula)
+@_serialize_formula.register(FalseFormula)
+def _(formula: Formula) -> List:
+    """Serialize a boolean constant, with its logic."""
+    return [_type_name(formula), formula.logic.value]
+
+
+@_serialize_formula.register
+def _(formula: _UnaryOp) -> List:
+    """Serialize a unary operation."""
+    return [_type_name(formula), _serialize_formula(formula.argument)]
+
+
+@_serialize_formula.register
+def _(formula: _BinaryOp) -> List:
+    """Serialize a binary operation."""
+    return [_type_name(formula), *map(_serialize_formula, formula.operands)]
+
+
+@_serialize_formula.register
+def _(formula: _CommutativeBinaryOp) -> List:
+    """Serialize a commutative operation, with its operands sorted."""
+    operands = sorted(map(_serialize_formula, formula.operands), key=json.dumps)
+    return [_type_name(formula), *operands]
+
+
+@_serialize_formula.register
+def _(formula: _TemporalFormula) -> List:
+    """Serialize an LDLf diamond or box."""
+    return [
+        _type_name(formula),
+        _serialize_formula(formula.regular_expression),
+        _serialize_formula(formula.tail_formula),
+    ]
+
+
+def compute_cache_key(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    backend_options: Dict[str, Any],
+    tool_version: str,
+) -> str:
+    """
+    Compute a stable, content-addressed key for a translation.
+
+    The key does not depend on the interpreter instance (e.g. on PYTHONHASHSEED),
+    hence it can be used across processes and restarts.
+
+    :param formula: the formula to translate.
+    :param backend_id: the backend identifier.
+    :param method_name: the name of the translation method (e.g. 'ltl2dfa').
+    :param backend_options: the options the backend is instantiated with.
+    :param tool_version: the version of the tool the backend relies on.
+    :return: the hexadecimal digest of the key.
+    """
+    payload = json.dumps(
+        dict(
+            format=_CACHE_FORMAT_VERSION,
+            formula=_serialize_formula(formula),
+            logic=formula.logic.value,
+            backend=backend_id,
+            method=method_name,
+            options=backend_options,
+            version=tool_version,
+        ),
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@singledispatch
+def copy_automaton(automaton: DFA) -> DFA:
+    """
+    Copy an automaton, so that the copy can be modified without affecting the original.
+
+    By default, a deep copy is made. Implementations whose guards are immutable
+    only copy the containers of states and transitions, sharing the guards.
+
+    :param automaton: the automaton to copy.
+    :return: the copy.
+    """
+    return copy.deepcopy(automaton)
+
+
+@copy_automaton.register
+def _(automaton: SymbolicDFA) -> SymbolicDFA:
+    """Copy a symbolic DFA, sharing the (immutable) SymPy guards."""
+    result = copy.copy(automaton)
+    result._states = set(automaton._states)
+    result._final_states = set(automaton._final_states)
+    # copy.copy, rather than dict, keeps lazily computed guards lazy.
+    result._transition_function = {
+        source: copy.copy(transitions)
+        for source, transitions in automaton._transition_function.items()
+    }
+    result._state_attributes = copy.deepcopy(automaton._state_attributes)
+    result._transition_attributes = copy.deepcopy(automaton._transition_attributes)
+    return result
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of an in-memory cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class MemoryCache:
+    """
+    A bounded, in-memory LRU cache of automata.
+
+    Thanks to the hash-consing of Pylogics formulas, structurally equal formulas
+    are the same object, so entries are keyed by identity of the formula.
+    The formulas are only weakly referenced: when a formula is garbage collected
+    (e.g. after 'pylogics.syntax.base.reset_cache'), its entries are dropped.
+
+    Moreover, the entries are indexed by canonical key (see logaut.renaming),
+    so that the automaton of an alpha-equivalent formula can be found.
+    """
+
+    def __init__(self, maxsize: int = _DEFAULT_MAX_ENTRIES, copy: bool = True):
+        """
+        Initialize the cache.
+
+        :param maxsize: the maximum number of entries.
+        :param copy: if True, return a copy of the cached automaton at each hit,
+          so that callers can safely modify it. If False, the cached automaton
+          is shared among all the callers, and must not be modified.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self._maxsize = maxsize
+        self._copy = copy
+        self._entries: "OrderedDict[Tuple, DFA]" = OrderedDict()
+        # canonical key (see logaut.renaming) -> the formula of an entry, and its atoms.
+        self._representatives: Dict[Tuple, Tuple[weakref.ref, Tuple[str, ...]]] = {}
+        # key of an entry -> its canonical key, to prune the representatives.
+        self._canonical_keys: Dict[Tuple, Tuple] = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(
+        self,
+        formula_ref: weakref.ref,
+        backend_id: str,
+        method_name: str,
+        options: Hashable,
+    ) -> Tuple:
+        """Build the key of an entry."""
+        return formula_ref, backend_id, method_name, options
+
+    def get(
+        self,
+        formula: Formula,
+        backend_id: str,
+        method_name: str,
+        backend_options: Dict[str, Any],
+    ) -> Optional[DFA]:
+        """
+        Get the automaton of a translation.
+
+        :param formula: the formula.
+        :param backend_id: the backend identifier.
+        :param method_name: the name of the translation method.
+        :param backend_options: the backend options.
+        :return: the automaton, or None if the translation is not in the cache.
+        """
+        key = self._key(
+            weakref.ref(formula),
+            backend_id,
+            method_name,
+            make_options_key(backend_options),
+        )
+        with self._lock:
+            automaton = self._entries.get(key)
+            if automaton is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return copy_automaton(automaton) if self._copy else automaton
+
+    def put(
+        self,
+        formula: Formula,
+        backend_id: str,
+        method_name: str,
+        backend_options: Dict[str, Any],
+        automaton: DFA,
+    ) -> None:
+        """
+        Store the automaton of a translation.
+
+        :param formula: the formula.
+        :param backend_id: the backend identifier.
+        :param method_name: the name of the translation method.
+        :param backend_options: the backend options.
+        :param automaton: the automaton.
+        """
+        formula_ref = weakref.ref(formula, self._remove_dead)
+        options = make_options_key(backend_options)
+        key = self._key(formula_ref, backend_id, method_name, options)
+        canonical, atoms = canonicalize(formula)
+        canonical_key = (canonical, backend_id, method_name, options)
+        if self._copy:
+            automaton = copy_automaton(automaton)
+        with self._lock:
+            self._representatives[canonical_key] = (formula_ref, atoms)
+            self._canonical_keys[key] = canonical_key
+            self._entries[key] = automaton
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._forget(evicted_key)
+
+    def _forget(self, key: Tuple) -> None:
+        """Remove the representative that points to an entry, if any."""
+        canonical_key = self._canonical_keys.pop(key, None)
+        if canonical_key is None:
+            return
+        representative = self._representatives.get(canonical_key)
+        if representative is None:
+            return
+        if self._key(representative[0], *canonical_key[1:]) == key:
+            del self._representatives[canonical_key]
+
+    def get_alpha_equivalent(
+        self,
+        formula: Formula,
+        backend_id: str,
+        method_name: str,
+        backend_options: Dict[str, Any],
+    ) -> Optional[Tuple[DFA, Dict[str, str]]]:
+        """
+        Get the automaton of the translation of an alpha-equivalent formula.
+
+        See logaut.renaming: the formulas must have the same canonical key.
+        The statistics are not updated.
+
+        :param formula: the formula.
+        :param backend_id: the backend identifier.
+        :param method_name: the name of the translation method.
+        :param backend_options: the backend options.
+        :return: the automaton, to be relabeled with the returned renaming
+          of its variables (see logaut.automata.relabel), or None if there is
+          no alpha-equivalent formula in the cache. The automaton is shared,
+          and must not be modified.
+        """
+        options = make_options_key(backend_options)
+        canonical, atoms = canonicalize(formula)
+        with self._lock:
+            representative = self._representatives.get(
+                (canonical, backend_id, method_name, options)
+            )
+            if representative is None:
+                return None
+            formula_ref, representative_atoms = representative
+            key = self._key(formula_ref, backend_id, method_name, options)
+            automaton = self._entries.get(key)
+            if automaton is None:
+                return None
+            self._entries.move_to_end(key)
+        return automaton, dict(zip(representative_atoms, atoms))
+
+    def _remove_dead(self, dead_ref: weakref.ref) -> None:
+        """Remove the entries of a garbage-collected formula."""
+        with self._lock:
+            dead_keys = [key for key in self._entries if key[0] is dead_ref]
+            for key in dead_keys:
+                del self._entries[key]
+            dead_keys = [key for key in self._canonical_keys if key[0] is dead_ref]
+            for key in dead_keys:
+                del self._canonical_keys[key]
+            dead_keys = [
+                key
+                for key, (formula_ref, _) in self._representatives.items()
+                if formula_ref is dead_ref
+            ]
+            for key in dead_keys:
+                del self._representatives[key]
+
+    def info(self) -> CacheInfo:
+        """Get the cache statistics."""
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        """Remove all the entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._representatives.clear()
+            self._canonical_keys.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class DiskCache:
+    """
+    A persistent, content-addressed cache of automata.
+
+    Each entry is stored as a pickle file named after its key. The total size of
+    the entries is bounded: when it exceeds the maximum size, the least recently
+    used entries (according to their modification time) are removed.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], max_size: Optional[int] = _DEFAULT_MAX_SIZE
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param directory: the directory where to store the entries.
+        :param max_size: the maximum size, in bytes, of the cache. None means no limit.
+        """
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._size = sum(path.stat().st_size for path in self._entries())
+
+    @property
+    def directory(self) -> Path:
+        """Get the cache directory."""
+        return self._directory
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """Get the maximum size of the cache, in bytes."""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Get the (approximate) size of the cache, in bytes."""
+        return self._size
+
+    def _path(self, key: str) -> Path:
+        """Get the path of the entry associated to a key."""
+        return self._directory / key[:2] / (key + _ENTRY_SUFFIX)
+
+    def _entries(self) -> List[Path]:
+        """Get the paths of all the entries."""
+        return list(self._directory.glob(f"*/*{_ENTRY_SUFFIX}"))
+
+    def get(self, key: str) -> Optional[DFA]:
+        """
+        Get the automaton associated to a key.
+
+        :param key: the key.
+        :return: the automaton, or None if the key is not in the cache.
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            automaton = pickle.loads(data)  # nosec
+        except Exception:  # pylint: disable=broad-except
+            # corrupted entry: drop it and behave as a miss.
+            self._remove(path)
+            return None
+        # refresh the access time, used by the eviction policy.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return automaton
+
+    def put(self, key: str, automaton: DFA) -> None:
+        """
+        Store the automaton associated to a key.
+
+        The write is atomic: concurrent readers never see a partial entry.
+
+        :param key: the key.
+        :param automaton: the automaton.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(automaton, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            # an overwritten entry does not count twice.
+            old_size = path.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink()
+            raise
+        self._size = max(0, self._size - old_size) + len(data)
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        for path in self._entries():
+            self._remove(path)
+        self._size = 0
+
+    def _remove(self, path: Path) -> None:
+        """Remove an entry, if it exists."""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._size = max(0, self._size - size)
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries until the size limit is met."""
+        if self._max_size is None or self._size <= self._max_size:
+            return
+        entries: List[Tuple[float, int, Path]] = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, _, path in entries:
+            if self._size <= self._max_size:
+                break
+            self._remove(path)
+
+
+_memory_cache: Optional[MemoryCache] = MemoryCache()
+_disk_cache: Optional[DiskCache] = None
+
+
+def enable_memory_cache(
+    maxsize: int = _DEFAULT_MAX_ENTRIES, copy: bool = True
+) -> MemoryCache:
+    """
+    Enable (or reconfigure) the in-memory cache of translations.
+
+    The in-memory cache is enabled by default.
+
+    :param maxsize: the maximum number of entries.
+    :param copy: whether to return copies of the cached automata (see MemoryCache).
+    :return: the memory cache.
+    """
+    global _memory_cache  # pylint: disable=global-statement
+    _memory_cache = MemoryCache(maxsize=maxsize, copy=copy)
+    return _memory_cache
+
+
+def disable_memory_cache() -> None:
+    """Disable the in-memory cache of translations."""
+    global _memory_cache  # pylint: disable=global-statement
+    _memory_cache = None
+
+
+def get_memory_cache() -> Optional[MemoryCache]:
+    """Get the in-memory cache of translations, if enabled."""
+    return _memory_cache
+
+
+def enable_disk_cache(
+    directory: Union[str, Path], max_size: Optional[int] = _DEFAULT_MAX_SIZE
+) -> DiskCache:
+    """
+    Enable the persistent cache of translations.
+
+    :param directory: the directory where to store the entries.
+    :param max_size: the maximum size, in bytes, of the cache. None means no limit.
+    :return: the disk cache.
+    """
+    global _disk_cache  # pylint: disable=global-statement
+    _disk_cache = DiskCache(directory, max_size=max_size)
+    return _disk_cache
+
+
+def disable_disk_cache() -> None:
+    """Disable the persistent cache of translations (the entries are not removed)."""
+    global _disk_cache  # pylint: disable=global-statement
+    _disk_cache = None
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """Get the persistent cache of translations, if enabled."""
+    return _disk_cache
@@ -21,102 +21,1518 @@
 #
 
 """Logaut core module."""
-from pylogics.syntax.base import Formula
+import asyncio
+import os
+import pickle  # nosec
+import weakref
+from collections import Counter
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+from pylogics.syntax.base import And, Formula, Logic, Or
 from pythomata.core import DFA
 
 import logaut.backends
+from logaut import automata, patterns
+from logaut.automata import bdd, from_mona_output, to_mona_output
+from logaut.backends.base import Backend
+from logaut.backends.common.find_atoms.base import find_atoms
+from logaut.cache import (
+    DiskCache,
+    MemoryCache,
+    compute_cache_key,
+    copy_automaton,
+    get_disk_cache,
+    get_memory_cache,
+)
+from logaut.exceptions import BadLogicFormulaException
+from logaut.helpers import dump_formula
+from logaut.renaming import rename_atoms
+from logaut.simplify import simplify as simplify_formula
 
 _DEFAULT_BACKEND = "lydia"
+_METHOD_BY_LOGIC = {
+    Logic.LTL: "ltl2dfa",
+    Logic.LDL: "ldl2dfa",
+    Logic.PLTL: "pltl2dfa",
+    Logic.PLDL: "pldl2dfa",
+    Logic.FOL: "fol2dfa",
+    Logic.MSO: "mso2dfa",
+}
+_EXECUTORS: Dict[str, Callable[..., Executor]] = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+_async_max_concurrency: int = os.cpu_count() or 1
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def _call_method(
-    formula: Formula, backend_id: str, method_name: str, **backend_options
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool = True,
+    **backend_options,
 ) -> DFA:
     """Call a method."""
-    backend = logaut.backends.make(backend_id, **backend_options)
+    automaton = _lookup(formula, backend_id, method_name, use_cache, backend_options)
+    if automaton is not None:
+        return automaton
+    return _call_backend(formula, backend_id, method_name, use_cache, backend_options)
+
+
+def _lookup(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    backend_options: Dict[str, Any],
+) -> Optional[DFA]:
+    """Get the DFA of a formula without calling the backend: if it is simple, or cached in memory."""
+    automaton = _build_directly(formula, backend_id, method_name, backend_options)
+    if automaton is not None:
+        return automaton
+    memory_cache = get_memory_cache() if use_cache else None
+    if memory_cache is None:
+        return None
+    automaton = memory_cache.get(formula, backend_id, method_name, backend_options)
+    if automaton is None:
+        automaton = _get_alpha_equivalent(
+            memory_cache, formula, backend_id, method_name, backend_options
+        )
+    return automaton
+
+
+def _lookup_disk_cache(
+    disk_cache: DiskCache,
+    backend: Backend,
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    backend_options: Dict[str, Any],
+) -> Tuple[str, Optional[DFA]]:
+    """Compute the disk cache key of a call to the backend, and look it up."""
+    key = compute_cache_key(
+        formula, backend_id, method_name, backend_options, backend.tool_version
+    )
+    return key, disk_cache.get(key)
+
+
+def _call_backend(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    backend_options: Dict[str, Any],
+) -> DFA:
+    """Call the backend, through the disk cache, and store the DFA in the memory cache."""
+    backend = logaut.backends.get_backend(backend_id, **backend_options)
     method = getattr(backend, method_name)
-    return method(formula)
+    disk_cache = get_disk_cache() if use_cache else None
+    if disk_cache is None:
+        automaton = method(formula)
+    else:
+        key, automaton = _lookup_disk_cache(
+            disk_cache, backend, formula, backend_id, method_name, backend_options
+        )
+        if automaton is None:
+            automaton = method(formula)
+            disk_cache.put(key, automaton)
+
+    memory_cache = get_memory_cache() if use_cache else None
+    if memory_cache is not None:
+        memory_cache.put(formula, backend_id, method_name, backend_options, automaton)
+    return automaton
+
+
+def _build_directly(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    backend_options: Dict[str, Any],
+) -> Optional[DFA]:
+    """Build the DFA of a simple formula without calling the backend, if allowed."""
+    backend_cls = logaut.backends.get_backend_class(backend_id)
+    if not backend_cls.direct_construction or getattr(
+        backend_cls, method_name
+    ) is getattr(Backend, method_name):
+        return None
+    # the same input checks of the backend.
+    if _METHOD_BY_LOGIC.get(formula.logic) != method_name:
+        expected_logic = method_name[: -len("2dfa")]
+        raise BadLogicFormulaException(method_name, expected_logic, formula.logic.value)
+    backend_cls.check_atoms(formula)
+    automaton = patterns.build_dfa(formula)
+    if automaton is None:
+        return None
+    max_states = backend_options.get("max_states")
+    if max_states is not None and len(automaton.states) > max_states:
+        # let the backend report the error.
+        return None
+    return from_mona_output(
+        to_mona_output(automaton),
+        backend_options.get("representation", "symbolic"),
+        backend_options.get("minimize_guards", False),
+    )
+
+
+def _get_alpha_equivalent(
+    memory_cache: MemoryCache,
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    backend_options: Dict[str, Any],
+) -> Optional[DFA]:
+    """Get the DFA of a formula by relabeling the one of an alpha-equivalent formula."""
+    match = memory_cache.get_alpha_equivalent(
+        formula, backend_id, method_name, backend_options
+    )
+    if match is None:
+        return None
+    try:
+        automaton = automata.relabel(*match)
+    except (TypeError, ValueError):
+        # e.g. the DFAs of a custom backend, or with variables not in the formula.
+        return None
+    memory_cache.put(formula, backend_id, method_name, backend_options, automaton)
+    return automaton
+
+
+"""A tree of formulas: a leaf, or an operator (And or Or) with its subtrees."""
+_FormulaTree = Union[Formula, Tuple[type, list]]
+
+
+def _split(formula: Formula, split_disjunctions: bool) -> _FormulaTree:
+    """Split the top-level conjunctions, and disjunctions, of a formula."""
+    operators = (And, Or) if split_disjunctions else (And,)
+    operator = type(formula)
+    if operator not in operators:
+        return formula
+    subtrees = []
+    for operand in formula.operands:
+        subtree = _split(operand, split_disjunctions)
+        # flatten nested applications of the same operator.
+        if isinstance(subtree, tuple) and subtree[0] is operator:
+            subtrees.extend(subtree[1])
+        else:
+            subtrees.append(subtree)
+    return operator, subtrees
+
+
+def _leaves(tree: _FormulaTree) -> Iterator[Formula]:
+    """Get the formulas at the leaves of a tree."""
+    if isinstance(tree, tuple):
+        for subtree in tree[1]:
+            yield from _leaves(subtree)
+    else:
+        yield tree
+
+
+def _combine(tree: _FormulaTree, automata: Dict[Formula, bdd.BDDDFA]) -> bdd.BDDDFA:
+    """Combine the DFAs of the leaves of a tree, by a balanced tree of products."""
+    if not isinstance(tree, tuple):
+        return automata[tree]
+    operator, subtrees = tree
+    # merge the smallest DFAs first.
+    queue = sorted(
+        (_combine(subtree, automata) for subtree in subtrees),
+        key=lambda automaton: len(automaton.states),
+    )
+    while len(queue) > 1:
+        merged = [
+            bdd.minimize(bdd.product(first, second, operator is And))
+            for first, second in zip(queue[::2], queue[1::2])
+        ]
+        nb_merged = 2 * len(merged)
+        queue = merged + queue[nb_merged:]
+    return queue[0]
+
+
+def _compositional_call_method(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool = True,
+    split_disjunctions: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    Call a method compositionally.
+
+    The top-level conjunctions (and, optionally, disjunctions) are split,
+    the parts are translated concurrently, each with the caches,
+    and their minimized DFAs are combined by a balanced tree of products,
+    each of them minimized.
+    """
+    tree = _split(formula, split_disjunctions)
+    if not isinstance(tree, tuple):
+        return _call_method(
+            formula, backend_id, method_name, use_cache, **backend_options
+        )
+    parts = list(dict.fromkeys(_leaves(tree)))
+    results = _batch_call_method(
+        parts, backend_id, method_name, use_cache=use_cache, **backend_options
+    )
+    return _combine_parts(formula, tree, results, backend_options)
+
+
+async def _acompositional_call_method(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool = True,
+    split_disjunctions: bool = False,
+    **backend_options,
+) -> DFA:
+    """Call a method compositionally, asynchronously; see _compositional_call_method."""
+    tree = _split(formula, split_disjunctions)
+    if not isinstance(tree, tuple):
+        return await _acall_method(
+            formula, backend_id, method_name, use_cache, **backend_options
+        )
+    parts = list(dict.fromkeys(_leaves(tree)))
+    part_automata = await asyncio.gather(
+        *(
+            _acall_method(part, backend_id, method_name, use_cache, **backend_options)
+            for part in parts
+        )
+    )
+    return _combine_parts(formula, tree, zip(parts, part_automata), backend_options)
+
+
+def _combine_parts(
+    formula: Formula,
+    tree: _FormulaTree,
+    results: Iterable[Tuple[Formula, DFA]],
+    backend_options: Dict[str, Any],
+) -> DFA:
+    """Combine the DFAs of the parts of a formula split by _split."""
+    # a dedicated manager, so that the nodes of the products are freed afterwards.
+    manager = bdd.BDDManager()
+    manager.declare(*sorted(find_atoms(formula)))
+    automata = {
+        part: bdd.minimize(bdd.from_mona_output(to_mona_output(automaton), manager))
+        for part, automaton in results
+    }
+    result = _combine(tree, automata)
+    representation = backend_options.get("representation", "symbolic")
+    if representation == "bdd":
+        return result
+    return from_mona_output(
+        to_mona_output(result),
+        representation,
+        backend_options.get("minimize_guards", False),
+    )
+
+
+def _preprocess(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    compositional: bool,
+    simplify: bool,
+    backend_options: Dict[str, Any],
+) -> Tuple[Formula, Optional[DFA]]:
+    """
+    Prepare the translation of a formula, shared by all the core translators.
+
+    :return: the formula to translate, simplified if required, and its DFA
+      if it is simple or cached in memory, otherwise None.
+    """
+    if simplify:
+        formula = simplify_formula(formula)
+    if compositional:
+        # the parts are looked up separately.
+        return formula, None
+    return formula, _lookup(
+        formula, backend_id, method_name, use_cache, backend_options
+    )
+
+
+def _translate(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    compositional: bool,
+    split_disjunctions: bool,
+    minimize: bool,
+    simplify: bool,
+    backend_options: Dict[str, Any],
+) -> DFA:
+    """Translate a formula, with the options of the core translators."""
+    formula, automaton = _preprocess(
+        formula,
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        simplify,
+        backend_options,
+    )
+    if automaton is None:
+        if compositional:
+            # the result is already minimal.
+            return _compositional_call_method(
+                formula,
+                backend_id,
+                method_name,
+                use_cache=use_cache,
+                split_disjunctions=split_disjunctions,
+                **backend_options,
+            )
+        automaton = _call_backend(
+            formula, backend_id, method_name, use_cache, backend_options
+        )
+    return automata.minimize(automaton) if minimize else automaton
+
+
+async def _atranslate(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    compositional: bool,
+    split_disjunctions: bool,
+    minimize: bool,
+    simplify: bool,
+    backend_options: Dict[str, Any],
+) -> DFA:
+    """Translate a formula asynchronously, with the options of the core translators."""
+    formula, automaton = _preprocess(
+        formula,
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        simplify,
+        backend_options,
+    )
+    if automaton is None:
+        if compositional:
+            # the result is already minimal.
+            return await _acompositional_call_method(
+                formula,
+                backend_id,
+                method_name,
+                use_cache=use_cache,
+                split_disjunctions=split_disjunctions,
+                **backend_options,
+            )
+        automaton = await _acall_backend(
+            formula, backend_id, method_name, use_cache, backend_options
+        )
+    return automata.minimize(automaton) if minimize else automaton
+
+
+class Template:
+    """
+    A formula whose atoms are parameters, e.g. a Declare constraint.
+
+    The formula is translated once, on the first instantiation. The DFAs of
+    its instances are obtained by renaming the variables of the guards
+    (see logaut.automata.relabel), without running the backend again.
+    """
+
+    def __init__(
+        self,
+        formula: Formula,
+        backend: str = _DEFAULT_BACKEND,
+        use_cache: bool = True,
+        compositional: bool = False,
+        split_disjunctions: bool = False,
+        minimize: bool = False,
+        simplify: bool = False,
+        **backend_options,
+    ):
+        """
+        Initialize the template.
+
+        :param formula: the formula; its atoms are the parameters.
+        :param backend: the backend to use.
+        :param use_cache: whether to use the translation caches, if enabled.
+        :param compositional: whether to translate the top-level conjuncts
+          separately, and to combine their DFAs by products.
+        :param split_disjunctions: in compositional mode,
+          whether to split the top-level disjunctions too.
+        :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+        :param simplify: whether to simplify the formula before the translation;
+          see logaut.simplify.simplify.
+        :param backend_options: options to pass to the backend.
+        """
+        method_name = _METHOD_BY_LOGIC.get(formula.logic)
+        if method_name is None:
+            raise ValueError(f"logic {formula.logic} not supported")
+        self._formula = formula
+        self._parameters = tuple(sorted(find_atoms(formula)))
+        self._translate_args = (
+            backend,
+            method_name,
+            use_cache,
+            compositional,
+            split_disjunctions,
+            minimize,
+            simplify,
+            backend_options,
+        )
+        self._automaton: Optional[DFA] = None
+
+    @property
+    def formula(self) -> Formula:
+        """Get the formula."""
+        return self._formula
+
+    @property
+    def parameters(self) -> Tuple[str, ...]:
+        """Get the parameters, i.e. the atoms of the formula, sorted."""
+        return self._parameters
+
+    @property
+    def automaton(self) -> DFA:
+        """Get the DFA of the formula; it is shared, and must not be modified."""
+        if self._automaton is None:
+            self._automaton = _translate(self._formula, *self._translate_args)
+        return self._automaton
+
+    def instantiate(self, substitution: Mapping[str, str]) -> DFA:
+        """
+        Get the DFA of an instance of the template.
+
+        If two parameters are replaced by the same atom, the instance
+        is translated by the backend.
+
+        :param substitution: the atom that replaces each parameter;
+          the parameters not in it are kept.
+        :return: the DFA.
+        """
+        unknown = set(substitution) - set(self._parameters)
+        if unknown:
+            raise ValueError(f"unknown parameters: {sorted(unknown)}")
+        renaming = {name: substitution.get(name, name) for name in self._parameters}
+        if len(set(renaming.values())) == len(renaming):
+            try:
+                return automata.relabel(self.automaton, renaming)
+            except (TypeError, ValueError):
+                # e.g. the DFAs of a custom backend.
+                pass
+        instance = rename_atoms(self._formula, substitution)
+        return _translate(instance, *self._translate_args)
+
+
+def set_async_concurrency(limit: int) -> None:
+    """
+    Set the maximum number of concurrent asynchronous translations, per event loop.
+
+    Translations served by the caches are not limited.
+    The default is the number of CPUs.
+
+    :param limit: the maximum number of concurrent translations.
+    """
+    global _async_max_concurrency
+    if limit < 1:
+        raise ValueError(f"the concurrency limit must be positive, got {limit}")
+    _async_max_concurrency = limit
+    _async_semaphores.clear()
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore that limits the translations in the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_async_max_concurrency)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _acall_method(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool = True,
+    **backend_options,
+) -> DFA:
+    """Call a method, asynchronously."""
+    automaton = _lookup(formula, backend_id, method_name, use_cache, backend_options)
+    if automaton is not None:
+        return automaton
+    return await _acall_backend(
+        formula, backend_id, method_name, use_cache, backend_options
+    )
+
+
+async def _acall_backend(
+    formula: Formula,
+    backend_id: str,
+    method_name: str,
+    use_cache: bool,
+    backend_options: Dict[str, Any],
+) -> DFA:
+    """Call the backend asynchronously; see _call_backend."""
+    backend = logaut.backends.get_backend(backend_id, **backend_options)
+    method = getattr(backend, f"a{method_name}")
+    disk_cache = get_disk_cache() if use_cache else None
+    key = None
+    automaton = None
+    # the disk cache does blocking I/O, and getting the tool version may run
+    # the tool: they are done in the default executor of the event loop.
+    loop = asyncio.get_running_loop()
+    if disk_cache is not None:
+        key, automaton = await loop.run_in_executor(
+            None,
+            _lookup_disk_cache,
+            disk_cache,
+            backend,
+            formula,
+            backend_id,
+            method_name,
+            backend_options,
+        )
+    if automaton is None:
+        async with _get_async_semaphore():
+            automaton = await method(formula)
+        if disk_cache is not None:
+            await loop.run_in_executor(None, disk_cache.put, cast(str, key), automaton)
+
+    memory_cache = get_memory_cache() if use_cache else None
+    if memory_cache is not None:
+        memory_cache.put(formula, backend_id, method_name, backend_options, automaton)
+    return automaton
+
+
+def _translate_dumped(dumped_formula: bytes, *translate_args: Any) -> DFA:
+    """Translate a formula serialized with 'dump_formula'; see _translate."""
+    formula = pickle.loads(dumped_formula)  # nosec
+    return _translate(formula, *translate_args)
+
+
+def _make_executor(
+    executor: Union[str, Executor], max_workers: Optional[int]
+) -> Executor:
+    """Make the executor, if it is specified by name."""
+    if not isinstance(executor, str):
+        return executor
+    if executor not in _EXECUTORS:
+        raise ValueError(
+            f"unknown executor '{executor}', expected one of {sorted(_EXECUTORS)}"
+        )
+    return _EXECUTORS[executor](max_workers=max_workers)
+
+
+def _submit_to_process_pool(
+    pool: Executor, formula: Formula, translate_args: Tuple
+) -> Future:
+    """
+    Submit the translation of a formula to a pool of processes.
+
+    The formula is preprocessed in this process: the DFAs of simple formulas,
+    and those in the memory cache, are not computed again.
+    """
+    (
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    ) = translate_args
+    formula, automaton = _preprocess(
+        formula,
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        simplify,
+        backend_options,
+    )
+    if automaton is not None:
+        future: Future = Future()
+        future.set_result(automata.minimize(automaton) if minimize else automaton)
+        return future
+    future = pool.submit(
+        _translate_dumped,
+        dump_formula(formula),
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        False,
+        backend_options,
+    )
+    memory_cache = get_memory_cache() if use_cache else None
+    if memory_cache is not None and not (compositional or minimize):
+        # workers in other processes cannot fill the in-memory cache of this process.
+        cache = memory_cache
+
+        def _fill_memory_cache(done: Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                cache.put(
+                    formula, backend_id, method_name, backend_options, done.result()
+                )
+
+        future.add_done_callback(_fill_memory_cache)
+    return future
+
+
+def _submit_all(
+    pool: Executor, formulas: Iterable[Formula], translate_args: Tuple
+) -> Dict[Future, Formula]:
+    """Submit the translation of each formula, with the arguments of _translate."""
+    is_process_pool = isinstance(pool, ProcessPoolExecutor)
+    futures: Dict[Future, Formula] = {}
+    for formula in formulas:
+        if is_process_pool:
+            future = _submit_to_process_pool(pool, formula, translate_args)
+        else:
+            future = pool.submit(_translate, formula, *translate_args)
+        futures[future] = formula
+    return futures
+
+
+def _batch_call_method(
+    formulas: Iterable[Formula],
+    backend_id: str,
+    method_name: str,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    Call a method on many formulas, concurrently.
+
+    Each formula is translated as by the single-formula translators
+    (see _translate). Duplicated formulas are translated only once.
+    """
+    pool = _make_executor(executor, max_workers)
+    formulas = list(formulas)
+    nb_occurrences = Counter(formulas)
+    translate_args = (
+        backend_id,
+        method_name,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+    futures = _submit_all(pool, nb_occurrences.keys(), translate_args)
+    results: Dict[Formula, DFA] = {}
+
+    def _collect(future: Future) -> Tuple[Formula, DFA]:
+        formula = futures[future]
+        automaton = future.result()
+        results[formula] = automaton
+        return formula, automaton
+
+    try:
+        if ordered:
+            formula_to_future = {formula: future for future, formula in futures.items()}
+            for formula in formulas:
+                if formula in results:
+                    yield formula, copy_automaton(results[formula])
+                else:
+                    yield _collect(formula_to_future[formula])
+        else:
+            for future in as_completed(futures):
+                formula, automaton = _collect(future)
+                yield formula, automaton
+                for _ in range(1, nb_occurrences[formula]):
+                    yield formula, copy_automaton(automaton)
+    finally:
+        for future in futures:
+            future.cancel()
+        if pool is not executor:
+            pool.shutdown()
 
 
 def ltl2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From LTL to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, ltl2dfa.__name__, **backend_options)
+    return _translate(
+        formula,
+        backend,
+        ltl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
 
 
 def ldl2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From LDL to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, ldl2dfa.__name__, **backend_options)
+    return _translate(
+        formula,
+        backend,
+        ldl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
 
 
 def pltl2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From PLTL to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, pltl2dfa.__name__, **backend_options)
+    return _translate(
+        formula,
+        backend,
+        pltl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
 
 
 def pldl2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From PLDL to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, pldl2dfa.__name__, **backend_options)
+    return _translate(
+        formula,
+        backend,
+        pldl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
 
 
 def fol2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From FOL to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, fol2dfa.__name__, **backend_options)
+    return _translate(
+        formula,
+        backend,
+        fol2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
 
 
 def mso2dfa(
-    formula: Formula, backend: str = _DEFAULT_BACKEND, **backend_options
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
 ) -> DFA:
     """
     From MSO to DFA.
 
     :param formula: the formula to translate.
     :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return _translate(
+        formula,
+        backend,
+        mso2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+def ltl2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many LTL formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        ltl2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+def ldl2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many LDL formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        ldl2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+def pltl2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many PLTL formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        pltl2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+def pldl2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many PLDL formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        pldl2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+def fol2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many FOL formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        fol2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+def mso2dfa_batch(
+    formulas: Iterable[Formula],
+    backend: str = _DEFAULT_BACKEND,
+    max_workers: Optional[int] = None,
+    executor: Union[str, Executor] = "thread",
+    ordered: bool = True,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> Iterator[Tuple[Formula, DFA]]:
+    """
+    From many MSO formulas to DFAs, concurrently.
+
+    :param formulas: the formulas to translate.
+    :param backend: the backend to use.
+    :param max_workers: the maximum number of concurrent translations.
+    :param executor: 'thread', 'process', or an executor instance.
+    :param ordered: if True, yield the results in input order;
+      otherwise, as soon as they complete.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFAs; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formulas before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: an iterator over the pairs (formula, DFA).
+    """
+    return _batch_call_method(
+        formulas,
+        backend,
+        mso2dfa.__name__,
+        max_workers=max_workers,
+        executor=executor,
+        ordered=ordered,
+        use_cache=use_cache,
+        compositional=compositional,
+        split_disjunctions=split_disjunctions,
+        minimize=minimize,
+        simplify=simplify,
+        **backend_options,
+    )
+
+
+async def altl2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From LTL to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return await _atranslate(
+        formula,
+        backend,
+        ltl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+async def aldl2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From LDL to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return await _atranslate(
+        formula,
+        backend,
+        ldl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+async def apltl2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From PLTL to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return await _atranslate(
+        formula,
+        backend,
+        pltl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+async def apldl2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From PLDL to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return await _atranslate(
+        formula,
+        backend,
+        pldl2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+async def afol2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From FOL to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
+    :param backend_options: options to pass to the backend.
+    :return: the DFA.
+    """
+    return await _atranslate(
+        formula,
+        backend,
+        fol2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
+
+
+async def amso2dfa(
+    formula: Formula,
+    backend: str = _DEFAULT_BACKEND,
+    use_cache: bool = True,
+    compositional: bool = False,
+    split_disjunctions: bool = False,
+    minimize: bool = False,
+    simplify: bool = False,
+    **backend_options,
+) -> DFA:
+    """
+    From MSO to DFA, asynchronously.
+
+    :param formula: the formula to translate.
+    :param backend: the backend to use.
+    :param use_cache: whether to use the translation caches, if enabled.
+    :param compositional: whether to translate the top-level conjuncts
+      separately, and to combine their DFAs by products.
+    :param split_disjunctions: in compositional mode,
+      whether to split the top-level disjunctions too.
+    :param minimize: whether to minimize the DFA; see logaut.automata.minimize.
+    :param simplify: whether to simplify the formula before the translation;
+      see logaut.simplify.simplify.
     :param backend_options: options to pass to the backend.
     :return: the DFA.
     """
-    return _call_method(formula, backend, mso2dfa.__name__, **backend_options)
+    return await _atranslate(
+        formula,
+        backend,
+        mso2dfa.__name__,
+        use_cache,
+        compositional,
+        split_disjunctions,
+        minimize,
+        simplify,
+        backend_options,
+    )
@@ -40,3 +40,19 @@ class BadLogicFormulaException(LogautException):
         """Initialize the exception."""
         format_args = dict(method_name=method_name, expected=expected, actual=actual)
         super().__init__(self.__ERROR_MSG.format(**format_args))
+
+
+class ResourceLimitException(LogautException):
+    """Raise this exception when a translation exceeds a resource limit."""
+
+
+class TimeLimitException(ResourceLimitException):
+    """Raise this exception when a translation takes longer than allowed."""
+
+
+class MemoryLimitException(ResourceLimitException):
+    """Raise this exception when a translation uses more memory than allowed."""
+
+
+class StateLimitException(ResourceLimitException):
+    """Raise this exception when the DFA has more states than allowed."""
@@ -22,10 +22,15 @@
 
 """Helpers module."""
 import contextlib
+import io
+import json
+import pickle  # nosec
 import re
 import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import Any, Dict, Generator, Hashable, Optional, Type
+
+from pylogics.syntax.base import Formula
 
 
 class RegexConstrainedString(str):
@@ -61,15 +66,19 @@ class RegexConstrainedString(str):
 
 
 @contextlib.contextmanager
-def temporary_directory() -> Generator[Path, None, None]:
+def temporary_directory(
+    parent: Optional[str] = None,
+) -> Generator[Path, None, None]:
     """
     Create a temporary directory and clean up when done.
 
     This function is a context manager that creates a temporary directory.
     It wraps tempfile.TemporaryDirectory in order to make the clean up more robust
     (e.g. managing a PermissionError in Windows: https://www.scivision.dev/python-tempfile-permission-error-windows/).
+
+    :param parent: the directory where to create it; by default, the system one.
     """
-    temp_dir = tempfile.TemporaryDirectory()
+    temp_dir = tempfile.TemporaryDirectory(dir=parent)
     temp_path = Path(temp_dir.name)
 
     yield temp_path
@@ -79,3 +88,57 @@ def temporary_directory() -> Generator[Path, None, None]:
         temp_dir.cleanup()
     except PermissionError:
         pass
+
+
+def make_options_key(options: Dict[str, Any]) -> Hashable:
+    """
+    Get a hashable key that identifies a set of keyword options.
+
+    When all the values are hashable, the key is the sorted tuple of the items;
+    otherwise, it falls back to a canonical JSON representation.
+
+    :param options: the keyword options.
+    :return: the key.
+    """
+    key = tuple(sorted(options.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return json.dumps(options, sort_keys=True, default=repr)
+    return key
+
+
+def _restore_formula(cls: Type[Formula], state: Dict[str, Any]) -> Formula:
+    """Restore a formula serialized by 'dump_formula'."""
+    formula = object.__new__(cls)
+    formula.__dict__.update(state)
+    return formula
+
+
+class _FormulaPickler(pickle.Pickler):
+    """
+    A pickler for formulas.
+
+    The pickling support of pylogics formulas is broken (their '__getstate__'
+    tries to drop the memoized hash twice), so they are reduced to their
+    class and their state, without the memoized hash.
+    """
+
+    def reducer_override(self, obj):
+        """Reduce formulas to their class and their state."""
+        if isinstance(obj, Formula):
+            state = {k: v for k, v in vars(obj).items() if k != "__hash"}
+            return _restore_formula, (type(obj), state)
+        return NotImplemented
+
+
+def dump_formula(formula: Formula) -> bytes:
+    """
+    Serialize a formula, e.g. to send it to another process.
+
+    :param formula: the formula.
+    :return: the serialized formula; use 'pickle.loads' to restore it.
+    """
+    buffer = io.BytesIO()
+    _FormulaPickler(buffer).dump(formula)
+    return buffer.getvalue()
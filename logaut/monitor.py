@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Runtime monitors with RV-LTL verdicts.
+
+A monitor reads a trace one symbol at a time and, after each symbol,
+tells whether the trace read so far is accepted and whether that may still
+change in the future. The verdict of each state of the DFA is computed once:
+a state is permanently satisfied if it can only reach accepting states,
+permanently violated if it cannot reach any accepting state.
+
+This module requires NumPy.
+"""
+from collections import deque
+from enum import Enum
+from typing import Deque, Optional, Sequence
+
+import numpy as np
+from pythomata.core import DFA
+from pythomata.impl.symbolic import PropositionalInterpretation
+
+from logaut.automata.compact import CompactDFA, to_compact
+
+
+class Verdict(Enum):
+    """The RV-LTL verdicts."""
+
+    PERMANENTLY_SATISFIED = "permanently_satisfied"
+    PERMANENTLY_VIOLATED = "permanently_violated"
+    CURRENTLY_TRUE = "currently_true"
+    CURRENTLY_FALSE = "currently_false"
+
+    @property
+    def is_final(self) -> bool:
+        """Check whether the verdict cannot change anymore."""
+        return self in (Verdict.PERMANENTLY_SATISFIED, Verdict.PERMANENTLY_VIOLATED)
+
+
+def _backward_reachable(table: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Compute the states that can reach some target state.
+
+    :param table: the transition table, state x class -> state; the last row
+      is the sink state, that represents the missing transitions.
+    :param targets: the boolean array of the target states.
+    :return: the boolean array of the states that can reach a target state.
+    """
+    nb_states = len(table)
+    sources = np.repeat(np.arange(nb_states), table.shape[1])
+    destinations = table.ravel() % nb_states
+    order = np.argsort(destinations, kind="stable")
+    predecessors = sources[order]
+    bounds = np.searchsorted(destinations[order], np.arange(nb_states + 1))
+    reachable = targets.copy()
+    queue: Deque[int] = deque(np.flatnonzero(targets).tolist())
+    while queue:
+        state = queue.popleft()
+        start, end = bounds[state], bounds[state + 1]
+        for predecessor in predecessors[start:end].tolist():
+            if not reachable[predecessor]:
+                reachable[predecessor] = True
+                queue.append(predecessor)
+    return reachable
+
+
+def compute_verdicts(automaton: CompactDFA) -> Sequence[Verdict]:
+    """
+    Compute the verdict of each state of a DFA.
+
+    :param automaton: the DFA.
+    :return: the verdicts, indexed by state.
+    """
+    table = automaton.table.astype(np.int64)
+    nb_states = len(table)
+    # add a rejecting sink, as the target of the missing transitions.
+    table = np.vstack([table, np.full((1, table.shape[1]), -1)])
+    table[table < 0] = nb_states
+    accepting = np.append(automaton.accepting_bitmap, False)
+    can_accept = _backward_reachable(table, accepting)
+    can_reject = _backward_reachable(table, ~accepting)
+    verdicts = []
+    for state in range(nb_states):
+        if not can_accept[state]:
+            verdicts.append(Verdict.PERMANENTLY_VIOLATED)
+        elif not can_reject[state]:
+            verdicts.append(Verdict.PERMANENTLY_SATISFIED)
+        elif accepting[state]:
+            verdicts.append(Verdict.CURRENTLY_TRUE)
+        else:
+            verdicts.append(Verdict.CURRENTLY_FALSE)
+    return verdicts
+
+
+class Monitor:
+    """
+    An incremental monitor of a DFA.
+
+    Each step is a constant-time table lookup; once the verdict is final,
+    it is kept, but the run still follows the following symbols.
+    """
+
+    __slots__ = ("_automaton", "_verdicts", "_state", "_verdict")
+
+    def __init__(self, automaton: DFA) -> None:
+        """
+        Initialize the monitor.
+
+        :param automaton: the DFA, in any representation supported by
+          logaut.automata.compact.to_compact, e.g. the DFA returned by ltl2dfa.
+        """
+        self._automaton = to_compact(automaton)
+        self._verdicts = compute_verdicts(self._automaton)
+        self._state = self._automaton.initial_state
+        self._verdict = self._verdicts[self._state]
+
+    @property
+    def automaton(self) -> CompactDFA:
+        """Get the monitored DFA."""
+        return self._automaton
+
+    @property
+    def state(self) -> Optional[int]:
+        """Get the current state, or None if the run got stuck."""
+        return self._state if self._state >= 0 else None
+
+    @property
+    def verdict(self) -> Verdict:
+        """Get the current verdict."""
+        return self._verdict
+
+    def reset(self) -> Verdict:
+        """
+        Restart monitoring from the initial state.
+
+        :return: the verdict on the empty trace.
+        """
+        self._state = self._automaton.initial_state
+        self._verdict = self._verdicts[self._state]
+        return self._verdict
+
+    def step_valuation(self, valuation: int) -> Verdict:
+        """
+        Read a symbol packed into a bit-mask.
+
+        :param valuation: the bit-mask, as built by CompactDFA.encode.
+        :return: the new verdict.
+        """
+        if self._state < 0:
+            # the run got stuck: it stays in the rejecting sink state.
+            return self._verdict
+        self._state = self._automaton.step(self._state, valuation)
+        if not self._verdict.is_final:
+            # a missing transition leads to a rejecting sink state.
+            self._verdict = (
+                self._verdicts[self._state]
+                if self._state >= 0
+                else Verdict.PERMANENTLY_VIOLATED
+            )
+        return self._verdict
+
+    def step(self, symbol: PropositionalInterpretation) -> Verdict:
+        """
+        Read a symbol.
+
+        :param symbol: the propositional interpretation, e.g. {"a": True};
+          missing propositions are assumed to be false.
+        :return: the new verdict.
+        """
+        if self._state < 0:
+            return self._verdict
+        return self.step_valuation(self._automaton.encode(symbol))
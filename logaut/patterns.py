@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Direct construction of the DFAs of simple formulas.
+
+The DFAs of temporal-free formulas, and of common patterns whose arguments
+are temporal-free, e.g. 'F(a)', 'G(a | b)', 'a U b' or 'G(a -> F(b))',
+have a few states, with the arguments as guards. They are built in-process,
+without calling any backend.
+
+The LTLf formulas are evaluated at the first instant: on the empty trace,
+the atoms and 'true' are false. The PLTLf formulas are evaluated
+at the last instant: the empty trace is rejected.
+"""
+from functools import singledispatch
+from typing import Dict, List, Optional, Set, Tuple
+
+from pylogics.syntax.base import (
+    AbstractAtomic,
+    And,
+    Equivalence,
+    FalseFormula,
+    Formula,
+    Implies,
+    Logic,
+    Not,
+    Or,
+    TrueFormula,
+)
+from pylogics.syntax.ltl import (
+    Always,
+    Eventually,
+    Next,
+    PropositionalTrue,
+    Release,
+    StrongRelease,
+    Until,
+    WeakNext,
+    WeakUntil,
+)
+from pylogics.syntax.pltl import Before, Historically, Once, Since
+
+from logaut.automata.bdd import BDD, BDDDFA, BDDManager
+
+"""The transitions of a DFA: start state, guard, end state."""
+_Transitions = List[Tuple[int, BDD, int]]
+
+
+def build_dfa(formula: Formula) -> Optional[BDDDFA]:
+    """
+    Build the DFA of a simple formula directly.
+
+    :param formula: the formula.
+    :return: the DFA, with a dedicated BDD manager,
+      or None if the formula is not simple.
+    """
+    manager = BDDManager()
+    guard = _to_guard(formula, manager)
+    if guard is None:
+        return _build(formula, manager)
+    if formula.logic == Logic.PLTL:
+        return _make_dfa(manager, {1}, _last_instant(guard, manager))
+    accepting = {0, 1} if _holds_at_end(formula) else {1}
+    transitions = [
+        (0, guard, 1),
+        (0, ~guard, 2),
+        (1, manager.true, 1),
+        (2, manager.true, 2),
+    ]
+    return _make_dfa(manager, accepting, transitions)
+
+
+def _make_dfa(
+    manager: BDDManager, accepting: Set[int], transitions: _Transitions
+) -> BDDDFA:
+    """Make a DFA, with initial state 0, keeping only its reachable states."""
+    outgoing: Dict[int, Dict[int, BDD]] = {}
+    for start, guard, end in transitions:
+        if guard.is_satisfiable():
+            targets = outgoing.setdefault(start, {})
+            targets[end] = targets[end] | guard if end in targets else guard
+    index = {0: 0}
+    queue = [0]
+    while queue:
+        for end in outgoing.get(queue.pop(), {}):
+            if end not in index:
+                index[end] = len(index)
+                queue.append(end)
+    return BDDDFA(
+        len(index),
+        0,
+        {index[state] for state in accepting if state in index},
+        {
+            index[start]: {index[end]: guard for end, guard in targets.items()}
+            for start, targets in outgoing.items()
+            if start in index
+        },
+        manager,
+    )
+
+
+@singledispatch
+def _to_guard(formula: Formula, manager: BDDManager) -> Optional[BDD]:
+    """
+    Get the guard of a temporal-free formula, i.e. its value at an instant.
+
+    :param formula: the formula.
+    :param manager: the BDD manager.
+    :return: the guard, or None if the formula is not temporal-free.
+    """
+    return None
+
+
+@_to_guard.register
+def _(formula: AbstractAtomic, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of an atomic proposition."""
+    return manager.var(formula.name)
+
+
+@_to_guard.register
+def _(_formula: TrueFormula, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of 'true'."""
+    return manager.true
+
+
+@_to_guard.register
+def _(_formula: FalseFormula, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of 'false'."""
+    return manager.false
+
+
+@_to_guard.register
+def _(formula: Not, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of a negation."""
+    argument = _to_guard(formula.argument, manager)
+    return None if argument is None else ~argument
+
+
+def _operand_guards(formula: Formula, manager: BDDManager) -> Optional[List[BDD]]:
+    """Get the guards of the operands of a binary operation, if all temporal-free."""
+    guards = []
+    for operand in formula.operands:
+        guard = _to_guard(operand, manager)
+        if guard is None:
+            return None
+        guards.append(guard)
+    return guards
+
+
+@_to_guard.register
+def _(formula: And, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of a conjunction."""
+    guards = _operand_guards(formula, manager)
+    if guards is None:
+        return None
+    result = manager.true
+    for guard in guards:
+        result = result & guard
+    return result
+
+
+@_to_guard.register
+def _(formula: Or, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of a disjunction."""
+    guards = _operand_guards(formula, manager)
+    if guards is None:
+        return None
+    result = manager.false
+    for guard in guards:
+        result = result | guard
+    return result
+
+
+@_to_guard.register
+def _(formula: Implies, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of an implication, associating to the right."""
+    guards = _operand_guards(formula, manager)
+    if guards is None:
+        return None
+    result = guards[-1]
+    for guard in reversed(guards[:-1]):
+        result = ~guard | result
+    return result
+
+
+@_to_guard.register
+def _(formula: Equivalence, manager: BDDManager) -> Optional[BDD]:
+    """Get the guard of an equivalence, i.e. all the operands have the same value."""
+    guards = _operand_guards(formula, manager)
+    if guards is None:
+        return None
+    all_true, all_false = manager.true, manager.true
+    for guard in guards:
+        all_true, all_false = all_true & guard, all_false & ~guard
+    return all_true | all_false
+
+
+@singledispatch
+def _holds_at_end(formula: Formula) -> bool:
+    """Evaluate a temporal-free LTLf formula at the end of a trace."""
+    raise ValueError(f"formula {formula} is not temporal-free")
+
+
+@_holds_at_end.register
+def _(_formula: AbstractAtomic) -> bool:
+    """Evaluate an atomic proposition: it is false."""
+    return False
+
+
+@_holds_at_end.register
+def _(formula: TrueFormula) -> bool:
+    """Evaluate 'tt', that is true, or 'true', that needs an instant."""
+    return not isinstance(formula, PropositionalTrue)
+
+
+@_holds_at_end.register
+def _(_formula: FalseFormula) -> bool:
+    """Evaluate 'false'."""
+    return False
+
+
+@_holds_at_end.register
+def _(formula: Not) -> bool:
+    """Evaluate a negation."""
+    return not _holds_at_end(formula.argument)
+
+
+@_holds_at_end.register
+def _(formula: And) -> bool:
+    """Evaluate a conjunction."""
+    return all(map(_holds_at_end, formula.operands))
+
+
+@_holds_at_end.register
+def _(formula: Or) -> bool:
+    """Evaluate a disjunction."""
+    return any(map(_holds_at_end, formula.operands))
+
+
+@_holds_at_end.register
+def _(formula: Implies) -> bool:
+    """Evaluate an implication, associating to the right."""
+    values = [_holds_at_end(operand) for operand in formula.operands]
+    result = values[-1]
+    for value in reversed(values[:-1]):
+        result = not value or result
+    return result
+
+
+@_holds_at_end.register
+def _(formula: Equivalence) -> bool:
+    """Evaluate an equivalence."""
+    return len(set(map(_holds_at_end, formula.operands))) == 1
+
+
+def _last_instant(guard: BDD, manager: BDDManager, rejecting: int = 0) -> _Transitions:
+    """
+    Get the transitions of 'the last instant satisfies the guard'.
+
+    :param guard: the guard.
+    :param manager: the BDD manager.
+    :param rejecting: the state where the guard is not satisfied;
+      where it is, the state is 1.
+    :return: the transitions from both states.
+    """
+    return [
+        (rejecting, guard, 1),
+        (rejecting, ~guard, rejecting),
+        (1, guard, 1),
+        (1, ~guard, rejecting),
+    ]
+
+
+def _argument_guards(formula: Formula, manager: BDDManager) -> Optional[List[BDD]]:
+    """Get the guards of the arguments of a temporal operator, if temporal-free."""
+    if isinstance(formula, (And, Or, Implies, Equivalence)):
+        return None
+    operands = getattr(formula, "operands", None)
+    if operands is None:
+        operands = (formula.argument,)
+    elif len(operands) != 2:
+        return None
+    guards = [_to_guard(operand, manager) for operand in operands]
+    return None if None in guards else guards  # type: ignore
+
+
+@singledispatch
+def _build(formula: Formula, manager: BDDManager) -> Optional[BDDDFA]:
+    """
+    Build the DFA of a pattern.
+
+    :param formula: the formula.
+    :param manager: the BDD manager.
+    :return: the DFA, or None if the formula is not a pattern.
+    """
+    return None
+
+
+@_build.register(Eventually)
+@_build.register(Always)
+@_build.register(Next)
+@_build.register(WeakNext)
+@_build.register(Once)
+@_build.register(Historically)
+@_build.register(Before)
+def _(formula: Formula, manager: BDDManager) -> Optional[BDDDFA]:
+    """Build the DFA of a unary operator on a temporal-free formula, e.g. 'F(a)'."""
+    if isinstance(formula, (Eventually, Always)):
+        nested = _build_nested(formula, manager)
+        if nested is not None:
+            return nested
+    guards = _argument_guards(formula, manager)
+    if guards is None:
+        return None
+    accepting, transitions = _UNARY_PATTERNS[type(formula)](guards[0], manager)
+    return _make_dfa(manager, accepting, transitions)
+
+
+@_build.register(Until)
+@_build.register(Release)
+@_build.register(WeakUntil)
+@_build.register(StrongRelease)
+@_build.register(Since)
+def _(formula: Formula, manager: BDDManager) -> Optional[BDDDFA]:
+    """Build the DFA of a binary operator on temporal-free formulas, e.g. 'a U b'."""
+    guards = _argument_guards(formula, manager)
+    if guards is None:
+        return None
+    first, second = guards
+    accepting, transitions = _BINARY_PATTERNS[type(formula)](first, second, manager)
+    return _make_dfa(manager, accepting, transitions)
+
+
+def _build_nested(formula: Formula, manager: BDDManager) -> Optional[BDDDFA]:
+    """Build the DFA of 'G(F(a))', 'F(G(a))' or 'G(a -> F(b))'."""
+    argument = formula.argument  # type: ignore
+    if isinstance(argument, (Eventually, Always)) and type(argument) is not type(
+        formula
+    ):
+        # in LTLf, both hold iff the last instant satisfies the argument,
+        # but only 'G(F(a))' holds on the empty trace.
+        guards = _argument_guards(argument, manager)
+        if guards is None:
+            return None
+        p = guards[0]
+        transitions = [(0, p, 1), (0, ~p, 2)] + _last_instant(p, manager, 2)
+        accepting = {0, 1} if isinstance(formula, Always) else {1}
+        return _make_dfa(manager, accepting, transitions)
+    if (
+        isinstance(formula, Always)
+        and isinstance(argument, Implies)
+        and len(argument.operands) == 2
+        and isinstance(argument.operands[1], Eventually)
+    ):
+        trigger = _to_guard(argument.operands[0], manager)
+        response = _to_guard(argument.operands[1].argument, manager)
+        if trigger is None or response is None:
+            return None
+        transitions = [
+            (0, trigger & ~response, 1),
+            (0, ~trigger | response, 0),
+            (1, response, 0),
+            (1, ~response, 1),
+        ]
+        return _make_dfa(manager, {0}, transitions)
+    return None
+
+
+def _eventually(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'F(p)'."""
+    return {1}, [(0, p, 1), (0, ~p, 0), (1, manager.true, 1)]
+
+
+def _always(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'G(p)'."""
+    return {0}, [(0, p, 0), (0, ~p, 1), (1, manager.true, 1)]
+
+
+def _next(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'X[!](p)'."""
+    true = manager.true
+    return {2}, [(0, true, 1), (1, p, 2), (1, ~p, 3), (2, true, 2), (3, true, 3)]
+
+
+def _weak_next(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'X(p)'."""
+    true = manager.true
+    transitions = [(0, true, 1), (1, p, 2), (1, ~p, 3), (2, true, 2), (3, true, 3)]
+    return {0, 1, 2}, transitions
+
+
+def _once(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'O(p)'."""
+    return {1}, [(0, p, 1), (0, ~p, 0), (1, manager.true, 1)]
+
+
+def _historically(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'H(p)'."""
+    transitions = [(0, p, 1), (0, ~p, 2), (1, p, 1), (1, ~p, 2), (2, manager.true, 2)]
+    return {1}, transitions
+
+
+def _before(p: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """
+    Get the DFA of 'Y(p)'.
+
+    The state is the pair (whether the previous instant satisfies p,
+    whether the current one does), numbered as a 2-bit integer.
+    """
+    transitions = []
+    for state in range(4):
+        current = (state & 1) << 1
+        transitions += [(state, p, current | 1), (state, ~p, current)]
+    return {2, 3}, transitions
+
+
+def _until(p: BDD, q: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'p U q'."""
+    transitions = [
+        (0, q, 1),
+        (0, p & ~q, 0),
+        (0, ~p & ~q, 2),
+        (1, manager.true, 1),
+        (2, manager.true, 2),
+    ]
+    return {1}, transitions
+
+
+def _weak_until(p: BDD, q: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'p W q'."""
+    return {0, 1}, _until(p, q, manager)[1]
+
+
+def _release(p: BDD, q: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'p R q', i.e. 'q W (p & q)'."""
+    return _weak_until(q, p & q, manager)
+
+
+def _strong_release(
+    p: BDD, q: BDD, manager: BDDManager
+) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'p M q', i.e. 'q U (p & q)'."""
+    return _until(q, p & q, manager)
+
+
+def _since(p: BDD, q: BDD, manager: BDDManager) -> Tuple[Set[int], _Transitions]:
+    """Get the DFA of 'p S q'."""
+    transitions = [(0, q, 1), (0, ~q, 0), (1, p | q, 1), (1, ~p & ~q, 0)]
+    return {1}, transitions
+
+
+_UNARY_PATTERNS = {
+    Eventually: _eventually,
+    Always: _always,
+    Next: _next,
+    WeakNext: _weak_next,
+    Once: _once,
+    Historically: _historically,
+    Before: _before,
+}
+_BINARY_PATTERNS = {
+    Until: _until,
+    WeakUntil: _weak_until,
+    Release: _release,
+    StrongRelease: _strong_release,
+    Since: _since,
+}
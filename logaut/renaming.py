@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Renaming of the atoms of formulas.
+
+Two formulas are alpha-equivalent if one is obtained from the other
+by an injective renaming of its atoms, e.g. 'G(a -> F(b))' and 'G(c -> F(d))'.
+Their DFAs are the same, up to the names of the variables of the guards;
+see logaut.automata.relabel.
+"""
+from functools import singledispatch
+from typing import Dict, Hashable, Mapping, Tuple
+
+from pylogics.syntax.base import AbstractAtomic, Formula, _BinaryOp, _UnaryOp
+from pylogics.syntax.ldl import _TemporalFormula
+
+
+@singledispatch
+def rename_atoms(formula: Formula, mapping: Mapping[str, str]) -> Formula:
+    """
+    Rename the atoms of a formula.
+
+    The atoms are renamed simultaneously, so e.g. two atoms can be swapped.
+    The atoms not in the mapping keep their name.
+
+    :param formula: the formula.
+    :param mapping: the new name of each atom to rename.
+    :return: the renamed formula.
+    """
+    return formula
+
+
+@rename_atoms.register
+def _(formula: AbstractAtomic, mapping: Mapping[str, str]) -> Formula:
+    """Rename an atomic proposition."""
+    return type(formula)(mapping.get(formula.name, formula.name))
+
+
+@rename_atoms.register
+def _(formula: _UnaryOp, mapping: Mapping[str, str]) -> Formula:
+    """Rename the atoms of a unary operation."""
+    return type(formula)(rename_atoms(formula.argument, mapping))
+
+
+@rename_atoms.register
+def _(formula: _BinaryOp, mapping: Mapping[str, str]) -> Formula:
+    """Rename the atoms of a binary operation."""
+    return type(formula)(*(rename_atoms(op, mapping) for op in formula.operands))
+
+
+@rename_atoms.register
+def _(formula: _TemporalFormula, mapping: Mapping[str, str]) -> Formula:
+    """Rename the atoms of an LDLf diamond or box."""
+    return type(formula)(
+        rename_atoms(formula.regular_expression, mapping),
+        rename_atoms(formula.tail_formula, mapping),
+    )
+
+
+@singledispatch
+def _structure(formula: Formula, atoms: Dict[str, int]) -> Hashable:
+    """Get the structure of a formula, with the atoms numbered by first occurrence."""
+    return (type(formula),)
+
+
+@_structure.register
+def _(formula: AbstractAtomic, atoms: Dict[str, int]) -> Hashable:
+    """Get the structure of an atomic proposition: its number."""
+    return atoms.setdefault(formula.name, len(atoms))
+
+
+@_structure.register
+def _(formula: _UnaryOp, atoms: Dict[str, int]) -> Hashable:
+    """Get the structure of a unary operation."""
+    return type(formula), _structure(formula.argument, atoms)
+
+
+@_structure.register
+def _(formula: _BinaryOp, atoms: Dict[str, int]) -> Hashable:
+    """Get the structure of a binary operation."""
+    return (type(formula), *(_structure(op, atoms) for op in formula.operands))
+
+
+@_structure.register
+def _(formula: _TemporalFormula, atoms: Dict[str, int]) -> Hashable:
+    """Get the structure of an LDLf diamond or box."""
+    return (
+        type(formula),
+        _structure(formula.regular_expression, atoms),
+        _structure(formula.tail_formula, atoms),
+    )
+
+
+def canonicalize(formula: Formula) -> Tuple[Hashable, Tuple[str, ...]]:
+    """
+    Get a key of a formula that does not depend on the names of its atoms.
+
+    The atoms are numbered in order of first occurrence. Hence, alpha-equivalent
+    formulas built in the same way, e.g. by the same parser from the same
+    template, have the same key; formulas with the same key are alpha-equivalent.
+
+    :param formula: the formula.
+    :return: the key, and the atoms of the formula, in order of number.
+    """
+    atoms: Dict[str, int] = {}
+    key = formula.logic, _structure(formula, atoms)
+    return key, tuple(atoms)
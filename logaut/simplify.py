@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Simplification of formulas, before their translation.
+
+The rewrite rules preserve the semantics on finite traces. Hence, some
+familiar rules are not applied: e.g. in LTLf, 'true' holds only at the
+instants of the trace, so 'true & G(a)' is not 'G(a)' (the latter holds
+at the end of the trace), while 'true & a' is 'a'.
+
+Besides the rules applied by the pylogics constructors of conjunctions
+and disjunctions (flattening, deduplication, constant folding and
+'a & !a'), the simplifier applies:
+
+- constant folding through the temporal operators, e.g. 'F(ff)' is 'ff';
+- idempotence, e.g. 'F(F(a))' is 'F(a)', and 'a U (a U b)' is 'a U b';
+- absorption, e.g. 'a & (a | b)' is 'a';
+- distribution, to merge operands, e.g. 'F(a) | F(b)' is 'F(a | b)'
+  and 'G(a) & G(b)' is 'G(a & b)'.
+"""
+from dataclasses import dataclass
+from functools import singledispatch
+from typing import Dict, List, Tuple, Type
+
+from pylogics.syntax.base import (
+    And,
+    FalseFormula,
+    Formula,
+    Implies,
+    Not,
+    Or,
+    TrueFormula,
+    _BinaryOp,
+    _UnaryOp,
+    make_boolean,
+)
+from pylogics.syntax.ldl import Box, Diamond, _TemporalFormula
+from pylogics.syntax.ltl import Always
+from pylogics.syntax.ltl import Atomic as LTLAtomic
+from pylogics.syntax.ltl import Eventually, Next
+from pylogics.syntax.ltl import PropositionalFalse as LTLPropositionalFalse
+from pylogics.syntax.ltl import PropositionalTrue as LTLPropositionalTrue
+from pylogics.syntax.ltl import StrongRelease, Until, WeakNext
+from pylogics.syntax.pltl import Before, Historically, Once
+from pylogics.syntax.pltl import PropositionalTrue as PLTLPropositionalTrue
+
+"""The operators that distribute over conjunctions, and over disjunctions."""
+_DISTRIBUTIVE: Dict[Type[Formula], Tuple[Type[Formula], ...]] = {
+    And: (Always, Next, WeakNext, Historically, Before),
+    Or: (Eventually, Next, WeakNext, Once, Before),
+}
+
+_Memo = Dict[Formula, Formula]
+
+
+@dataclass(frozen=True)
+class SimplificationStats:
+    """The sizes of a formula, before and after the simplification."""
+
+    original_size: int
+    simplified_size: int
+
+    @property
+    def reduction(self) -> float:
+        """Get the fraction of the nodes removed by the simplification."""
+        return 1.0 - self.simplified_size / self.original_size
+
+
+@singledispatch
+def formula_size(formula: Formula) -> int:
+    """
+    Compute the size of a formula, i.e. the number of nodes of its syntax tree.
+
+    :param formula: the formula.
+    :return: the size.
+    """
+    return 1
+
+
+@formula_size.register(_UnaryOp)
+def _(formula: _UnaryOp) -> int:
+    """Compute the size of a unary operation."""
+    return 1 + formula_size(formula.argument)
+
+
+@formula_size.register(_BinaryOp)
+def _(formula: _BinaryOp) -> int:
+    """Compute the size of a binary operation."""
+    return 1 + sum(map(formula_size, formula.operands))
+
+
+@formula_size.register(_TemporalFormula)
+def _(formula: _TemporalFormula) -> int:
+    """Compute the size of an LDLf diamond or box."""
+    return (
+        1
+        + formula_size(formula.regular_expression)
+        + formula_size(formula.tail_formula)
+    )
+
+
+def simplify(formula: Formula) -> Formula:
+    """
+    Simplify a formula, preserving its semantics.
+
+    :param formula: the formula.
+    :return: the simplified formula.
+    """
+    return _simplify(formula, {})
+
+
+def simplify_with_stats(formula: Formula) -> Tuple[Formula, SimplificationStats]:
+    """
+    Simplify a formula, and measure how much it shrank.
+
+    :param formula: the formula.
+    :return: the simplified formula, and the statistics.
+    """
+    simplified = simplify(formula)
+    return simplified, SimplificationStats(
+        formula_size(formula), formula_size(simplified)
+    )
+
+
+def _simplify(formula: Formula, memo: _Memo) -> Formula:
+    """Simplify a formula, once per distinct subformula."""
+    result = memo.get(formula)
+    if result is None:
+        result = memo[formula] = _rewrite(formula, memo)
+    return result
+
+
+def _is_true(formula: Formula) -> bool:
+    """Check whether a formula holds at every instant, and at the end."""
+    return isinstance(formula, TrueFormula) and not isinstance(
+        formula, LTLPropositionalTrue
+    )
+
+
+def _is_false(formula: Formula) -> bool:
+    """Check whether a formula never holds."""
+    return isinstance(formula, FalseFormula)
+
+
+@singledispatch
+def _needs_instant(formula: Formula) -> bool:
+    """Check whether an LTLf formula can hold only at an instant of the trace."""
+    return False
+
+
+@_needs_instant.register(LTLAtomic)
+@_needs_instant.register(LTLPropositionalTrue)
+@_needs_instant.register(LTLPropositionalFalse)
+@_needs_instant.register(Next)
+@_needs_instant.register(Until)
+@_needs_instant.register(Eventually)
+@_needs_instant.register(StrongRelease)
+def _(_formula: Formula) -> bool:
+    """Check an LTLf formula that can hold only at an instant of the trace."""
+    return True
+
+
+@_needs_instant.register(And)
+def _(formula: And) -> bool:
+    """Check a conjunction."""
+    return any(map(_needs_instant, formula.operands))
+
+
+@_needs_instant.register(Or)
+def _(formula: Or) -> bool:
+    """Check a disjunction."""
+    return all(map(_needs_instant, formula.operands))
+
+
+@singledispatch
+def _rewrite(formula: Formula, memo: _Memo) -> Formula:
+    """
+    Simplify a formula, given the simplified subformulas.
+
+    :param formula: the formula.
+    :param memo: the simplified subformulas.
+    :return: the simplified formula.
+    """
+    return formula
+
+
+@_rewrite.register(_UnaryOp)
+def _(formula: _UnaryOp, memo: _Memo) -> Formula:
+    """Simplify a unary operation, e.g. a negation."""
+    return type(formula)(_simplify(formula.argument, memo))
+
+
+@_rewrite.register(_BinaryOp)
+def _(formula: _BinaryOp, memo: _Memo) -> Formula:
+    """Simplify a binary operation, e.g. an implication."""
+    return type(formula)(*(_simplify(op, memo) for op in formula.operands))
+
+
+@_rewrite.register(_TemporalFormula)
+def _(formula: _TemporalFormula, memo: _Memo) -> Formula:
+    """Simplify an LDLf diamond or box; '<r>ff' is 'ff' and '[r]tt' is 'tt'."""
+    regular_expression = _simplify(formula.regular_expression, memo)
+    tail_formula = _simplify(formula.tail_formula, memo)
+    if isinstance(formula, Diamond) and _is_false(tail_formula):
+        return tail_formula
+    if isinstance(formula, Box) and _is_true(tail_formula):
+        return tail_formula
+    return type(formula)(regular_expression, tail_formula)
+
+
+@_rewrite.register(Not)
+def _(formula: Not, memo: _Memo) -> Formula:
+    """
+    Simplify a negation.
+
+    The pylogics constructor turns '!true' into 'false' and vice versa,
+    which is wrong at the end of an LTLf trace: there, '!true' is 'G(ff)'.
+    """
+    return _negate(_simplify(formula.argument, memo))
+
+
+def _negate(formula: Formula) -> Formula:
+    """Negate a formula, taking care of the LTLf 'true' and 'false'."""
+    if isinstance(formula, LTLPropositionalTrue):
+        return Always(make_boolean(False, formula.logic))
+    if isinstance(formula, LTLPropositionalFalse):
+        return make_boolean(True, formula.logic)
+    return Not(formula)
+
+
+@_rewrite.register(Implies)
+def _(formula: Implies, memo: _Memo) -> Formula:
+    """
+    Simplify an implication, associating to the right.
+
+    The pylogics constructor is not used on constant operands,
+    since it turns 'a -> ff' into 'a -> tt'.
+    """
+    operands = [_constant(_simplify(op, memo)) for op in formula.operands]
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        if _is_false(operand) or _is_true(result):
+            result = make_boolean(True, operand.logic)
+        elif _is_false(result):
+            result = _negate(operand)
+        elif not _is_true(operand):
+            result = Implies(operand, result)
+    return result
+
+
+@_rewrite.register(Eventually)
+@_rewrite.register(Once)
+def _(formula: _UnaryOp, memo: _Memo) -> Formula:
+    """Simplify 'F' and 'O': 'F(ff)' is 'ff', and 'F(F(a))' is 'F(a)'."""
+    argument = _simplify(formula.argument, memo)
+    if _is_false(argument) or isinstance(argument, type(formula)):
+        return argument
+    return type(formula)(argument)
+
+
+@_rewrite.register(Always)
+@_rewrite.register(Historically)
+def _(formula: _UnaryOp, memo: _Memo) -> Formula:
+    """Simplify 'G' and 'H': 'G(true)' is 'tt', and 'G(G(a))' is 'G(a)'."""
+    argument = _simplify(formula.argument, memo)
+    if isinstance(argument, TrueFormula):
+        return make_boolean(True, argument.logic)
+    if isinstance(argument, type(formula)):
+        return argument
+    return type(formula)(argument)
+
+
+@_rewrite.register(Next)
+@_rewrite.register(Before)
+def _(formula: _UnaryOp, memo: _Memo) -> Formula:
+    """Simplify 'X[!]' and 'Y': 'X[!](ff)' is 'ff'."""
+    argument = _simplify(formula.argument, memo)
+    return argument if _is_false(argument) else type(formula)(argument)
+
+
+@_rewrite.register(WeakNext)
+def _(formula: WeakNext, memo: _Memo) -> Formula:
+    """Simplify 'X': 'X(true)' is 'tt'."""
+    argument = _simplify(formula.argument, memo)
+    if isinstance(argument, TrueFormula):
+        return make_boolean(True, argument.logic)
+    return WeakNext(argument)
+
+
+@_rewrite.register(Until)
+def _(formula: Until, memo: _Memo) -> Formula:
+    """Simplify an until, associating to the right."""
+    operands = [_simplify(op, memo) for op in formula.operands]
+    result = operands[-1]
+    for operand in reversed(operands[:-1]):
+        if _is_false(result):
+            continue
+        if isinstance(result, Until) and result.operands[:-1] == (operand,):
+            # 'a U (a U b)' is 'a U b'.
+            continue
+        if isinstance(operand, Until) and operand.operands[1:] == (result,):
+            # '(a U b) U b' is 'a U b'.
+            result = operand
+            continue
+        result = Until(operand, result)
+    return result
+
+
+@_rewrite.register(And)
+@_rewrite.register(Or)
+def _(formula: _BinaryOp, memo: _Memo) -> Formula:
+    """Simplify a conjunction or a disjunction."""
+    operator = type(formula)
+    operands = [_constant(_simplify(op, memo)) for op in formula.operands]
+    # the constructor flattens, deduplicates and folds 'tt' and 'ff'.
+    result = operator(*operands)
+    if not isinstance(result, operator):
+        return result
+    operands = _absorb(list(result.operands), operator)
+    operands = _fold_propositional_true(operands, operator)
+    operands = _distribute(operands, operator, memo)
+    return operator(*operands) if len(operands) > 1 else operands[0]
+
+
+def _absorb(operands: List[Formula], operator: Type[Formula]) -> List[Formula]:
+    """Apply the absorption law: e.g. 'a & (a | b)' is 'a'."""
+    dual = Or if operator is And else And
+    others = set(operands)
+    return [
+        op
+        for op in operands
+        if not (isinstance(op, dual) and any(o in others for o in op.operands))
+    ]
+
+
+def _constant(formula: Formula) -> Formula:
+    """
+    Replace 'true' and 'false' with 'tt' and 'ff', where they are equivalent.
+
+    This is not the case of 'true' in LTLf, which does not hold
+    at the end of the trace.
+    """
+    if _is_false(formula) or isinstance(formula, PLTLPropositionalTrue):
+        return make_boolean(_is_true(formula), formula.logic)
+    return formula
+
+
+def _fold_propositional_true(
+    operands: List[Formula], operator: Type[Formula]
+) -> List[Formula]:
+    """
+    Fold the LTLf 'true' in a conjunction or disjunction.
+
+    It holds at the instants of the trace, but not at its end:
+    e.g. 'true & a' is 'a', since 'a' holds only at an instant,
+    and for the same reason 'true | a' is 'true'.
+    """
+    if not any(isinstance(op, LTLPropositionalTrue) for op in operands):
+        return operands
+    others = [op for op in operands if not isinstance(op, LTLPropositionalTrue)]
+    if operator is And:
+        return others if any(map(_needs_instant, others)) else operands
+    true = next(op for op in operands if isinstance(op, LTLPropositionalTrue))
+    return [true] + [op for op in others if not _needs_instant(op)]
+
+
+def _distribute(
+    operands: List[Formula], operator: Type[Formula], memo: _Memo
+) -> List[Formula]:
+    """Merge the operands with the same distributive unary operator."""
+    for unary in _DISTRIBUTIVE[operator]:
+        arguments = [op.argument for op in operands if type(op) is unary]
+        if len(arguments) < 2:
+            continue
+        merged = _simplify(unary(operator(*arguments)), memo)
+        operands = [op for op in operands if type(op) is not unary] + [merged]
+    return operands
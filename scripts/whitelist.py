@@ -11,22 +11,26 @@ PLDL  # unused variable (/home/marcofavorito/workfolder/logaut/logaut/backends/b
 FOL  # unused variable (/home/marcofavorito/workfolder/logaut/logaut/backends/base.py:42)
 MSO  # unused variable (/home/marcofavorito/workfolder/logaut/logaut/backends/base.py:43)
 LTLf2DFABackend  # unused class (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/core.py:50)
-to_string_and  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:63)
-to_string_or  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:69)
-to_string_not  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:75)
-to_string_implies  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:81)
-to_string_equivalence  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:87)
-to_string_atomic  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:93)
-to_string_true  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:99)
-to_string_false  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:105)
-to_string_next  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:111)
-to_string_weak_next  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:117)
-to_string_until  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:123)
-to_string_weak_until  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:129)
-to_string_release  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:142)
-to_string_strong_release  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:148)
-to_string_eventually  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:160)
-to_string_always  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:166)
+to_ltlf2dfa_and  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:146)
+to_ltlf2dfa_or  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:152)
+to_ltlf2dfa_not  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:158)
+to_ltlf2dfa_implies  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:164)
+to_ltlf2dfa_equivalence  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:170)
+to_ltlf2dfa_atomic  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:176)
+to_ltlf2dfa_true  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:182)
+to_ltlf2dfa_false  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:188)
+to_ltlf2dfa_next  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:194)
+to_ltlf2dfa_weak_next  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:200)
+to_ltlf2dfa_until  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:206)
+to_ltlf2dfa_weak_until  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:212)
+to_ltlf2dfa_release  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:227)
+to_ltlf2dfa_strong_release  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:233)
+to_ltlf2dfa_eventually  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:244)
+to_ltlf2dfa_always  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:250)
+to_ltlf2dfa_before  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:256)
+to_ltlf2dfa_since  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:262)
+to_ltlf2dfa_once  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:268)
+to_ltlf2dfa_historically  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/ltlf2dfa/to_ltlf2dfa_formula.py:274)
 LydiaBackend  # unused class (/home/marcofavorito/workfolder/logaut/logaut/backends/lydia/core.py:40)
 to_string_and  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/lydia/to_lydia_grammar.py:78)
 to_string_or  # unused function (/home/marcofavorito/workfolder/logaut/logaut/backends/lydia/to_lydia_grammar.py:84)
@@ -24,8 +24,13 @@
 import pytest
 from pylogics.syntax.base import reset_cache
 
+import logaut.backends
+
 
 @pytest.fixture(scope="class", autouse=True)
 def reset_cache_fixture():
     """Reset hash-consing global cache after each test function/class call."""
     reset_cache()
+
+
+logaut.backends.register(id_="dummy", entry_point="tests.helpers:DummyBackend")
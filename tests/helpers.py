@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Helpers for the tests."""
+import os
+import stat
+from pathlib import Path
+
+from pylogics.syntax.base import Formula
+from pythomata.core import DFA
+
+from logaut.backends.base import Backend
+from logaut.backends.common.process_mona_output import (
+    parse_automaton,
+    parse_mona_output,
+)
+
+"""The MONA output of the DFA for 'G(a)'."""
+ALWAYS_A_MONA_OUTPUT = """DFA for formula with free variables: a
+Initial state: 0
+Accepting states: 0
+Rejecting states: 1
+
+Automaton has 2 states and 2 BDD-nodes
+Transitions:
+State 0: 1 -> state 0
+State 0: 0 -> state 1
+State 1: X -> state 1
+"""
+
+
+class DummyBackend(Backend):
+    """
+    A backend that always returns the DFA for 'G(a)', without calling any tool.
+
+    It keeps track of the number of translations, so to check caching behaviours.
+    """
+
+    nb_calls = 0
+
+    def ltl2dfa(self, formula: Formula) -> DFA:
+        """From LTL to DFA."""
+        DummyBackend.nb_calls += 1
+        return parse_automaton(parse_mona_output(ALWAYS_A_MONA_OUTPUT))
+
+
+def make_fake_executable(directory: Path, name: str, stdout: str) -> Path:
+    """
+    Make a fake executable that prints a fixed output, and logs its arguments.
+
+    Each invocation appends its arguments as a line to the file '<name>.log'
+    in the same directory.
+
+    :param directory: the directory where to create the executable.
+    :param name: the name of the executable.
+    :param stdout: the text the executable prints on the standard output.
+    :return: the path to the executable.
+    """
+    output_file = directory / f"{name}.out"
+    output_file.write_text(stdout)
+    log_file = directory / f"{name}.log"
+    executable = directory / name
+    executable.write_text(
+        f"""#!/bin/sh\necho "$@" >> '{log_file}'\ncat '{output_file}'\n"""
+    )
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    return executable
+
+
+def prepend_to_path(directory: Path) -> str:
+    """Get the value of PATH with the directory prepended."""
+    return str(directory) + os.pathsep + os.environ.get("PATH", "")
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the DFAs with BDD guards."""
+import itertools
+import pickle  # nosec
+
+import pytest
+from sympy import Symbol
+
+from logaut.automata import from_mona_output, to_mona_output
+from logaut.automata.bdd import BDDDFA, BDDManager
+from logaut.automata.bdd import from_mona_output as bdd_from_mona_output
+from logaut.automata.bdd import get_default_manager, minimize, product
+from logaut.backends.common.process_mona_output import (
+    MONAOutput,
+    parse_automaton,
+    parse_mona_output,
+)
+from logaut.cache import copy_automaton
+from tests.helpers import ALWAYS_A_MONA_OUTPUT
+
+# a DFA over a and b that accepts the traces where 'a and not b' holds at the end.
+_MONA_OUTPUT = MONAOutput(
+    nb_states=3,
+    variable_names=("a", "b"),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0, 2},
+    transitions={
+        0: {1: {"10"}, 2: {"0X", "11"}},
+        1: {1: {"10"}, 2: {"0X", "11"}},
+        2: {1: {"10"}, 2: {"0X", "11"}},
+    },
+)
+
+
+def _words(variable_names, max_length):
+    """Enumerate all the words up to a given length."""
+    symbols = [
+        dict(zip(variable_names, values))
+        for values in itertools.product([False, True], repeat=len(variable_names))
+    ]
+    for length in range(max_length + 1):
+        yield from itertools.product(symbols, repeat=length)
+
+
+@pytest.mark.parametrize(
+    "mona_output", [_MONA_OUTPUT, parse_mona_output(ALWAYS_A_MONA_OUTPUT)]
+)
+def test_bdd_dfa_is_equivalent_to_symbolic_dfa(mona_output):
+    """Test that the BDD and the symbolic representations accept the same words."""
+    bdd_dfa = from_mona_output(mona_output, representation="bdd")
+    symbolic_dfa = parse_automaton(mona_output)
+    assert isinstance(bdd_dfa, BDDDFA)
+    assert bdd_dfa.manager is get_default_manager()
+    for word in _words(mona_output.variable_names, 3):
+        assert bdd_dfa.accepts(word) == symbolic_dfa.accepts(word)
+        assert bdd_dfa.to_symbolic().accepts(word) == symbolic_dfa.accepts(word)
+    assert copy_automaton(bdd_dfa) is bdd_dfa
+
+
+def test_bdd_operations():
+    """Test that equivalent BDDs are the same node."""
+    manager = BDDManager()
+    a, b = manager.var("a"), manager.var("b")
+    guard = manager.from_mona_guards({"0X", "11"}, ("a", "b"))
+    assert guard == ~a | (a & b)
+    assert guard == ~(a & ~b)
+    assert (guard & a & ~b) == manager.false
+    assert not (guard & a & ~b).is_satisfiable()
+    assert (guard | a).is_valid()
+    assert guard.evaluate({"a", "b"})
+    assert not guard.evaluate({"a"})
+    assert (a & ~b).pick() == {"a": True, "b": False}
+    assert manager.false.pick() is None
+    assert guard.to_sympy().equals(~Symbol("a") | Symbol("b"))
+    with pytest.raises(ValueError, match="different managers"):
+        a & BDDManager().var("a")
+
+
+def test_nodes_are_shared():
+    """Test that the guards of different automata share the nodes."""
+    manager = BDDManager()
+    first = manager.from_mona_guards({"1X"}, ("a", "b"))
+    nb_nodes = len(manager)
+    second = manager.from_mona_guards({"X1"}, ("b", "a"))
+    assert first == second
+    assert len(manager) == nb_nodes
+
+
+def test_pickle_manager():
+    """Test that a pickled automaton keeps working."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation="bdd")
+    restored = pickle.loads(pickle.dumps(automaton))  # nosec
+    assert restored.get_successor(0, {"a": True}) == 1
+    assert restored.get_successor(0, {"a": True, "b": True}) == 2
+
+
+def test_to_mona_output():
+    """Test the conversion back into a MONA output."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation="bdd")
+    symbolic_dfa = parse_automaton(to_mona_output(automaton))
+    for word in _words(_MONA_OUTPUT.variable_names, 3):
+        assert symbolic_dfa.accepts(word) == automaton.accepts(word)
+    with pytest.raises(TypeError):
+        to_mona_output(object())
+
+
+@pytest.mark.parametrize("conjunction", [True, False])
+def test_product(conjunction):
+    """Test the product of two DFAs, and its minimization."""
+    manager = BDDManager()
+    first = bdd_from_mona_output(_MONA_OUTPUT, manager)
+    second = bdd_from_mona_output(parse_mona_output(ALWAYS_A_MONA_OUTPUT), manager)
+    result = product(first, second, conjunction)
+    minimal = minimize(result)
+    for word in _words(("a", "b"), 3):
+        values = [first.accepts(word), second.accepts(word)]
+        expected = all(values) if conjunction else any(values)
+        assert result.accepts(word) == expected
+        assert minimal.accepts(word) == expected
+    assert len(minimal.states) <= len(result.states)
+    assert len(minimize(first).states) == 2
+    with pytest.raises(ValueError, match="same BDD manager"):
+        product(first, bdd_from_mona_output(_MONA_OUTPUT, BDDManager()))
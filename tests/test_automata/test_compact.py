@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the compact, array-backed, DFAs."""
+import itertools
+
+import pytest
+from sympy import Symbol
+
+from logaut.automata import from_mona_output
+from logaut.backends.common.process_mona_output import (
+    MONAOutput,
+    parse_automaton,
+    parse_mona_output,
+)
+from logaut.cache import copy_automaton
+from tests.helpers import ALWAYS_A_MONA_OUTPUT
+
+np = pytest.importorskip("numpy")
+
+from logaut.automata.compact import CompactDFA, accepts_batch, to_compact  # noqa: E402
+
+# a DFA over a and b that accepts the traces where 'a and not b' holds at the end.
+_MONA_OUTPUT = MONAOutput(
+    nb_states=3,
+    variable_names=("a", "b"),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0, 2},
+    transitions={
+        0: {1: {"10"}, 2: {"0X", "11"}},
+        1: {1: {"10"}, 2: {"0X", "11"}},
+        2: {1: {"10"}, 2: {"0X", "11"}},
+    },
+)
+
+
+def _words(variable_names, max_length):
+    """Enumerate all the words up to a given length."""
+    symbols = [
+        dict(zip(variable_names, values))
+        for values in itertools.product([False, True], repeat=len(variable_names))
+    ]
+    for length in range(max_length + 1):
+        yield from itertools.product(symbols, repeat=length)
+
+
+@pytest.mark.parametrize(
+    "mona_output", [_MONA_OUTPUT, parse_mona_output(ALWAYS_A_MONA_OUTPUT)]
+)
+def test_compact_dfa_is_equivalent_to_symbolic_dfa(mona_output):
+    """Test that the compact and the symbolic representations accept the same words."""
+    compact_dfa = from_mona_output(mona_output, representation="compact")
+    symbolic_dfa = parse_automaton(mona_output)
+    assert isinstance(compact_dfa, CompactDFA)
+    assert compact_dfa.nb_classes == 2
+    for word in _words(mona_output.variable_names, 3):
+        assert compact_dfa.accepts(word) == symbolic_dfa.accepts(word)
+        assert compact_dfa.to_symbolic().accepts(word) == symbolic_dfa.accepts(word)
+    assert copy_automaton(compact_dfa) is compact_dfa
+
+
+def test_compact_dfa_successor():
+    """Test the successor function, with missing and unknown propositions."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation="compact")
+    assert automaton.get_successor(0, {"a": True}) == 1
+    assert automaton.get_successor(0, {"a": True, "b": True, "c": True}) == 2
+    assert automaton.get_successor(0, {Symbol("a"): True}) == 1
+    assert automaton.step(0, 0b01) == 1
+    assert automaton.accepting_states == {1}
+    with pytest.raises(ValueError):
+        automaton.get_successor(3, {})
+
+
+def test_many_variables():
+    """Test the class lookup over more than 64 variables."""
+    variable_names = tuple(f"p{i}" for i in range(100))
+    mona_output = MONAOutput(
+        nb_states=2,
+        variable_names=variable_names,
+        initial_state=0,
+        accepting_states={1},
+        rejecting_states={0},
+        transitions={
+            0: {1: {"X" * 99 + "1"}, 0: {"X" * 99 + "0"}},
+            1: {1: {"X" * 100}},
+        },
+    )
+    automaton = from_mona_output(mona_output, representation="compact")
+    assert automaton.accepts([{}, {"p99": True}, {}])
+    assert not automaton.accepts([{"p0": True}, {"p98": True}])
+
+
+@pytest.mark.parametrize("representation", ["symbolic", "lazy", "cube", "bdd"])
+def test_to_compact(representation):
+    """Test the conversion of the other representations."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation=representation)
+    compact_dfa = to_compact(automaton)
+    assert isinstance(compact_dfa, CompactDFA)
+    for word in _words(_MONA_OUTPUT.variable_names, 3):
+        assert compact_dfa.accepts(word) == automaton.accepts(word)
+    assert to_compact(compact_dfa) is compact_dfa
+
+
+def test_accepts_batch():
+    """Test the vectorized acceptance of padded and concatenated traces."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation="symbolic")
+    rng = np.random.default_rng(42)
+    traces = rng.random((200, 6, 2)) < 0.5
+    lengths = rng.integers(0, 7, len(traces))
+    accepted, states = accepts_batch(
+        automaton, traces, lengths=lengths, return_states=True
+    )
+    for trace, length, is_accepted in zip(traces, lengths, accepted):
+        word = [{"a": bool(a), "b": bool(b)} for a, b in trace[:length]]
+        assert automaton.accepts(word) == is_accepted
+    assert set(states[accepted].tolist()) == {1}
+
+    concatenated = np.concatenate([t[:n] for t, n in zip(traces, lengths)])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    assert (accepts_batch(automaton, concatenated, offsets=offsets) == accepted).all()
+
+    reversed_atoms = accepts_batch(
+        automaton, traces[:, :, ::-1], lengths=lengths, atoms=["b", "a"]
+    )
+    assert (reversed_atoms == accepted).all()
+
+
+def test_accepts_batch_many_variables():
+    """Test the vectorized acceptance over more than 64 variables."""
+    variable_names = tuple(f"p{i}" for i in range(70))
+    mona_output = MONAOutput(
+        nb_states=2,
+        variable_names=variable_names,
+        initial_state=0,
+        accepting_states={1},
+        rejecting_states={0},
+        transitions={
+            0: {1: {"X" * 69 + "1"}, 0: {"X" * 69 + "0"}},
+            1: {1: {"X" * 70}},
+        },
+    )
+    automaton = from_mona_output(mona_output, representation="compact")
+    traces = np.zeros((3, 2, 70), dtype=bool)
+    traces[1, 1, 69] = True
+    traces[2, 0, 69] = True
+    assert automaton.accepts_batch(traces).tolist() == [False, True, True]
+    with pytest.raises(ValueError):
+        automaton.accepts_batch(traces[0])
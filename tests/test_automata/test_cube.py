@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the DFAs with bit-cube guards."""
+import itertools
+
+import pytest
+from sympy import Symbol
+
+from logaut.automata import from_mona_output
+from logaut.backends.common.process_mona_output import (
+    MONAOutput,
+    parse_automaton,
+    parse_mona_output,
+)
+from logaut.cache import copy_automaton
+from tests.helpers import ALWAYS_A_MONA_OUTPUT
+
+pytest.importorskip("numpy")
+
+from logaut.automata.cube import CubeDFA, CubeGuard  # noqa: E402
+
+# a DFA over a and b that accepts the traces where 'a and not b' holds at the end.
+_MONA_OUTPUT = MONAOutput(
+    nb_states=3,
+    variable_names=("a", "b"),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0, 2},
+    transitions={
+        0: {1: {"10"}, 2: {"0X", "11"}},
+        1: {1: {"10"}, 2: {"0X", "11"}},
+        2: {1: {"10"}, 2: {"0X", "11"}},
+    },
+)
+
+
+def _words(variable_names, max_length):
+    """Enumerate all the words up to a given length."""
+    symbols = [
+        dict(zip(variable_names, values))
+        for values in itertools.product([False, True], repeat=len(variable_names))
+    ]
+    for length in range(max_length + 1):
+        yield from itertools.product(symbols, repeat=length)
+
+
+@pytest.mark.parametrize(
+    "mona_output", [_MONA_OUTPUT, parse_mona_output(ALWAYS_A_MONA_OUTPUT)]
+)
+def test_cube_dfa_is_equivalent_to_symbolic_dfa(mona_output):
+    """Test that the cube and the symbolic representations accept the same words."""
+    cube_dfa = from_mona_output(mona_output, representation="cube")
+    symbolic_dfa = parse_automaton(mona_output)
+    assert isinstance(cube_dfa, CubeDFA)
+    for word in _words(mona_output.variable_names, 3):
+        assert cube_dfa.accepts(word) == symbolic_dfa.accepts(word)
+        assert cube_dfa.to_symbolic().accepts(word) == symbolic_dfa.accepts(word)
+
+
+def test_cube_guard():
+    """Test the evaluation and the conversions of a guard."""
+    guard = CubeGuard.from_mona_guards({"0X", "11"}, ("a", "b"))
+    assert [guard.evaluate(valuation) for valuation in range(4)] == [
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert guard.to_mona_guards() == {"0X", "11"}
+    a, b = Symbol("a"), Symbol("b")
+    assert guard.to_sympy().equals(~a | (a & b))
+
+
+def test_many_variables():
+    """Test guards over more than 64 variables."""
+    variable_names = tuple(f"p{i}" for i in range(100))
+    guard = CubeGuard.from_mona_guards({"X" * 99 + "1"}, variable_names)
+    assert guard.evaluate(1 << 99)
+    assert not guard.evaluate((1 << 99) - 1)
+
+
+def test_cube_dfa_successor():
+    """Test the successor function, with missing and unknown propositions."""
+    automaton = from_mona_output(_MONA_OUTPUT, representation="cube")
+    assert automaton.get_successor(0, {"a": True}) == 1
+    assert automaton.get_successor(0, {"a": True, "b": True, "c": True}) == 2
+    assert automaton.get_successor(0, {Symbol("a"): True}) == 1
+    with pytest.raises(ValueError):
+        automaton.get_successor(3, {})
+    assert copy_automaton(automaton) is automaton
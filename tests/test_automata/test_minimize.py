@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the minimization of DFAs."""
+import random
+
+import pytest
+
+from logaut.automata import from_mona_output, minimize
+from logaut.automata.hopcroft import minimize_table
+from logaut.backends.common.process_mona_output import MONAOutput
+from tests.test_automata.test_bdd import _words
+
+# a DFA over a that accepts the traces with an even number of 'a',
+# with redundant states and a rejecting sink.
+_MONA_OUTPUT = MONAOutput(
+    nb_states=5,
+    variable_names=("a",),
+    initial_state=0,
+    accepting_states={0, 2},
+    rejecting_states={1, 3, 4},
+    transitions={
+        0: {1: {"1"}, 0: {"0"}},
+        1: {2: {"1"}, 3: {"0"}},
+        2: {3: {"1"}, 2: {"0"}},
+        3: {0: {"1"}, 1: {"0"}},
+        4: {4: {"X"}},
+    },
+)
+
+
+def _nb_moore_classes(table, accepting, initial_state):
+    """Count the classes of the live states, by Moore's algorithm."""
+    live = set(range(len(table)))
+    block = {state: int(accepting[state]) for state in live}
+    while True:
+        signatures = {}
+        for state in live:
+            key = (block[state], tuple(block.get(s, -1) for s in table[state]))
+            signatures.setdefault(key, len(signatures))
+        refined = {
+            state: signatures[
+                (block[state], tuple(block.get(s, -1) for s in table[state]))
+            ]
+            for state in live
+        }
+        if len(signatures) == len(set(block.values())):
+            return len(signatures)
+        block = refined
+
+
+def test_minimize_table():
+    """Test that equivalent states are merged, and the others are not."""
+    rng = random.Random(0)
+    for _ in range(200):
+        nb_states = rng.randint(1, 8)
+        table = [[rng.randrange(nb_states) for _ in range(2)] for _ in range(nb_states)]
+        accepting = [rng.random() < 0.5 for _ in range(nb_states)]
+        # make every state reachable from 0, and able to reach an accepting state.
+        for state in range(1, nb_states):
+            table[state - 1][0] = state
+        table[-1][0] = 0
+        accepting[0] = True
+        blocks, nb_blocks = minimize_table(table, accepting, 0)
+        assert blocks[0] == 0
+        assert nb_blocks == _nb_moore_classes(table, accepting, 0)
+        for state in range(nb_states):
+            for other in range(nb_states):
+                if blocks[state] == blocks[other]:
+                    assert accepting[state] == accepting[other]
+                    assert [blocks[s] for s in table[state]] == [
+                        blocks[s] for s in table[other]
+                    ]
+
+
+def test_minimize_table_drops_dead_states():
+    """Test that the states that cannot reach an accepting state are dropped."""
+    assert minimize_table([[1, -1], [1, 1]], [False, False], 0) == ([0, -1], 1)
+    assert minimize_table([[1], [2], [2]], [False, True, False], 0) == (
+        [0, 1, -1],
+        2,
+    )
+
+
+@pytest.mark.parametrize("representation", ["symbolic", "cube", "bdd", "compact"])
+def test_minimize(representation):
+    """Test the minimization of the DFAs in each representation."""
+    if representation in ("cube", "compact"):
+        pytest.importorskip("numpy")
+    automaton = from_mona_output(_MONA_OUTPUT, representation)
+    minimal = minimize(automaton)
+    assert type(minimal) is type(automaton)
+    assert len(minimal.states) == 2
+    for word in _words(_MONA_OUTPUT.variable_names, 5):
+        assert minimal.accepts(word) == automaton.accepts(word)
+    with pytest.raises(TypeError):
+        minimize(object())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the minimization of MONA guards."""
+import itertools
+import random
+
+import pytest
+
+from logaut.backends.common.cubes import (
+    format_cube,
+    minimize_guards,
+    minimize_mona_output,
+    parse_cube,
+)
+from logaut.backends.common.process_mona_output import MONAOutput
+
+
+def _models(guards, nb_variables):
+    """Get the valuations, as tuples of bits, that satisfy some guard."""
+    return {
+        valuation
+        for valuation in itertools.product("01", repeat=nb_variables)
+        for guard in guards
+        if all(g in ("X", v) for g, v in zip(guard, valuation))
+    }
+
+
+def test_parse_and_format_cube():
+    """Test the conversion between MONA guards and cubes."""
+    assert parse_cube("1X0") == (0b101, 0b001)
+    assert format_cube((0b101, 0b001), 3) == "1X0"
+    assert parse_cube("") == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "guards,expected",
+    [
+        ({"00", "01", "10", "11"}, {"XX"}),
+        ({"0X", "11"}, {"0X", "X1"}),
+        ({"00X", "01X", "X11"}, {"0XX", "X11"}),
+        ({"X0X", "X1X", "1XX"}, {"XXX"}),
+        ({"10", "01"}, {"10", "01"}),
+        ({""}, {""}),
+    ],
+)
+def test_minimize_guards(guards, expected):
+    """Test the minimization of guards on known examples."""
+    nb_variables = len(next(iter(guards)))
+    assert minimize_guards(guards, nb_variables) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_minimize_guards_is_equivalent(seed):
+    """Test that the minimized guards are equivalent and not larger."""
+    rng = random.Random(seed)
+    nb_variables = 5
+    guards = {
+        "".join(rng.choice("01XX") for _ in range(nb_variables))
+        for _ in range(rng.randint(1, 12))
+    }
+    minimized = minimize_guards(guards, nb_variables)
+    assert _models(minimized, nb_variables) == _models(guards, nb_variables)
+    assert len(minimized) <= len(guards)
+    # the result is irredundant: no guard can be removed.
+    for guard in minimized:
+        assert _models(minimized - {guard}, nb_variables) != _models(
+            minimized, nb_variables
+        )
+
+
+def test_minimize_mona_output():
+    """Test the minimization of all the guards of a MONA output."""
+    output = MONAOutput(
+        2,
+        ("a", "b"),
+        0,
+        {1},
+        {0},
+        {0: {0: {"00"}, 1: {"01", "1X"}}, 1: {1: {"00", "01", "10", "11"}}},
+    )
+    minimized = minimize_mona_output(output)
+    assert minimized.transitions == {
+        0: {0: {"00"}, 1: {"X1", "1X"}},
+        1: {1: {"XX"}},
+    }
+    assert minimized.accepting_states == output.accepting_states
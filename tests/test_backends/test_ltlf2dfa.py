@@ -21,10 +21,15 @@
 #
 
 """Tests for LTLf2DFA backend."""
+import itertools
 import re
 
+import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis.extra.lark import from_lark
+from ltlf2dfa.parser.ltlf import LTLfParser
+from ltlf2dfa.parser.pltlf import PLTLfParser
+from pylogics.parsers.ldl import parse_ldl
 from pylogics.parsers.ltl import __parser as ltl_parser
 from pylogics.parsers.ltl import parse_ltl
 from pylogics.parsers.pltl import __parser as pltl_parser
@@ -33,8 +38,18 @@ from pylogics.syntax.base import Formula
 from pythomata.core import DFA
 
 from logaut import ltl2dfa, pltl2dfa
+from logaut.automata import from_mona_output
 from logaut.backends.common.find_atoms.base import find_atoms
-from logaut.backends.ltlf2dfa.core import _LTLf2DFA_SYMBOL_REGEX
+from logaut.backends.common.mona import get_mona_version, skip_initial_state
+from logaut.backends.common.process_mona_output import parse_mona_output
+from logaut.backends.ltlf2dfa.core import (
+    LTLf2DFABackend,
+    _LTLf2DFA_SYMBOL_REGEX,
+    _variable_mapping,
+)
+from logaut.backends.ltlf2dfa.to_ltlf2dfa_formula import to_ltlf2dfa_formula
+from logaut.patterns import build_dfa
+from tests.helpers import make_fake_executable, prepend_to_path
 
 ltlf2dfa_hypothesis_settings = settings(
     suppress_health_check=[HealthCheck.too_slow, HealthCheck.filter_too_much],
@@ -68,3 +83,104 @@ def test_ltlf2dfa_backend_pltl(formula_str):
     skip_if_for_ltlf2dfa(formula)
     output = pltl2dfa(formula, backend="ltlf2dfa")
     assert isinstance(output, DFA)
+
+
+@pytest.mark.parametrize(
+    "formula,expected",
+    [
+        ("a & !b & c", "a & ~b & c"),
+        ("a -> b <-> c", "(a -> b) <-> c"),
+        ("X[!](a) | X(b)", "X(a) | WX(b)"),
+        ("F(G(a)) U b R c", "F(G(a)) U (b R c)"),
+        ("a W b", "(a U b) | G(a)"),
+        ("a M b", "~(((~a) U (~b)) | G(~a))"),
+        ("F(true) & G(false)", "F(true) & G(false)"),
+    ],
+)
+def test_to_ltlf2dfa_formula_ltl(formula, expected):
+    """Test the conversion of LTLf formulas into LTLf2DFA formulas."""
+    assert to_ltlf2dfa_formula(parse_ltl(formula)) == LTLfParser()(expected)
+
+
+@pytest.mark.parametrize(
+    "formula,expected",
+    [
+        ("Y(a) & O(b)", "Y(a) & O(b)"),
+        ("H(a -> b) S c", "H(a -> b) S c"),
+        ("Y(true) | O(false)", "Y(true) | O(false)"),
+    ],
+)
+def test_to_ltlf2dfa_formula_pltl(formula, expected):
+    """Test the conversion of PLTLf formulas into LTLf2DFA formulas."""
+    assert to_ltlf2dfa_formula(parse_pltl(formula)) == PLTLfParser()(expected)
+
+
+def test_to_ltlf2dfa_formula_unsupported():
+    """Test that the formulas of other logics are not converted."""
+    with pytest.raises(ValueError):
+        to_ltlf2dfa_formula(parse_ldl("<a>tt"))
+
+
+_LTLF2DFA_OUTPUT = """#(A U B_1);
+DFA for formula with free variables: A B_1
+Initial state: 0
+Accepting states: 2
+Rejecting states: 0 1 3
+
+Automaton has 4 states and 5 BDD-nodes
+Transitions:
+State 0: XX -> state 1
+State 1: 00 -> state 3
+State 1: 10 -> state 1
+State 1: X1 -> state 2
+State 2: XX -> state 2
+State 3: XX -> state 3
+A counter-example of least length (0) is:
+A                X
+B_1              X
+"""
+
+
+def _parse_output(output, formula):
+    """Parse the output of MONA as the backend does."""
+    mapping = _variable_mapping(find_atoms(formula))
+    return skip_initial_state(parse_mona_output(output, mapping))
+
+
+def test_parse_output():
+    """Test that the case of the atoms is restored while parsing the output."""
+    mona_output = _parse_output(_LTLF2DFA_OUTPUT, parse_ltl("a U b_1"))
+    assert mona_output.variable_names == ("a", "b_1")
+    # the dummy initial state is skipped.
+    assert mona_output.nb_states == 3
+    assert mona_output.transitions[0] == {1: {"00"}, 0: {"10"}, 2: {"X1"}}
+
+
+def test_parse_output_matches_direct_construction():
+    """Test that the backend and the direct construction accept the same traces."""
+    formula = parse_ltl("a U b_1")
+    from_backend = from_mona_output(_parse_output(_LTLF2DFA_OUTPUT, formula))
+    built_directly = build_dfa(formula)
+    symbols = [
+        {"a": a, "b_1": b} for a, b in itertools.product([False, True], repeat=2)
+    ]
+    for length in range(4):
+        for trace in itertools.product(symbols, repeat=length):
+            expected = built_directly.accepts(list(trace))
+            assert from_backend.accepts(list(trace)) == expected
+    assert from_backend.accepts([{"b_1": True}])
+    assert not from_backend.accepts([{}, {"b_1": True}])
+
+
+def test_tool_version(tmp_path, monkeypatch):
+    """Test that the version of MONA is part of the version of the backend."""
+    make_fake_executable(tmp_path, "mona", "MONA v1.4-18 for WS1S/WS2S\n")
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    get_mona_version.cache_clear()
+    try:
+        assert (
+            LTLf2DFABackend().tool_version
+            == "ltlf2dfa-1.0.2-MONA v1.4-18 for WS1S/WS2S"
+        )
+    finally:
+        get_mona_version.cache_clear()
@@ -21,8 +21,11 @@
 #
 
 """Tests for Lydia backend."""
+import asyncio
+import os
 import re
 
+import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis.extra.lark import from_lark
 from pylogics.parsers.ldl import __parser as ldl_parser
@@ -33,8 +36,17 @@ from pylogics.syntax.base import Formula
 from pythomata.core import DFA
 
 from logaut.backends.common.find_atoms.base import find_atoms
-from logaut.backends.lydia.core import _LYDIA_SYMBOL_REGEX
+from logaut.backends.lydia.core import _LYDIA_SYMBOL_REGEX, LydiaBackend
 from logaut.core import ldl2dfa, ltl2dfa
+from logaut.exceptions import LogautException, StateLimitException
+from tests.helpers import ALWAYS_A_MONA_OUTPUT, make_fake_executable, prepend_to_path
+
+FAKE_LYDIA_OUTPUT = (
+    "[2021-06-01 12:00:00.000] [info] parsing the formula...\n"
+    "Computed automaton:\n"
+    + ALWAYS_A_MONA_OUTPUT
+    + "[2021-06-01 12:00:00.001] [info] done.\n"
+)
 
 lydia_hypothesis_settings = settings(
     suppress_health_check=[HealthCheck.too_slow, HealthCheck.filter_too_much],
@@ -71,3 +83,70 @@ def test_lydia_backend_ltl(formula_str):
     skip_if_for_lydia(formula)
     output = ltl2dfa(formula, backend="lydia")
     assert isinstance(output, DFA)
+
+
+def test_lydia_batch(tmp_path, monkeypatch):
+    """Test the batch translation of many formulas, with a fake Lydia binary."""
+    make_fake_executable(tmp_path, "lydia", FAKE_LYDIA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    formulas = [parse_ltl("G(a)"), parse_ltl("G(b)"), parse_ltl("G(a)")]
+    automata = LydiaBackend().ltl2dfa_many(formulas, max_workers=2)
+    assert len(automata) == 3
+    assert all(isinstance(automaton, DFA) for automaton in automata)
+    assert automata[0] is not automata[2]
+    assert automata[2].accepts([{"a": True}])
+    # duplicated formulas are translated once
+    invocations = (tmp_path / "lydia.log").read_text().splitlines()
+    assert len(invocations) == 2
+    assert all("--logic=ltlf" in invocation for invocation in invocations)
+
+
+def test_lydia_async(tmp_path, monkeypatch):
+    """Test the asynchronous translation, with a fake Lydia binary."""
+    make_fake_executable(tmp_path, "lydia", FAKE_LYDIA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    automaton = asyncio.run(LydiaBackend().altl2dfa(parse_ltl("G(a)")))
+    assert automaton.accepts([{"a": True}])
+    assert not automaton.accepts([{"a": False}])
+
+
+def test_lydia_async_cancellation(tmp_path, monkeypatch):
+    """Test that cancelling an asynchronous translation kills the Lydia process."""
+    pid_file = tmp_path / "lydia.pid"
+    executable = tmp_path / "lydia"
+    executable.write_text(f"#!/bin/sh\necho $$ > '{pid_file}'\nexec sleep 30\n")
+    executable.chmod(0o755)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+
+    async def main():
+        task = asyncio.ensure_future(LydiaBackend().altl2dfa(parse_ltl("G(a)")))
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+def test_lydia_max_states(tmp_path, monkeypatch):
+    """Test that the state limit is passed to the Lydia backend as an option."""
+    make_fake_executable(tmp_path, "lydia", FAKE_LYDIA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    with pytest.raises(StateLimitException):
+        ltl2dfa(parse_ltl("G(a)"), backend="lydia", use_cache=False, max_states=1)
+    assert ltl2dfa(parse_ltl("G(a)"), backend="lydia", use_cache=False, max_states=2)
+
+
+def test_lydia_representation(tmp_path, monkeypatch):
+    """Test that the representation of the DFA can be chosen as an option."""
+    pytest.importorskip("numpy")
+    make_fake_executable(tmp_path, "lydia", FAKE_LYDIA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    automaton = ltl2dfa(parse_ltl("G(a)"), backend="lydia", representation="cube")
+    assert type(automaton).__name__ == "CubeDFA"
+    assert automaton.accepts([{"a": True}])
+    with pytest.raises(LogautException, match="item not registered"):
+        LydiaBackend(representation="unknown")
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for MONA backend."""
+import asyncio
+
+import pytest
+from pylogics.parsers.ldl import parse_ldl
+from pylogics.parsers.ltl import parse_ltl
+from pylogics.parsers.pltl import parse_pltl
+
+from logaut.backends.common.mona import get_mona_version, skip_initial_state
+from logaut.backends.common.process_mona_output import parse_mona_output
+from logaut.backends.mona.core import MonaBackend
+from logaut.backends.mona.to_mona import to_mona_program
+from logaut.core import ltl2dfa
+from tests.helpers import make_fake_executable, prepend_to_path
+
+# the output of MONA for 'G(a)', with the initial state that reads a dummy letter.
+FAKE_MONA_OUTPUT = """DFA for formula with free variables: A
+Initial state: 0
+Accepting states: 1
+Rejecting states: 0 2
+
+Automaton has 3 states and 3 BDD-nodes
+Transitions:
+State 0: X -> state 1
+State 1: 0 -> state 2
+State 1: 1 -> state 1
+State 2: X -> state 2
+"""
+
+
+def test_to_mona_program():
+    """Test the MONA programs of LTLf and PLTLf formulas."""
+    program = to_mona_program(parse_ltl("a U b_1"))
+    assert "var2 A, B_1;\n" in program
+    assert "(p2 in $ & p2 in A)" in program
+    program = to_mona_program(parse_pltl("Y(true)"))
+    assert program.count("var2") == 1
+    assert "max($)" in program
+    with pytest.raises(ValueError):
+        to_mona_program(parse_ldl("<a>tt"))
+
+
+def test_skip_initial_state():
+    """Test that the initial state of a MONA DFA is skipped."""
+    output = skip_initial_state(parse_mona_output(FAKE_MONA_OUTPUT))
+    assert output.nb_states == 2
+    assert output.initial_state == 0
+    assert output.accepting_states == {0}
+    assert output.rejecting_states == {1}
+    assert output.transitions == {0: {1: {"0"}, 0: {"1"}}, 1: {1: {"X"}}}
+
+
+def test_mona_backend(tmp_path, monkeypatch):
+    """Test the MONA backend, with a fake MONA binary."""
+    make_fake_executable(tmp_path, "mona", FAKE_MONA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    for automaton in [
+        MonaBackend().ltl2dfa(parse_ltl("G(a)")),
+        asyncio.run(MonaBackend().altl2dfa(parse_ltl("G(a)"))),
+    ]:
+        assert automaton.accepts([])
+        assert automaton.accepts([{"a": True}])
+        assert not automaton.accepts([{"a": True}, {"a": False}])
+    invocations = (tmp_path / "mona.log").read_text().splitlines()
+    assert invocations == ["-q -u -w automa.mona"] * 2
+
+
+def test_mona_backend_registered(tmp_path, monkeypatch):
+    """Test that the MONA backend is available through the main entry point."""
+    make_fake_executable(tmp_path, "mona", FAKE_MONA_OUTPUT)
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    # not a pattern, so MONA is called.
+    automaton = ltl2dfa(parse_ltl("G(a) & X(a)"), backend="mona", use_cache=False)
+    assert automaton.accepts([{"a": True}])
+
+
+def test_mona_tool_version(tmp_path, monkeypatch):
+    """Test that the version of MONA is part of the version of the backend."""
+    make_fake_executable(
+        tmp_path, "mona", "MONA v1.4-18 for WS1S/WS2S\nCopyright (C) 1997-2016\n"
+    )
+    monkeypatch.setenv("PATH", prepend_to_path(tmp_path))
+    get_mona_version.cache_clear()
+    try:
+        assert get_mona_version() == "MONA v1.4-18 for WS1S/WS2S"
+        assert MonaBackend().tool_version.endswith("-MONA v1.4-18 for WS1S/WS2S")
+        # computed once per process.
+        assert (tmp_path / "mona.log").read_text().splitlines() == ["--version"]
+    finally:
+        get_mona_version.cache_clear()
+
+
+def test_mona_tool_version_unknown(tmp_path, monkeypatch):
+    """Test the version of MONA when the tool is not available."""
+    monkeypatch.setenv("PATH", str(tmp_path))
+    get_mona_version.cache_clear()
+    try:
+        assert get_mona_version() == "unknown"
+    finally:
+        get_mona_version.cache_clear()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the parsing of the MONA output."""
+import itertools
+import pickle  # nosec
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sympy import Symbol
+
+from logaut.backends.common.process_mona_output import (
+    LazySymbolicDFA,
+    MONAOutput,
+    MONAOutputParser,
+    parse_automaton,
+    parse_mona_output,
+    parse_mona_output_stream,
+)
+from logaut.cache import copy_automaton
+from tests.helpers import ALWAYS_A_MONA_OUTPUT
+
+_LYDIA_OUTPUT = (
+    "[info] parsing the formula...\n"
+    "Computed automaton:\n" + ALWAYS_A_MONA_OUTPUT + "[info] done.\n"
+)
+
+
+def test_parse_mona_output():
+    """Test the parsing of the MONA output, surrounded by other text."""
+    mona_output = parse_mona_output(_LYDIA_OUTPUT)
+    assert mona_output.nb_states == 2
+    assert mona_output.variable_names == ("a",)
+    assert mona_output.initial_state == 0
+    assert mona_output.accepting_states == {0}
+    assert mona_output.rejecting_states == {1}
+    assert mona_output.transitions == {0: {0: {"1"}, 1: {"0"}}, 1: {1: {"X"}}}
+
+
+def test_parse_in_chunks():
+    """Test that the result does not depend on how the output is chunked."""
+    parser = MONAOutputParser()
+    for byte in _LYDIA_OUTPUT.replace("\n", "\r\n").encode():
+        parser.feed(bytes([byte]))
+    assert parser.close() == parse_mona_output(ALWAYS_A_MONA_OUTPUT)
+
+
+def test_parse_mona_output_stream(tmp_path):
+    """Test the parsing of the MONA output from a file."""
+    path = tmp_path / "output.txt"
+    path.write_text(ALWAYS_A_MONA_OUTPUT)
+    with path.open("rb") as stream:
+        mona_output = parse_mona_output_stream(stream, chunk_size=7)
+    assert mona_output == parse_mona_output(ALWAYS_A_MONA_OUTPUT)
+
+
+def test_parse_no_variables():
+    """Test the parsing of a DFA without variables, followed by the MONA verdict."""
+    output = (
+        "DFA for formula with free variables: \n"
+        "Initial state: 0\n"
+        "Accepting states: 1\n"
+        "Rejecting states: 0\n"
+        "\n"
+        "Automaton has 2 states and 1 BDD-node\n"
+        "Transitions:\n"
+        "State 0:  -> state 1\n"
+        "State 1:  -> state 1\n"
+        "Formula is valid\n"
+    )
+    mona_output = parse_mona_output(output)
+    assert mona_output.variable_names == ()
+    assert mona_output.transitions == {0: {1: {""}}, 1: {1: {""}}}
+
+
+def test_parse_with_variable_mapping():
+    """Test that the variable names are mapped only in the line of the free variables."""
+    output = ALWAYS_A_MONA_OUTPUT.replace("variables: a", "variables: A B")
+    mona_output = parse_mona_output(output, variable_mapping={"A": "a", "X": "x"})
+    assert mona_output.variable_names == ("a", "B")
+    assert mona_output.transitions[1] == {1: {"X"}}
+
+
+@pytest.mark.parametrize(
+    "output", ["no automaton here", ALWAYS_A_MONA_OUTPUT + ALWAYS_A_MONA_OUTPUT]
+)
+def test_parse_bad_output(output):
+    """Test that outputs without exactly one automaton are rejected."""
+    with pytest.raises(Exception, match="automaton"):
+        parse_mona_output(output)
+
+
+def test_lazy_automaton():
+    """Test that the guards of a lazy DFA are computed only when accessed."""
+    mona_output = parse_mona_output(ALWAYS_A_MONA_OUTPUT)
+    automaton = parse_automaton(mona_output, lazy=True)
+    assert isinstance(automaton, LazySymbolicDFA)
+    assert automaton.size == 2
+    assert automaton.accepting_states == {0}
+    assert not automaton.is_guard_computed(0, 0)
+
+    copy = copy_automaton(automaton)
+    restored = pickle.loads(pickle.dumps(automaton))  # nosec
+    assert automaton.accepts([{"a": True}, {"a": True}])
+    assert not automaton.accepts([{"a": False}])
+    assert automaton.is_guard_computed(0, 0)
+    assert automaton._transition_function[0][0] == Symbol("a")
+    assert not copy.is_guard_computed(0, 0)
+    assert not restored.is_guard_computed(0, 0)
+    assert restored.accepts([{"a": True}])
+
+    eager = parse_automaton(mona_output)
+    assert automaton.get_transitions() == eager.get_transitions()
+
+
+def test_lazy_automaton_concurrent_reads():
+    """Test that a lazy DFA can be read by many threads at once."""
+    nb_states, nb_threads = 8, 4
+    guards = ["".join(bits) for bits in itertools.product("01", repeat=3)]
+    mona_output = MONAOutput(
+        nb_states=nb_states,
+        variable_names=("a", "b", "c"),
+        initial_state=0,
+        accepting_states={0},
+        rejecting_states=set(range(1, nb_states)),
+        transitions={
+            state: {end: {guards[end]} for end in range(nb_states)}
+            for state in range(nb_states)
+        },
+    )
+    expected = parse_automaton(mona_output).get_transitions()
+
+    def _read(automaton, barrier) -> None:
+        barrier.wait()
+        assert automaton.get_transitions() == expected
+        for state in range(nb_states):
+            assert len(automaton._transition_function[state]) == nb_states
+
+    for _ in range(20):
+        automaton = parse_automaton(mona_output, lazy=True)
+        barrier = threading.Barrier(nb_threads)
+        with ThreadPoolExecutor(max_workers=nb_threads) as executor:
+            futures = [
+                executor.submit(_read, automaton, barrier) for _ in range(nb_threads)
+            ]
+        for future in futures:
+            future.result()
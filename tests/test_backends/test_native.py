@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the native backend."""
+import pytest
+from pylogics.parsers import parse_ldl, parse_ltl, parse_pltl
+
+from logaut.automata.bdd import BDDDFA
+from logaut.backends.native.core import NativeBackend
+from logaut.core import ldl2dfa, ltl2dfa, pltl2dfa
+from logaut.exceptions import StateLimitException
+
+_A = {"a": True}
+_B = {"b": True}
+_AB = {"a": True, "b": True}
+_NONE: dict = {}
+
+
+@pytest.mark.parametrize(
+    "formula,accepted,rejected",
+    [
+        ("a", [[_A], [_A, _NONE]], [[], [_NONE], [_B, _A]]),
+        ("!a", [[], [_NONE]], [[_A]]),
+        ("true", [[_NONE]], [[]]),
+        ("X[!] a", [[_NONE, _A]], [[], [_NONE], [_A, _NONE]]),
+        ("X a", [[], [_NONE], [_NONE, _A]], [[_A, _NONE]]),
+        ("a U b", [[_B], [_A, _A, _B]], [[], [_A], [_A, _NONE, _B]]),
+        ("a R b", [[], [_B, _B], [_B, _AB, _NONE]], [[_NONE], [_B, _A]]),
+        ("a W b", [[], [_A, _A], [_A, _B]], [[_NONE], [_A, _NONE]]),
+        ("a M b", [[_AB], [_B, _AB]], [[], [_B, _B]]),
+        ("F a", [[_NONE, _A]], [[], [_NONE, _B]]),
+        ("G a", [[], [_A, _A]], [[_A, _NONE]]),
+        ("G(a -> X[!] b)", [[_A, _B], [_NONE]], [[_A], [_A, _NONE]]),
+    ],
+)
+def test_ltl(formula, accepted, rejected):
+    """Test the translation of LTLf formulas."""
+    automaton = ltl2dfa(parse_ltl(formula), backend="native")
+    assert all(automaton.accepts(word) for word in accepted)
+    assert not any(automaton.accepts(word) for word in rejected)
+
+
+@pytest.mark.parametrize(
+    "formula,accepted,rejected",
+    [
+        ("tt", [[], [_A]], []),
+        ("<a>tt", [[_A]], [[], [_NONE]]),
+        ("[a]ff", [[], [_NONE]], [[_A]]),
+        ("<(a ; b)*>end", [[], [_A, _B], [_A, _AB, _A, _B]], [[_A], [_B, _A]]),
+        ("<true*><a>end", [[_A], [_NONE, _A]], [[], [_A, _NONE]]),
+        ("[(<a>tt)? ; true]<b>tt", [[_NONE], [_A, _B]], [[_A], [_A, _A]]),
+        ("<(tt?)*>tt", [[]], []),
+        ("[(tt?)*]ff", [], [[], [_A]]),
+    ],
+)
+def test_ldl(formula, accepted, rejected):
+    """Test the translation of LDLf formulas."""
+    automaton = ldl2dfa(parse_ldl(formula), backend="native")
+    assert all(automaton.accepts(word) for word in accepted)
+    assert not any(automaton.accepts(word) for word in rejected)
+
+
+@pytest.mark.parametrize(
+    "formula,accepted,rejected",
+    [
+        ("a", [[_A], [_NONE, _A]], [[], [_A, _NONE]]),
+        ("true", [[_NONE]], [[]]),
+        ("Y a", [[_A, _NONE]], [[], [_A], [_NONE, _A]]),
+        ("a S b", [[_B], [_B, _A], [_NONE, _B, _AB, _A]], [[_A], [_B, _NONE]]),
+        ("O a", [[_A], [_A, _NONE]], [[], [_NONE, _B]]),
+        ("H a", [[_A], [_A, _AB]], [[], [_A, _NONE]]),
+        ("H(b -> O a)", [[_NONE], [_A, _B]], [[_B], [_NONE, _B, _A]]),
+    ],
+)
+def test_pltl(formula, accepted, rejected):
+    """Test the translation of PLTLf formulas."""
+    for minimize in (False, True):
+        automaton = pltl2dfa(parse_pltl(formula), backend="native", minimize=minimize)
+        assert all(automaton.accepts(word) for word in accepted)
+        assert not any(automaton.accepts(word) for word in rejected)
+
+
+def test_pltl_minimize():
+    """Test the minimization of the DFAs of PLTLf formulas."""
+    formula = parse_pltl("O(O(a)) | false")
+    assert len(NativeBackend().pltl2dfa(formula).states) == 3
+    assert len(pltl2dfa(formula, backend="native", minimize=True).states) == 2
+
+
+def test_options():
+    """Test the options of the backend."""
+    formula = parse_ltl("X[!](X[!](X[!](a)))")
+    automaton = NativeBackend(representation="bdd").ltl2dfa(formula)
+    assert isinstance(automaton, BDDDFA)
+    assert automaton.accepts([_NONE, _NONE, _NONE, _A])
+    with pytest.raises(StateLimitException):
+        NativeBackend(max_states=3).ltl2dfa(formula)
+    with pytest.raises(ValueError, match="must be positive"):
+        NativeBackend(timeout=0)
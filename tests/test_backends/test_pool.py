@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the pool of backend instances."""
+import logaut.backends
+from logaut.backends import get_backend, get_backend_class
+from tests.helpers import DummyBackend
+
+
+def test_get_backend_returns_shared_instance():
+    """Test that the same backend instance is returned for the same options."""
+    backend = get_backend("dummy")
+    assert isinstance(backend, DummyBackend)
+    assert get_backend("dummy") is backend
+
+
+def test_reset():
+    """Test that resetting the pool makes the backends instantiated again."""
+    backend = get_backend("dummy")
+    logaut.backends.reset()
+    assert get_backend("dummy") is not backend
+
+
+def test_get_backend_class_is_memoized(monkeypatch):
+    """Test that the class of a backend is looked up in the registry only once."""
+    assert get_backend_class("dummy") is DummyBackend
+
+    def _make_cls(*_args, **_kwargs):
+        raise AssertionError("the registry should not be looked up again")
+
+    monkeypatch.setattr(logaut.backends._backend_registry, "make_cls", _make_cls)
+    assert get_backend_class("dummy") is DummyBackend
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the execution of the external tools within resource limits."""
+import asyncio
+import sys
+import time
+
+import pytest
+
+from logaut.backends.common.process import ResourceLimits, arun_command, run_command
+from logaut.exceptions import (
+    MemoryLimitException,
+    StateLimitException,
+    TimeLimitException,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX only")
+
+_BIG_DFA_COMMAND = [
+    "sh",
+    "-c",
+    "echo 'Automaton has 1000 states and 2000 BDD-nodes'; sleep 30",
+]
+
+
+def test_run_command():
+    """Test a run within the limits."""
+    limits = ResourceLimits(timeout=10, max_states=2)
+    returncode, output, _ = run_command(
+        ["echo", "Automaton has 2 states and 2 BDD-nodes"], limits=limits
+    )
+    assert returncode == 0
+    assert output == "Automaton has 2 states and 2 BDD-nodes\n"
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_timeout(asynchronous):
+    """Test that a tool is killed when it takes too long."""
+    limits = ResourceLimits(timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(TimeLimitException):
+        if asynchronous:
+            asyncio.run(arun_command(["sleep", "30"], limits=limits))
+        else:
+            run_command(["sleep", "30"], limits=limits)
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_max_states(asynchronous):
+    """Test that a tool is killed as soon as it prints too many states."""
+    limits = ResourceLimits(max_states=10)
+    start = time.monotonic()
+    with pytest.raises(StateLimitException, match="1000 states"):
+        if asynchronous:
+            asyncio.run(arun_command(_BIG_DFA_COMMAND, limits=limits))
+        else:
+            run_command(_BIG_DFA_COMMAND, limits=limits)
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_max_states_discards_the_rest(asynchronous):
+    """Test that, once a tool is killed, the rest of its output is not read."""
+    # a process outside the process group of the tool keeps writing.
+    script = (
+        "import os, time\n"
+        "if os.fork() == 0:\n"
+        "    os.setsid()\n"
+        "    print('Automaton has 1000 states and 2000 BDD-nodes', flush=True)\n"
+        "    time.sleep(0.5)\n"
+        "    print('more output', flush=True)\n"
+        "else:\n"
+        "    time.sleep(30)\n"
+    )
+    command = [sys.executable, "-c", script]
+    chunks = []
+    limits = ResourceLimits(max_states=10)
+    with pytest.raises(StateLimitException):
+        if asynchronous:
+            asyncio.run(arun_command(command, limits=limits, sink=chunks.append))
+        else:
+            run_command(command, limits=limits, sink=chunks.append)
+    assert len(chunks) == 1
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_memory_limit(asynchronous):
+    """Test that the address space of the tool is limited."""
+    command = [sys.executable, "-c", "x = bytearray(2 * 1024 ** 3)"]
+    limits = ResourceLimits(memory_limit=512 * 1024**2)
+    with pytest.raises(MemoryLimitException):
+        if asynchronous:
+            asyncio.run(arun_command(command, limits=limits))
+        else:
+            run_command(command, limits=limits)
+
+
+def test_memory_limit_arguments():
+    """Test that the arguments of a memory-limited tool are passed unchanged."""
+    command = ["echo", "a  b", "$HOME", "'c'"]
+    limits = ResourceLimits(memory_limit=512 * 1024**2)
+    _, output, _ = run_command(command, limits=limits)
+    assert output == "a  b $HOME 'c'\n"
+
+
+def test_limits_must_be_positive():
+    """Test that the limits must be positive."""
+    with pytest.raises(ValueError, match="'timeout' must be positive"):
+        ResourceLimits(timeout=0)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the translation caches."""
+import asyncio
+import gc
+import os
+import subprocess  # nosec
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from pylogics.parsers import parse_ldl, parse_ltl
+from pylogics.syntax.base import reset_cache
+from pythomata.impl.symbolic import SymbolicDFA
+
+from logaut import altl2dfa, ltl2dfa
+from logaut.cache import (
+    DiskCache,
+    MemoryCache,
+    compute_cache_key,
+    disable_disk_cache,
+    disable_memory_cache,
+    enable_disk_cache,
+    enable_memory_cache,
+)
+from tests.helpers import DummyBackend
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """Enable the disk cache in a temporary directory (and disable the memory cache)."""
+    disable_memory_cache()
+    yield enable_disk_cache(tmp_path / "cache")
+    disable_disk_cache()
+    enable_memory_cache()
+
+
+@pytest.fixture
+def memory_cache():
+    """Enable a fresh memory cache."""
+    yield enable_memory_cache(maxsize=2)
+    enable_memory_cache()
+
+
+def test_cache_key_is_stable():
+    """Test the cache key only depends on the content of its inputs."""
+    formula = parse_ltl("G(a)")
+    key = compute_cache_key(formula, "dummy", "ltl2dfa", {"opt": 1}, "1.0")
+    assert key == compute_cache_key(
+        parse_ltl("G(a)"), "dummy", "ltl2dfa", {"opt": 1}, "1.0"
+    )
+    assert key != compute_cache_key(formula, "dummy", "ltl2dfa", {"opt": 2}, "1.0")
+    assert key != compute_cache_key(formula, "dummy", "ltl2dfa", {"opt": 1}, "2.0")
+    assert key != compute_cache_key(formula, "other", "ltl2dfa", {"opt": 1}, "1.0")
+    assert key != compute_cache_key(
+        parse_ltl("F(a)"), "dummy", "ltl2dfa", {"opt": 1}, "1.0"
+    )
+
+
+_KEY_SCRIPT = """
+from pylogics.parsers import parse_ldl, parse_ltl
+from logaut.cache import compute_cache_key
+print(compute_cache_key(parse_ltl("G(a) & F(b) & X(c)"), "dummy", "ltl2dfa", {}, ""))
+"""
+
+
+@pytest.mark.parametrize("hash_seed", ["1", "2", "3"])
+def test_cache_key_does_not_depend_on_the_hash_seed(hash_seed):
+    """Test the key of an n-ary conjunction is the same in another interpreter."""
+    formula = parse_ltl("G(a) & F(b) & X(c)")
+    key = compute_cache_key(formula, "dummy", "ltl2dfa", {}, "")
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+    # the root of the repository, so that logaut can be imported.
+    root = str(Path(__file__).parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    output = subprocess.run(  # nosec
+        [sys.executable, "-c", _KEY_SCRIPT],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert output.strip() == key
+
+
+def test_cache_key_ldl():
+    """Test the key of an LDLf formula depends on its regular expression and tail."""
+    first = compute_cache_key(parse_ldl("<a1>tt"), "dummy", "ldl2dfa", {}, "")
+    reset_cache()
+    gc.collect()
+    second = compute_cache_key(parse_ldl("<a2>tt"), "dummy", "ldl2dfa", {}, "")
+    assert first != second
+    assert first == compute_cache_key(parse_ldl("<a1>tt"), "dummy", "ldl2dfa", {}, "")
+    assert first != compute_cache_key(parse_ldl("<a1>ff"), "dummy", "ldl2dfa", {}, "")
+
+
+def test_disk_cache_hit(disk_cache):
+    """Test that a cached translation does not call the backend again."""
+    formula = parse_ltl("G(a)")
+    nb_calls = DummyBackend.nb_calls
+    first = ltl2dfa(formula, backend="dummy")
+    second = ltl2dfa(formula, backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls + 1
+    assert isinstance(second, SymbolicDFA)
+    assert second.accepts([{"a": True}]) == first.accepts([{"a": True}]) is True
+
+    # a new cache over the same directory is already warm.
+    restarted = enable_disk_cache(disk_cache.directory)
+    assert restarted.size == disk_cache.size > 0
+    ltl2dfa(formula, backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls + 1
+
+
+def test_disk_cache_async_does_not_block(disk_cache, monkeypatch):
+    """Test that the asynchronous API accesses the disk cache outside the event loop."""
+    threads = []
+
+    def _record(method):
+        def _wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        return _wrapper
+
+    monkeypatch.setattr(disk_cache, "get", _record(disk_cache.get))
+    monkeypatch.setattr(disk_cache, "put", _record(disk_cache.put))
+    formula = parse_ltl("G(a)")
+    nb_calls = DummyBackend.nb_calls
+    asyncio.run(altl2dfa(formula, backend="dummy"))
+    asyncio.run(altl2dfa(formula, backend="dummy"))
+    assert DummyBackend.nb_calls == nb_calls + 1
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+
+def test_disk_cache_skip(disk_cache):
+    """Test that the cache can be skipped on a per-call basis."""
+    formula = parse_ltl("G(a)")
+    nb_calls = DummyBackend.nb_calls
+    ltl2dfa(formula, backend="dummy", use_cache=False)
+    ltl2dfa(formula, backend="dummy", use_cache=False)
+    assert DummyBackend.nb_calls == nb_calls + 2
+    assert disk_cache.size == 0
+
+
+def test_disk_cache_eviction(tmp_path):
+    """Test that the cache does not grow over its maximum size."""
+    cache = DiskCache(tmp_path, max_size=100)
+    cache.put("a" * 64, list(range(10)))
+    cache.put("b" * 64, list(range(10)))
+    assert cache.size <= 100
+    cache.put("c" * 64, list(range(100)))
+    assert cache.size <= 100
+    assert cache.get("a" * 64) is None
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_disk_cache_overwrite(tmp_path):
+    """Test that overwriting an entry does not inflate the size of the cache."""
+    cache = DiskCache(tmp_path, max_size=1000)
+    cache.put("a" * 64, list(range(10)))
+    size = cache.size
+    for _ in range(10):
+        cache.put("a" * 64, list(range(10)))
+    assert cache.size == size
+    cache.put("b" * 64, list(range(10)))
+    assert cache.get("a" * 64) == list(range(10))
+
+
+def test_memory_cache_hit(memory_cache):
+    """Test that a translation is served from memory the second time."""
+    formula = parse_ltl("G(a)")
+    nb_calls = DummyBackend.nb_calls
+    first = ltl2dfa(formula, backend="dummy")
+    second = ltl2dfa(formula, backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls + 1
+    assert memory_cache.info() == (1, 1, 2, 1)
+
+    # by default, each caller gets its own copy.
+    assert first is not second
+    second.create_state()
+    assert len(ltl2dfa(formula, backend="dummy").states) == len(first.states)
+
+
+def test_memory_cache_shared():
+    """Test that, if configured so, the cached automaton is shared."""
+    cache = enable_memory_cache(copy=False)
+    try:
+        formula = parse_ltl("G(a)")
+        assert ltl2dfa(formula, backend="dummy") is ltl2dfa(formula, backend="dummy")
+        assert cache.info().hits == 1
+    finally:
+        enable_memory_cache()
+
+
+def test_memory_cache_lru(memory_cache):
+    """Test that the least recently used entry is evicted."""
+    formulas = [parse_ltl("G(a)"), parse_ltl("F(a)"), parse_ltl("X(a)")]
+    for formula in formulas:
+        ltl2dfa(formula, backend="dummy")
+    assert memory_cache.info().currsize == 2
+    nb_calls = DummyBackend.nb_calls
+    ltl2dfa(formulas[2], backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls
+    ltl2dfa(formulas[0], backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls + 1
+
+
+def test_memory_cache_alpha_equivalence(memory_cache):
+    """Test that alpha-equivalent formulas are translated once."""
+    nb_calls = DummyBackend.nb_calls
+    ltl2dfa(parse_ltl("G(a)"), backend="dummy")
+    automaton = ltl2dfa(parse_ltl("G(b)"), backend="dummy")
+    assert DummyBackend.nb_calls == nb_calls + 1
+    assert automaton.accepts([{"b": True}, {"b": True}])
+    assert not automaton.accepts([{"a": True}, {"b": False}])
+    assert memory_cache.info().currsize == 2
+
+
+def test_memory_cache_alpha_equivalence_bounded():
+    """Test that the index of alpha-equivalent formulas does not outgrow the cache."""
+    cache = MemoryCache(maxsize=2)
+    # formulas that are not alpha-equivalent to each other.
+    formulas = [parse_ltl("X(" * i + "a" + ")" * i) for i in range(1, 11)]
+    for formula in formulas:
+        cache.put(formula, "dummy", "ltl2dfa", {}, SymbolicDFA())
+    assert cache.info().currsize == 2
+    assert len(cache._representatives) == 2
+    assert cache.get_alpha_equivalent(formulas[0], "dummy", "ltl2dfa", {}) is None
+    renamed = parse_ltl("X(" * 10 + "b" + ")" * 10)
+    assert cache.get_alpha_equivalent(renamed, "dummy", "ltl2dfa", {}) is not None
+
+
+def test_memory_cache_weak_references():
+    """Test that the entries of garbage-collected formulas are dropped."""
+    cache = MemoryCache()
+    cache.put(parse_ltl("G(a)"), "dummy", "ltl2dfa", {}, SymbolicDFA())
+    assert cache.info().currsize == 1
+    reset_cache()
+    gc.collect()
+    assert cache.info().currsize == 0
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the core module."""
+import asyncio
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from pylogics.parsers import parse_ltl
+
+import logaut.backends
+from logaut import Template, altl2dfa, ltl2dfa, ltl2dfa_batch, set_async_concurrency
+from logaut.automata.bdd import BDDDFA
+from logaut.cache import disable_memory_cache, enable_memory_cache
+from tests.helpers import DummyBackend
+
+
+@pytest.fixture
+def no_memory_cache():
+    """Disable the memory cache."""
+    disable_memory_cache()
+    yield
+    enable_memory_cache()
+
+
+_OPTIONS = [
+    {},
+    {"minimize": True, "simplify": True},
+    {"compositional": True},
+    {"compositional": True, "split_disjunctions": True},
+]
+
+
+def _assert_same_dfa(first, second):
+    """Check that two DFAs have the same size and accept the same traces."""
+    assert len(first.states) == len(second.states)
+    symbols = [{"a": a, "b": b} for a, b in itertools.product([False, True], repeat=2)]
+    for length in range(4):
+        for trace in itertools.product(symbols, repeat=length):
+            assert first.accepts(list(trace)) == second.accepts(list(trace))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_batch(no_memory_cache, ordered):
+    """Test the batch translation with a thread pool."""
+    formulas = [parse_ltl("G(a)"), parse_ltl("F(a)"), parse_ltl("G(a)")]
+    nb_calls = DummyBackend.nb_calls
+    results = list(
+        ltl2dfa_batch(formulas, backend="dummy", max_workers=2, ordered=ordered)
+    )
+    assert DummyBackend.nb_calls == nb_calls + 2
+    assert len(results) == 3
+    if ordered:
+        assert [formula for formula, _ in results] == formulas
+    else:
+        assert sorted(map(str, (f for f, _ in results))) == sorted(map(str, formulas))
+    assert results[0][1] is not results[2][1]
+    assert all(dfa.accepts([{"a": True}]) for _, dfa in results)
+
+
+def test_batch_process_pool():
+    """Test the batch translation with a process pool fills the memory cache."""
+    formulas = [parse_ltl("G(a)"), parse_ltl("G(b)")]
+    cache = enable_memory_cache()
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        results = dict(ltl2dfa_batch(formulas, backend="dummy", executor=executor))
+    assert set(results) == set(formulas)
+    assert cache.info().currsize == 2
+    enable_memory_cache()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("options", _OPTIONS)
+def test_batch_options(executor, options):
+    """Test that the batch translation has the options of the single-formula one."""
+    formulas = [parse_ltl("G(a -> F(b))"), parse_ltl("G(a -> F(b)) & (X(X(a)) | b)")]
+    results = ltl2dfa_batch(
+        formulas, backend="native", executor=executor, use_cache=False, **options
+    )
+    for formula, automaton in results:
+        expected = ltl2dfa(formula, backend="native", use_cache=False, **options)
+        _assert_same_dfa(automaton, expected)
+
+
+def test_batch_direct_construction(monkeypatch):
+    """Test that the DFAs of simple formulas are built directly, in batch too."""
+    monkeypatch.setattr(logaut.backends, "get_backend", None)
+    formulas = [parse_ltl("G(a -> F(b))"), parse_ltl("F(a)")]
+    results = dict(ltl2dfa_batch(formulas, backend="lydia", use_cache=False))
+    assert results[formulas[1]].accepts([{"a": True}])
+
+
+def test_batch_unknown_executor():
+    """Test that an unknown executor name is rejected."""
+    with pytest.raises(ValueError, match="unknown executor"):
+        list(ltl2dfa_batch([parse_ltl("G(a)")], backend="dummy", executor="foo"))
+
+
+def test_async_translation(no_memory_cache):
+    """Test the asynchronous translation, with the default executor-based implementation."""
+    formulas = [parse_ltl("G(a)"), parse_ltl("F(a)"), parse_ltl("X(a)")]
+    set_async_concurrency(2)
+
+    async def main():
+        return await asyncio.gather(
+            *(altl2dfa(formula, backend="dummy") for formula in formulas)
+        )
+
+    try:
+        automata = asyncio.run(main())
+    finally:
+        set_async_concurrency(os.cpu_count() or 1)
+    assert len(automata) == 3
+    assert all(dfa.accepts([{"a": True}]) for dfa in automata)
+
+
+@pytest.mark.parametrize("options", _OPTIONS)
+@pytest.mark.parametrize("formula", ["G(a -> F(b))", "G(a -> F(b)) & (X(X(a)) | b)"])
+def test_async_options(options, formula):
+    """Test that the asynchronous translation has the options of the synchronous one."""
+    formula = parse_ltl(formula)
+    expected = ltl2dfa(formula, backend="native", use_cache=False, **options)
+    automaton = asyncio.run(
+        altl2dfa(formula, backend="native", use_cache=False, **options)
+    )
+    _assert_same_dfa(automaton, expected)
+
+
+def test_async_direct_construction(monkeypatch):
+    """Test that the DFAs of simple formulas are built directly, asynchronously too."""
+    monkeypatch.setattr(logaut.backends, "get_backend", None)
+    automaton = asyncio.run(
+        altl2dfa(parse_ltl("G(a -> F(b))"), backend="lydia", use_cache=False)
+    )
+    assert automaton.accepts([{"a": True}, {"b": True}])
+    assert not automaton.accepts([{"a": True}])
+
+
+def test_async_concurrency_must_be_positive():
+    """Test that the concurrency limit must be positive."""
+    with pytest.raises(ValueError, match="must be positive"):
+        set_async_concurrency(0)
+
+
+@pytest.mark.parametrize("split_disjunctions", [False, True])
+def test_compositional(split_disjunctions):
+    """Test the compositional translation of conjunctions and disjunctions."""
+    formula = parse_ltl("F(a) & G(b -> X[!](c)) & (F(d) | G(!a))")
+    automaton = ltl2dfa(
+        formula,
+        backend="native",
+        compositional=True,
+        split_disjunctions=split_disjunctions,
+        representation="bdd",
+    )
+    assert isinstance(automaton, BDDDFA)
+    assert automaton.accepts([{"a": True}, {"d": True}])
+    assert not automaton.accepts([{"a": True}])
+    assert not automaton.accepts([{"a": True, "b": True}, {"d": True}])
+    assert automaton.accepts([{"a": True, "b": True}, {"c": True, "d": True}])
+    monolithic = ltl2dfa(formula, backend="native")
+    assert len(automaton.states) <= len(monolithic.states)
+
+
+def test_compositional_unsatisfiable():
+    """Test that an unsatisfiable conjunction gives a DFA with one state."""
+    formula = parse_ltl("F(a) & G(!a) & G(b)")
+    automaton = ltl2dfa(formula, backend="native", compositional=True)
+    assert len(automaton.states) == 1
+    assert not automaton.accepts([{"a": True}])
+
+
+@pytest.mark.parametrize(
+    "representation", ["symbolic", "lazy", "cube", "compact", "bdd"]
+)
+def test_template(representation):
+    """Test the instantiation of a template, by relabeling its DFA."""
+    pytest.importorskip("numpy")
+    template = Template(
+        parse_ltl("G(a -> F(b))"),
+        backend="native",
+        use_cache=False,
+        representation=representation,
+    )
+    assert template.parameters == ("a", "b")
+    swapped = template.instantiate({"a": "b", "b": "a"})
+    assert swapped.accepts([{"b": True}, {"a": True}])
+    assert not swapped.accepts([{"a": True}, {"b": True}])
+    renamed = template.instantiate({"a": "c"})
+    assert renamed.accepts([{"c": True}, {"b": True}])
+    assert not renamed.accepts([{"c": True}, {"a": True}])
+    # two parameters replaced by the same atom: 'G(c -> F(c))'.
+    merged = template.instantiate({"a": "c", "b": "c"})
+    assert merged.accepts([{"c": True}])
+    with pytest.raises(ValueError, match="unknown parameters"):
+        template.instantiate({"d": "e"})
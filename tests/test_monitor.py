@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the runtime monitors."""
+import pytest
+
+from logaut.automata import from_mona_output
+from logaut.backends.common.process_mona_output import MONAOutput
+
+pytest.importorskip("numpy")
+
+from logaut.monitor import Monitor, Verdict  # noqa: E402
+
+# F(a): once 'a' holds, the formula is permanently satisfied.
+_EVENTUALLY_A = MONAOutput(
+    nb_states=2,
+    variable_names=("a",),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0},
+    transitions={0: {0: {"0"}, 1: {"1"}}, 1: {1: {"X"}}},
+)
+
+# 'a' holds at the end: the verdict can always change.
+_LAST_A = MONAOutput(
+    nb_states=2,
+    variable_names=("a",),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0},
+    transitions={0: {0: {"0"}, 1: {"1"}}, 1: {0: {"0"}, 1: {"1"}}},
+)
+
+# 'a' holds at the first instant; the transitions after the first one are missing.
+_FIRST_A = MONAOutput(
+    nb_states=2,
+    variable_names=("a",),
+    initial_state=0,
+    accepting_states={1},
+    rejecting_states={0},
+    transitions={0: {1: {"1"}}, 1: {1: {"X"}}},
+)
+
+
+def test_permanent_verdicts():
+    """Test that a final verdict is reported, and then kept."""
+    monitor = Monitor(from_mona_output(_EVENTUALLY_A))
+    assert monitor.verdict == Verdict.CURRENTLY_FALSE
+    assert monitor.step({"a": False}) == Verdict.CURRENTLY_FALSE
+    assert monitor.step({"a": True}) == Verdict.PERMANENTLY_SATISFIED
+    assert monitor.verdict.is_final
+    assert monitor.step({"a": False}) == Verdict.PERMANENTLY_SATISFIED
+    assert monitor.reset() == Verdict.CURRENTLY_FALSE
+    assert monitor.state == 0
+
+
+def test_state_after_final_verdict():
+    """Test that the run keeps following the trace after a final verdict."""
+    # a, and then anything: the states count the first two instants.
+    automaton = MONAOutput(
+        nb_states=3,
+        variable_names=("a",),
+        initial_state=0,
+        accepting_states={1, 2},
+        rejecting_states={0},
+        transitions={0: {1: {"1"}}, 1: {2: {"X"}}, 2: {2: {"X"}}},
+    )
+    monitor = Monitor(from_mona_output(automaton, representation="compact"))
+    assert monitor.step({"a": True}) == Verdict.PERMANENTLY_SATISFIED
+    assert monitor.state == 1
+    assert monitor.step({"a": False}) == Verdict.PERMANENTLY_SATISFIED
+    assert monitor.state == 2
+
+
+def test_current_verdicts():
+    """Test the verdicts that can still change."""
+    monitor = Monitor(from_mona_output(_LAST_A, representation="cube"))
+    assert monitor.step({"a": True}) == Verdict.CURRENTLY_TRUE
+    assert monitor.step({"a": False}) == Verdict.CURRENTLY_FALSE
+    assert monitor.step_valuation(1) == Verdict.CURRENTLY_TRUE
+    assert not monitor.verdict.is_final
+
+
+def test_missing_transitions():
+    """Test that missing transitions lead to a violation."""
+    monitor = Monitor(from_mona_output(_FIRST_A, representation="compact"))
+    assert monitor.verdict == Verdict.CURRENTLY_FALSE
+    assert monitor.step({"a": True}) == Verdict.PERMANENTLY_SATISFIED
+    monitor.reset()
+    assert monitor.step({"a": False}) == Verdict.PERMANENTLY_VIOLATED
+    assert monitor.state is None
+    assert monitor.step({"a": True}) == Verdict.PERMANENTLY_VIOLATED
+    assert monitor.state is None
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the direct construction of the DFAs of simple formulas."""
+import itertools
+
+import pytest
+from pylogics.parsers import parse_ldl, parse_ltl, parse_pltl
+from pylogics.syntax.ltl import Atomic, Eventually
+
+import logaut.backends
+from logaut import ldl2dfa, ltl2dfa, pltl2dfa
+from logaut.automata.bdd import BDDDFA
+from logaut.backends.native.core import NativeBackend
+from logaut.exceptions import BadLogicFormulaException
+from logaut.patterns import build_dfa
+
+_SYMBOLS = [
+    {"a": a, "b": b, "c": c} for a, b, c in itertools.product([False, True], repeat=3)
+]
+
+
+def _traces(max_length: int = 3):
+    """Generate all the traces up to a length, on the atoms 'a', 'b' and 'c'."""
+    for length in range(max_length + 1):
+        yield from itertools.product(_SYMBOLS, repeat=length)
+
+
+def _assert_equivalent(first, second):
+    """Check that two DFAs accept the same traces, up to length 3."""
+    for trace in _traces():
+        assert first.accepts(list(trace)) == second.accepts(list(trace))
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "a",
+        "!a",
+        "a & (b | !c)",
+        "a -> b",
+        "a <-> b",
+        "true",
+        "!true",
+        "tt",
+        "!tt",
+        "F(a)",
+        "G(a | b)",
+        "X[!](a)",
+        "X(a & b)",
+        "a U (b & c)",
+        "a R b",
+        "a W b",
+        "a M b",
+        "G(F(a))",
+        "F(G(a))",
+        "G(a -> F(b & c))",
+        "last",
+    ],
+)
+def test_build_dfa_ltl(formula):
+    """Test the direct construction against the native backend, on LTLf formulas."""
+    formula = parse_ltl(formula)
+    automaton = build_dfa(formula)
+    assert isinstance(automaton, BDDDFA)
+    _assert_equivalent(automaton, NativeBackend().ltl2dfa(formula))
+
+
+@pytest.mark.parametrize(
+    "formula", ["a", "a | !b", "true", "Y(a)", "O(a & b)", "H(!a)", "a S (b | c)"]
+)
+def test_build_dfa_pltl(formula):
+    """Test the direct construction against the native backend, on PLTLf formulas."""
+    formula = parse_pltl(formula)
+    automaton = build_dfa(formula)
+    assert isinstance(automaton, BDDDFA)
+    _assert_equivalent(automaton, NativeBackend().pltl2dfa(formula))
+
+
+@pytest.mark.parametrize(
+    "formula", ["F(F(a))", "X(X(a))", "G(a) & F(b)", "a U (b U c)", "G(a -> X(b))"]
+)
+def test_build_dfa_not_simple(formula):
+    """Test that the DFAs of the other formulas are not built."""
+    assert build_dfa(parse_ltl(formula)) is None
+    assert build_dfa(parse_ldl("<a>tt")) is None
+
+
+@pytest.mark.parametrize("representation", ["symbolic", "bdd"])
+def test_translators_do_not_call_the_backend(monkeypatch, representation):
+    """Test that the translators build the DFAs of simple formulas directly."""
+
+    def _get_backend(*_args, **_kwargs):
+        raise AssertionError("the backend should not be called")
+
+    monkeypatch.setattr(logaut.backends, "get_backend", _get_backend)
+    formula = parse_ltl("G(a -> F(b))")
+    automaton = ltl2dfa(
+        formula, backend="lydia", use_cache=False, representation=representation
+    )
+    assert isinstance(automaton, BDDDFA) == (representation == "bdd")
+    _assert_equivalent(automaton, NativeBackend().ltl2dfa(formula))
+    with pytest.raises(AssertionError):
+        # lydia does not support PLTLf, so the backend reports the error.
+        pltl2dfa(parse_pltl("O(a)"), backend="lydia", use_cache=False)
+
+
+@pytest.mark.parametrize(
+    "translate,formula,backend",
+    [
+        (ltl2dfa, parse_pltl("O(a)"), "ltlf2dfa"),
+        (ltl2dfa, parse_pltl("a"), "lydia"),
+        (ldl2dfa, parse_ltl("F(a)"), "lydia"),
+        (pltl2dfa, parse_ltl("G(a)"), "native"),
+    ],
+)
+def test_translators_check_the_logic(monkeypatch, translate, formula, backend):
+    """Test that the DFAs of formulas of the wrong logic are not built directly."""
+    monkeypatch.setattr(logaut.backends, "get_backend", None)
+    with pytest.raises(BadLogicFormulaException):
+        translate(formula, backend=backend, use_cache=False)
+
+
+def test_translators_check_the_atoms(monkeypatch):
+    """Test that the DFAs of formulas with unsupported atoms are not built directly."""
+    monkeypatch.setattr(logaut.backends, "get_backend", None)
+    with pytest.raises(ValueError, match="Atom 'aB' is not a valid identifier"):
+        ltl2dfa(Eventually(Atomic("aB")), backend="lydia", use_cache=False)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the renaming of the atoms of formulas."""
+from pylogics.parsers import parse_ldl, parse_ltl
+
+from logaut.renaming import canonicalize, rename_atoms
+
+
+def test_rename_atoms():
+    """Test that the atoms are renamed simultaneously."""
+    formula = parse_ltl("a U (b & X[!](a))")
+    assert rename_atoms(formula, {"a": "b", "b": "a"}) == parse_ltl("b U (a & X[!](b))")
+    formula = parse_ldl("<a ; <b>tt?>[c*]tt")
+    assert rename_atoms(formula, {"c": "d"}) == parse_ldl("<a ; <b>tt?>[d*]tt")
+
+
+def test_canonicalize():
+    """Test that alpha-equivalent formulas have the same key."""
+    first, first_atoms = canonicalize(parse_ltl("G(a -> F(b))"))
+    second, second_atoms = canonicalize(parse_ltl("G(c -> F(a))"))
+    assert first == second
+    assert first_atoms == ("a", "b")
+    assert second_atoms == ("c", "a")
+    third, _ = canonicalize(parse_ltl("G(a -> F(a))"))
+    assert third != first
+    fourth, _ = canonicalize(parse_ltl("G(a -> X[!](b))"))
+    assert fourth != first
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 WhiteMech
+#
+# ------------------------------
+#
+# This file is part of logaut.
+#
+# logaut is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# logaut is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with logaut.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests for the simplification of formulas."""
+import itertools
+
+import pytest
+from pylogics.parsers import parse_ldl, parse_ltl, parse_pltl
+
+from logaut import ldl2dfa, ltl2dfa, pltl2dfa
+from logaut.simplify import formula_size, simplify, simplify_with_stats
+
+_SYMBOLS = [{"a": a, "b": b} for a, b in itertools.product([False, True], repeat=2)]
+
+
+def _traces(max_length: int = 3):
+    """Generate all the traces up to a length, on the atoms 'a' and 'b'."""
+    for length in range(max_length + 1):
+        yield from itertools.product(_SYMBOLS, repeat=length)
+
+
+@pytest.mark.parametrize(
+    "formula,expected",
+    [
+        ("F(F(a)) | F(b)", "F(a | b)"),
+        ("G(a) & G(G(b))", "G(a & b)"),
+        ("a & (a | b)", "a"),
+        ("a | (a & F(b))", "a"),
+        ("a U (a U b)", "a U b"),
+        ("(a U b) U b", "a U b"),
+        ("X[!](ff) | X[!](a)", "X[!](a)"),
+        ("X(a) & X(b)", "X(a & b)"),
+        ("G(true)", "tt"),
+        ("true & a", "a"),
+        ("true | X[!](a)", "true"),
+        ("true & G(a)", "true & G(a)"),
+    ],
+)
+def test_simplify_ltl(formula, expected):
+    """Test the rewrite rules on LTLf formulas, and that they preserve the semantics."""
+    original = parse_ltl(formula)
+    simplified = simplify(original)
+    assert simplified == parse_ltl(expected)
+    first = ltl2dfa(original, backend="native")
+    second = ltl2dfa(simplified, backend="native")
+    for trace in _traces():
+        assert first.accepts(trace) == second.accepts(trace)
+
+
+@pytest.mark.parametrize(
+    "formula,expected",
+    [
+        ("O(O(a)) | O(b)", "O(a | b)"),
+        ("H(a) & H(b)", "H(a & b)"),
+        ("true & Y(a)", "Y(a)"),
+        ("Y(false) | a", "a"),
+    ],
+)
+def test_simplify_pltl(formula, expected):
+    """Test the rewrite rules on PLTLf formulas."""
+    original = parse_pltl(formula)
+    simplified = simplify(original)
+    assert simplified == parse_pltl(expected)
+    first = pltl2dfa(original, backend="native")
+    second = pltl2dfa(simplified, backend="native")
+    for trace in _traces():
+        assert first.accepts(trace) == second.accepts(trace)
+
+
+def test_simplify_ldl():
+    """Test the rewrite rules on LDLf formulas."""
+    original = parse_ldl("<a ; b>(ff) | [true*](<a>(tt) | tt)")
+    assert simplify(original) == parse_ldl("tt")
+    original = parse_ldl("<true*>(<true*>(<b>tt)) & <(<a>(tt) & [b](tt))?>(tt)")
+    simplified = simplify(original)
+    assert simplified == parse_ldl("<true*>(<true*>(<b>tt)) & <(<a>(tt))?>(tt)")
+    first = ldl2dfa(original, backend="native")
+    second = ldl2dfa(simplified, backend="native")
+    for trace in _traces():
+        assert first.accepts(trace) == second.accepts(trace)
+
+
+def test_simplify_with_stats():
+    """Test the statistics of a simplification."""
+    formula = parse_ltl("F(F(a)) | F(F(b))")
+    simplified, stats = simplify_with_stats(formula)
+    assert formula_size(formula) == stats.original_size == 7
+    assert formula_size(simplified) == stats.simplified_size == 4
+    assert stats.reduction == pytest.approx(3 / 7)
+
+
+def test_translate_simplified():
+    """Test the simplification before the translation."""
+    formula = parse_ltl("F(F(a)) & G(G(b)) & (b | (b & a))")
+    automaton = ltl2dfa(formula, backend="native", simplify=True)
+    assert automaton.accepts([{"a": True, "b": True}])
+    assert not automaton.accepts([{"a": True}])
+    assert not automaton.accepts([{"b": True}])